@@ -0,0 +1,223 @@
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from table_processor import (
+    TableProcessor, TableData,
+    load_csv, save_csv,
+    load_pickle, save_pickle,
+    load_binary, save_binary,
+    save_text
+)
+from table_processor.text_saver import write_table
+from table_processor import vectorized
+
+DEFAULT_SIZES = (10_000, 1_000_000, 10_000_000)
+DEFAULT_TYPES = ("int", "float", "str", "bool")
+DEFAULT_THRESHOLD = 0.2
+
+Case = Tuple[str, Callable[[Dict[str, Any]], Any]]
+
+
+def generate_table(rows: int, columns: int = 6, types: Sequence[str] = DEFAULT_TYPES,
+                   null_rate: float = 0.0, cardinality: Optional[int] = None,
+                   seed: int = 0, columnar: bool = False) -> TableData:
+    if rows < 0 or columns < 1:
+        raise ValueError("Некорректный размер таблицы")
+    unknown = [name for name in types if name not in DEFAULT_TYPES]
+    if unknown or not types:
+        raise ValueError(f"Неподдерживаемые типы столбцов: {unknown}")
+
+    rng = random.Random(seed)
+    cardinality = cardinality or max(1, rows)
+    names = ["key"] + [f"{types[i % len(types)]}_{i}" for i in range(1, columns)]
+    kinds = ["int"] + [types[i % len(types)] for i in range(1, columns)]
+
+    values = []
+    for kind in kinds:
+        if kind == "int":
+            column = [rng.randrange(cardinality) for _ in range(rows)] if not values else \
+                [rng.randrange(-10 ** 6, 10 ** 6) for _ in range(rows)]
+        elif kind == "float":
+            column = [round(rng.uniform(-1000.0, 1000.0), 3) for _ in range(rows)]
+        elif kind == "str":
+            column = [f"s{rng.randrange(cardinality)}" for _ in range(rows)]
+        else:
+            column = [rng.random() < 0.5 for _ in range(rows)]
+        if null_rate and values:
+            for i in range(rows):
+                if rng.random() < null_rate:
+                    column[i] = None
+        values.append(column)
+
+    data = [list(row) for row in zip(*values)] if rows else []
+    column_types = {i: {"int": int, "float": float, "str": str, "bool": bool}[kind]
+                    for i, kind in enumerate(kinds)}
+    return TableData(data, names, columnar=columnar, column_types=column_types)
+
+
+def _cases() -> List[Case]:
+    def path(ctx: Dict[str, Any], ext: str) -> str:
+        return os.path.join(ctx["directory"], f"table.{ext}")
+
+    def load_binary_columns(ctx: Dict[str, Any]):
+        table = load_binary(path(ctx, "bin"))
+        return list(table.data.columns)
+
+    return [
+        ("save_csv", lambda ctx: save_csv(ctx["table"], path(ctx, "csv"))),
+        ("load_csv", lambda ctx: load_csv(path(ctx, "csv"))),
+        ("save_pickle", lambda ctx: save_pickle(ctx["table"], path(ctx, "pkl"))),
+        ("load_pickle", lambda ctx: load_pickle(path(ctx, "pkl"))),
+        ("save_binary", lambda ctx: save_binary(ctx["table"], path(ctx, "bin"))),
+        ("load_binary", load_binary_columns),
+        ("save_text", lambda ctx: save_text(ctx["table"], path(ctx, "txt"))),
+        ("render_text", lambda ctx: write_table(ctx["table"], io.StringIO())),
+        ("get_rows_by_number", lambda ctx: ctx["processor"].get_rows_by_number(
+            ctx["rows"] // 4, ctx["rows"] // 2)),
+        ("get_rows_by_number_copy", lambda ctx: ctx["processor"].get_rows_by_number(
+            ctx["rows"] // 4, ctx["rows"] // 2, copy_table=True)),
+        ("get_rows_by_index", lambda ctx: ctx["processor"].get_rows_by_index(*ctx["keys"])),
+        ("get_values", lambda ctx: ctx["processor"].get_values("float_1")),
+        ("add_scalar", lambda ctx: ctx["processor"].add("int_4", 1)),
+        ("add_columns", lambda ctx: ctx["processor"].add("int_4", "key")),
+        ("mul_scalar", lambda ctx: ctx["processor"].mul("float_1", 1.0001)),
+        ("compare_scalar", lambda ctx: ctx["processor"].gr("float_1", 0.0)),
+        ("compare_mask", lambda ctx: ctx["processor"].gr("float_1", 0.0, as_mask=True)
+         & ctx["processor"].eq("bool_3", True, as_mask=True)),
+        ("filter_rows", lambda ctx: ctx["processor"].filter_rows(
+            ctx["processor"].gr("float_1", 500.0))),
+        ("group_by", lambda ctx: ctx["processor"].group_by("bool_3").agg({"float_1": "sum"})),
+        ("sort_by", lambda ctx: ctx["processor"].sort_by("float_1")),
+    ]
+
+
+def _measure(func: Callable[[Dict[str, Any]], Any], ctx: Dict[str, Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(ctx)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(sizes: Sequence[int] = DEFAULT_SIZES, repeat: int = 3, seed: int = 0,
+                   columns: int = 6, null_rate: float = 0.0, cardinality: Optional[int] = None,
+                   columnar: bool = False, only: Optional[Sequence[str]] = None,
+                   log: Callable[[str], Any] = print) -> Dict[str, Any]:
+    cases = [case for case in _cases() if not only or case[0] in only]
+    results: Dict[str, Dict[str, float]] = {}
+
+    for rows in sizes:
+        log(f"Генерация таблицы: {rows} строк")
+        table = generate_table(rows, columns=max(columns, 6), null_rate=null_rate,
+                               cardinality=cardinality, seed=seed, columnar=columnar)
+        processor = TableProcessor(table)
+        rng = random.Random(seed)
+        keys = [rng.randrange(cardinality or max(1, rows)) for _ in range(10)]
+        directory = tempfile.mkdtemp(prefix="tp_bench_")
+        ctx = {"table": table, "processor": processor, "rows": rows,
+               "keys": keys, "directory": directory}
+        try:
+            for name, func in cases:
+                seconds = _measure(func, ctx, repeat)
+                results[f"{name}@{rows}"] = {
+                    "seconds": seconds,
+                    "rows_per_sec": rows / seconds if seconds else 0.0,
+                }
+                log(f"  {name:<24} {rows:>10}  {seconds:10.4f} с")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": vectorized.HAS_NUMPY,
+            "seed": seed,
+            "repeat": repeat,
+            "columnar": columnar,
+            "null_rate": null_rate,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    report = []
+    for name, result in current["results"].items():
+        reference = baseline.get("results", {}).get(name)
+        if reference is None or not reference["seconds"]:
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        report.append({
+            "case": name,
+            "baseline": reference["seconds"],
+            "current": result["seconds"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return report
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Замеры производительности table_processor")
+    parser.add_argument("--sizes", nargs="+", type=lambda v: int(float(v)),
+                        default=list(DEFAULT_SIZES), help="количество строк (например 1e4 1e6)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--columns", type=int, default=6)
+    parser.add_argument("--null-rate", type=float, default=0.0)
+    parser.add_argument("--cardinality", type=int, default=None)
+    parser.add_argument("--columnar", action="store_true")
+    parser.add_argument("--only", nargs="+", default=None, help="запустить только указанные замеры")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=None, help="JSON с эталонными результатами")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="допустимое замедление относительно эталона (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="сохранить результаты как новый эталон (в файл --baseline)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _parse_args(argv)
+    current = run_benchmarks(args.sizes, args.repeat, args.seed, args.columns, args.null_rate,
+                             args.cardinality, args.columnar, args.only)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2, ensure_ascii=False)
+    print(f"Результаты сохранены: {args.output}")
+
+    if not args.baseline:
+        return 0
+    if args.save_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+        print(f"Эталон сохранен: {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    report = compare_results(current, baseline, args.threshold)
+    regressions = [entry for entry in report if entry["regression"]]
+    for entry in report:
+        mark = "РЕГРЕССИЯ" if entry["regression"] else "ok"
+        print(f"  {entry['case']:<36} {entry['baseline']:10.4f} -> {entry['current']:10.4f} с "
+              f"(x{entry['ratio']:.2f}) {mark}")
+    print(f"Регрессий: {len(regressions)} из {len(report)} (порог {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
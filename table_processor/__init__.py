@@ -1,17 +1,32 @@
-from .csv_processor import load_table as load_csv, save_table as save_csv
+from .csv_processor import load_table as load_csv, save_table as save_csv, iter_table as iter_csv
 from .pickle_processor import load_table as load_pickle, save_table as save_pickle
+from .binary_processor import load_table as load_binary, save_table as save_binary
 from .text_saver import save_table as save_text
 from .base_operations import TableProcessor
+from .dataset import Dataset, open_dataset, register_format
+from .mask import Mask
+from .profiling import profile, Profiler, add_hook, remove_hook
 from .utils import TableData, TableError, LoadError, SaveError, ColumnError, OperationError
 
 __version__ = "1.0.0"
 __all__ = [
     'load_csv',
     'save_csv',
+    'iter_csv',
     'load_pickle',
     'save_pickle',
+    'load_binary',
+    'save_binary',
     'save_text',
     'TableProcessor',
+    'Dataset',
+    'open_dataset',
+    'register_format',
+    'Mask',
+    'profile',
+    'Profiler',
+    'add_hook',
+    'remove_hook',
     'TableData',
     'TableError',
     'LoadError',
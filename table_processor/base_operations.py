@@ -1,7 +1,37 @@
-from typing import List, Dict, Any, Union, Optional, Tuple
-import copy
+from typing import List, Dict, Any, Union, Optional, Tuple, Iterable
+from array import array
+from itertools import compress
+from operator import itemgetter
+import heapq
+import sys
 from .utils import TableData, TableError, ColumnError, OperationError
+from .columnar import ColumnarRows, DictColumn, NullableColumn, column_kind, column_to_list
+from .index import HashIndex, SortedIndex, _MISSING, raw_column_values
+from .stats import column_stats
+from .nulls import column_validity
+from .expressions import compile_expression
+from .views import RowSelection
+from .lazy import LazyTable
+from .groupby import GroupBy
+from .join import hash_join
+from .mask import Mask, as_positions
+from .profiling import instrument_methods
+from .text_saver import write_table
+from . import vectorized
 
+_RANGE_BOUNDS = {
+    'gr': lambda value: (value, None, False, True),
+    'ge': lambda value: (value, None, True, True),
+    'ls': lambda value: (None, value, True, False),
+    'le': lambda value: (None, value, True, True),
+}
+
+def _flatten_keys(keys: Tuple[Any, ...]) -> List[Union[int, str]]:
+    if len(keys) == 1 and isinstance(keys[0], (list, tuple)):
+        return list(keys[0])
+    return list(keys)
+
+@instrument_methods
 class TableProcessor:
     def __init__(self, table: Optional[TableData] = None):
         self._table = table if table is not None else TableData()
@@ -10,6 +40,27 @@ class TableProcessor:
     def table(self) -> TableData:
         return self._table
     
+    def lazy(self) -> LazyTable:
+        return LazyTable(self)
+    
+    def group_by(self, *keys: Union[int, str, List[Union[int, str]]]) -> GroupBy:
+        return GroupBy([self._table], _flatten_keys(keys), type(self))
+    
+    @classmethod
+    def group_chunks(cls, chunks: Iterable[Any], *keys: Union[int, str, List[Union[int, str]]]
+                     ) -> GroupBy:
+        return GroupBy(chunks, _flatten_keys(keys), cls)
+    
+    def join(self, other: 'TableProcessor', on: Union[int, str, List[Union[int, str]]] = 0,
+             how: str = "inner", right_on: Optional[Union[int, str, List[Union[int, str]]]] = None,
+             suffixes: Tuple[str, str] = ("_left", "_right"),
+             max_build_rows: Optional[int] = None) -> 'TableProcessor':
+        if isinstance(other, TableData):
+            other = type(self)(other)
+        left_on = _flatten_keys((on,))
+        right_on = left_on if right_on is None else _flatten_keys((right_on,))
+        return hash_join(self, other, left_on, right_on, how, suffixes, max_build_rows)
+    
     def get_rows_by_number(self, start: int, stop: Optional[int] = None, 
                           copy_table: bool = False) -> 'TableProcessor':
         if not self._table.data:
@@ -23,54 +74,192 @@ class TableProcessor:
                 raise TableError(f"Некорректный конечный индекс: {stop}")
             if start >= stop:
                 raise TableError(f"Начальный индекс должен быть меньше конечного")
-            data_slice = self._table.data[start:stop]
+            positions = range(start, stop)
         else:
-            data_slice = [self._table.data[start]]
+            positions = range(start, start + 1)
         
-        if copy_table:
-            new_data = copy.deepcopy(data_slice)
-            new_table = TableData(new_data, self._table.columns.copy())
-            new_table.column_types = self._table.column_types.copy()
-        else:
-            new_table = TableData(data_slice, self._table.columns)
-            new_table.column_types = self._table.column_types
-            if stop is None:
-                new_table.data = [self._table.data[start]]
-            else:
-                new_table.data = self._table.data[start:stop]
-        
-        return TableProcessor(new_table)
+        return self._select_rows(positions, copy_table)
     
-    def get_rows_by_index(self, *indices: Any, copy_table: bool = False) -> 'TableProcessor':
+    def get_rows_by_index(self, *indices: Any, copy_table: bool = False,
+                          column: Union[int, str] = 0) -> 'TableProcessor':
         if not self._table.data:
             return TableProcessor(TableData(columns=self._table.columns))
         
         if not indices:
             raise TableError("Не указаны значения для поиска")
         
-        selected_data = []
-        selected_indices = []
+        col_idx = self._get_column_index(column) if self._table.columns else 0
+        selected_indices = self._lookup_rows(col_idx, indices)
         
-        for idx, row in enumerate(self._table.data):
-            if row and row[0] in indices:
-                selected_data.append(row)
-                selected_indices.append(idx)
+        if not selected_indices and not copy_table:
+            new_table = TableData([], self._table.columns.copy())
+            new_table.column_types = self._table.column_types.copy()
+            return TableProcessor(new_table)
+        
+        return self._select_rows(selected_indices, copy_table)
+    
+    def _select_rows(self, positions: Union[range, List[int]],
+                     copy_table: bool) -> 'TableProcessor':
+        data = self._table.data
         
         if copy_table:
-            new_data = copy.deepcopy(selected_data)
-            new_table = TableData(new_data, self._table.columns.copy())
+            new_table = TableData(columns=self._table.columns.copy())
             new_table.column_types = self._table.column_types.copy()
-        else:
-            if selected_indices:
-                new_table = TableData([], self._table.columns)
-                new_table.data = [self._table.data[i] for i in selected_indices]
-                new_table.column_types = self._table.column_types
+            if self._table.is_columnar:
+                new_table.data = data.take(positions)
             else:
-                new_table = TableData([], self._table.columns.copy())
-                new_table.column_types = self._table.column_types.copy()
+                new_table.data = [list(data[p]) for p in positions]
+        else:
+            new_table = TableData(columns=self._table.columns)
+            new_table.column_types = self._table.column_types
+            new_table.data = self._selection(positions)
+            new_table._parent = self._table
         
         return TableProcessor(new_table)
     
+    def _selection(self, positions: Union[range, List[int]]) -> RowSelection:
+        data = self._table.data
+        if isinstance(data, RowSelection):
+            return data.select(positions)
+        return RowSelection(data, positions)
+    
+    def create_index(self, column: Union[int, str] = 0, kind: str = "hash") -> 'TableProcessor':
+        col_idx = self._get_column_index(column)
+        if kind == "hash":
+            self._table._indexes.setdefault(col_idx, HashIndex(col_idx))
+        elif kind == "sorted":
+            self._table._sorted_indexes.setdefault(col_idx, SortedIndex(col_idx))
+        else:
+            raise TableError(f"Неподдерживаемый тип индекса: {kind}")
+        return self
+    
+    def drop_index(self, column: Union[int, str] = 0) -> 'TableProcessor':
+        col_idx = self._get_column_index(column)
+        self._table._indexes.pop(col_idx, None)
+        self._table._sorted_indexes.pop(col_idx, None)
+        return self
+    
+    def _get_sorted_index(self, col_idx: int) -> Optional[SortedIndex]:
+        index = self._table._sorted_indexes.get(col_idx)
+        if index is None or not self._table.is_columnar:
+            return None
+        if not index.is_valid(self._table):
+            index.build(self._table, self._typed_values(col_idx))
+        return index if index.usable else None
+    
+    def get_rows_by_range(self, column: Union[int, str] = 0, low: Any = None, high: Any = None,
+                          include_low: bool = True, include_high: bool = True,
+                          copy_table: bool = False) -> 'TableProcessor':
+        col_idx = self._get_column_index(column)
+        index = self._get_sorted_index(col_idx)
+        
+        if index is not None:
+            try:
+                positions = sorted(index.range(low, high, include_low, include_high))
+            except TypeError as e:
+                raise OperationError(f"Ошибка сравнения: {e}")
+        else:
+            values = self._typed_values(col_idx)
+            if len(values) != len(self._table.data):
+                raise ColumnError(f"Столбец {self._table.columns[col_idx]} содержит неполные строки")
+            try:
+                positions = [i for i, value in enumerate(values)
+                             if value is not None
+                             and (low is None or (value >= low if include_low else value > low))
+                             and (high is None or (value <= high if include_high else value < high))]
+            except TypeError as e:
+                raise OperationError(f"Ошибка сравнения: {e}")
+        
+        return self._select_rows(positions, copy_table)
+    
+    def sort_by(self, columns: Union[int, str, List[Union[int, str]]],
+                descending: Union[bool, List[bool]] = False,
+                copy_table: bool = False) -> 'TableProcessor':
+        columns = list(columns) if isinstance(columns, (list, tuple)) else [columns]
+        if not columns:
+            raise ColumnError("Не указаны столбцы для сортировки")
+        if isinstance(descending, bool):
+            descending = [descending] * len(columns)
+        elif len(descending) != len(columns):
+            raise TableError("Количество флагов descending должно совпадать с количеством столбцов")
+        
+        col_indices = [self._get_column_index(column) for column in columns]
+        length = len(self._table.data)
+        
+        if len(col_indices) == 1 and not descending[0]:
+            index = self._get_sorted_index(col_indices[0])
+            if index is not None:
+                return self._select_rows(list(index.positions), copy_table)
+        
+        positions = list(range(length))
+        for col_idx, reverse in reversed(list(zip(col_indices, descending))):
+            values = self._typed_values(col_idx)
+            if len(values) != length:
+                raise ColumnError(f"Столбец {self._table.columns[col_idx]} содержит неполные строки")
+            try:
+                if reverse:
+                    positions.sort(key=lambda p: (values[p] is not None, values[p]), reverse=True)
+                elif None in values:
+                    positions.sort(key=lambda p: (values[p] is None, values[p]))
+                else:
+                    positions.sort(key=values.__getitem__)
+            except TypeError as e:
+                raise OperationError(f"Ошибка сортировки: {e}")
+        
+        return self._select_rows(positions, copy_table)
+    
+    def top_k(self, column: Union[int, str], k: int, largest: bool = True,
+              copy_table: bool = False) -> 'TableProcessor':
+        if not isinstance(k, int) or k < 0:
+            raise TableError(f"Некорректное значение k: {k}")
+        
+        col_idx = self._get_column_index(column)
+        values = self._typed_values(col_idx)
+        if len(values) != len(self._table.data):
+            raise ColumnError(f"Столбец {self._table.columns[col_idx]} содержит неполные строки")
+        
+        candidates = range(len(values)) if None not in values else \
+            [i for i, value in enumerate(values) if value is not None]
+        select = heapq.nlargest if largest else heapq.nsmallest
+        try:
+            positions = select(k, candidates, key=values.__getitem__)
+        except TypeError as e:
+            raise OperationError(f"Ошибка сравнения: {e}")
+        
+        return self._select_rows(positions, copy_table)
+    
+    def _get_index(self, col_idx: int, create: bool = False) -> Optional[HashIndex]:
+        if not self._table.is_columnar:
+            return None
+        index = self._table._indexes.get(col_idx)
+        if index is None:
+            if not create:
+                return None
+            index = self._table._indexes[col_idx] = HashIndex(col_idx)
+        if not index.is_valid(self._table):
+            index.build(self._table)
+        return index if index.usable else None
+    
+    def _lookup_rows(self, col_idx: int, values: Tuple[Any, ...]) -> List[int]:
+        index = self._get_index(col_idx, create=col_idx == 0)
+        if index is not None:
+            try:
+                return index.lookup(values)
+            except TypeError:
+                pass
+        
+        column = self._table.data.column(col_idx) if self._table.is_columnar else None
+        if isinstance(column, DictColumn):
+            hits = [False] * len(column.values)
+            for value in values:
+                code = column.code(value)
+                if code is not None:
+                    hits[code] = True
+            return list(compress(range(len(column)), map(hits.__getitem__, column.codes)))
+        
+        return [idx for idx, row in enumerate(self._table.data)
+                if len(row) > col_idx and row[col_idx] in values]
+    
     def get_column_types(self, by_number: bool = True) -> Dict[Union[int, str], type]:
         if not self._table.column_types:
             return {}
@@ -95,6 +284,7 @@ class TableProcessor:
                 if isinstance(key, int):
                     if key >= len(self._table.columns):
                         raise ColumnError(f"Некорректный индекс столбца: {key}")
+                    self._table._value_cache.discard(key)
                     self._table.column_types[key] = type_val
                     if key < len(self._table.columns):
                         self._table.column_types[self._table.columns[key]] = type_val
@@ -104,24 +294,67 @@ class TableProcessor:
                         raise ColumnError(f"Столбец не найден: {key}")
                     self._table.column_types[key] = type_val
                     col_idx = self._table.columns.index(key)
+                    self._table._value_cache.discard(col_idx)
                     self._table.column_types[col_idx] = type_val
     
     def get_values(self, column: Union[int, str] = 0) -> List[Any]:
         col_idx = self._get_column_index(column)
+        return list(self._typed_values(col_idx))
+    
+    def _typed_values(self, col_idx: int) -> List[Any]:
+        col_type = self._table.column_types.get(col_idx)
         
-        values = []
-        for row in self._table.data:
-            if col_idx < len(row):
-                value = row[col_idx]
-                if col_idx in self._table.column_types:
-                    try:
-                        value = self._table.column_types[col_idx](value)
-                    except (ValueError, TypeError):
-                        pass
-                values.append(value)
+        if not self._table.is_columnar:
+            return self._cast_column(col_idx, col_type)
+        
+        buffer = self._table.data.column(col_idx)
+        if col_type is None or column_kind(buffer) is col_type:
+            return column_to_list(buffer)
         
+        cache = self._table._value_cache
+        values = cache.get(self._table, col_idx, col_type)
+        if values is None:
+            values = self._cast_column(col_idx, col_type)
+            cache.put(self._table, col_idx, col_type, values)
         return values
     
+    def _cast_column(self, col_idx: int, col_type: Optional[type]) -> List[Any]:
+        if self._table.is_columnar:
+            column = self._table.data.column(col_idx)
+            if isinstance(column, DictColumn):
+                return column.decode(None if col_type is None else
+                                     lambda value: None if value is None
+                                     else self._cast_value(value, col_type))
+            return self._cast_values(column_to_list(column), col_type)
+        
+        if isinstance(self._table.data, RowSelection):
+            return self._cast_values(self._table.data.column_values(col_idx), col_type)
+        
+        try:
+            values = list(map(itemgetter(col_idx), self._table.data))
+        except IndexError:
+            values = [row[col_idx] for row in self._table.data if col_idx < len(row)]
+        return self._cast_values(values, col_type)
+    
+    def _cast_values(self, values: List[Any], col_type: Optional[type]) -> List[Any]:
+        if col_type is None:
+            return values
+        kinds = set(map(type, values))
+        nulls = type(None) in kinds
+        kinds.discard(type(None))
+        if kinds <= {col_type}:
+            return values
+        
+        present = [value for value in values if value is not None] if nulls else values
+        try:
+            cast = list(map(col_type, present))
+        except (ValueError, TypeError):
+            cast = [self._cast_value(value, col_type) for value in present]
+        if not nulls:
+            return cast
+        cast_iter = iter(cast)
+        return [None if value is None else next(cast_iter) for value in values]
+    
     def get_value(self, column: Union[int, str] = 0) -> Any:
         if len(self._table.data) != 1:
             raise TableError("Таблица должна содержать ровно одну строку")
@@ -138,12 +371,46 @@ class TableProcessor:
         
         col_idx = self._get_column_index(column)
         
+        index = self._table._indexes.get(col_idx)
+        stats = self._table._stats.get(col_idx)
+        sorted_index = self._table._sorted_indexes.get(col_idx)
+        index = index if index is not None and index.is_valid(self._table) else None
+        stats = stats if stats is not None and stats.is_valid(self._table) else None
+        if sorted_index is not None and not sorted_index.is_valid(self._table):
+            sorted_index = None
+        old_values = None
+        if index is not None or stats is not None:
+            old_values = raw_column_values(self._table, col_idx)
+        
+        try:
+            self._write_values(values, col_idx)
+        finally:
+            self._table._touch(col_idx)
+            self._table._value_cache.discard(col_idx)
+        if index is not None:
+            index.refresh(self._table, old_values)
+        if stats is not None:
+            stats.refresh(self._table, old_values)
+        if sorted_index is not None:
+            sorted_index.refresh(self._table, self._typed_values(col_idx))
+    
+    def _write_values(self, values: List[Any], col_idx: int):
+        if isinstance(self._table.data, (ColumnarRows, RowSelection)):
+            col_type = self._table.column_types.get(col_idx)
+            if col_type is not None:
+                try:
+                    values = [value if value is None else col_type(value) for value in values]
+                except (ValueError, TypeError) as e:
+                    raise ColumnError(f"Ошибка преобразования значения: {e}") from e
+            self._table.data.set_column(col_idx, values)
+            return
+        
         for i, row in enumerate(self._table.data):
             while len(row) <= col_idx:
                 row.append(None)
         
         for i, value in enumerate(values):
-            if col_idx in self._table.column_types:
+            if col_idx in self._table.column_types and value is not None:
                 try:
                     self._table.data[i][col_idx] = self._table.column_types[col_idx](value)
                 except (ValueError, TypeError) as e:
@@ -151,40 +418,101 @@ class TableProcessor:
             else:
                 self._table.data[i][col_idx] = value
     
+    def append_rows(self, rows: List[List[Any]]) -> 'TableProcessor':
+        data = self._table.data
+        if isinstance(data, RowSelection):
+            raise TableError("Нельзя добавлять строки в представление таблицы")
+        
+        width = len(self._table.columns)
+        appended = []
+        for row in rows:
+            if len(row) != width:
+                raise ColumnError(
+                    f"Количество значений в строке ({len(row)}) не соответствует "
+                    f"количеству столбцов ({width})"
+                )
+            row = list(row)
+            for col_idx, value in enumerate(row):
+                col_type = self._table.column_types.get(col_idx)
+                if col_type is not None and value is not None:
+                    try:
+                        row[col_idx] = col_type(value)
+                    except (ValueError, TypeError) as e:
+                        raise ColumnError(f"Ошибка преобразования значения: {value}") from e
+            appended.append(row)
+        
+        valid_stats = [stats for stats in self._table._stats.values()
+                       if stats.is_valid(self._table)]
+        data.extend(appended)
+        self._table._value_cache.clear()
+        for stats in valid_stats:
+            stats.extend(self._table, [row[stats.col_idx] for row in appended])
+        
+        return self
+    
+    def set_cache_budget(self, budget: int) -> 'TableProcessor':
+        if not isinstance(budget, int) or budget < 0:
+            raise TableError(f"Некорректный размер кеша: {budget}")
+        self._table._value_cache.resize(budget)
+        return self
+    
+    def get_column_stats(self, column: Union[int, str] = 0) -> Dict[str, Any]:
+        col_idx = self._get_column_index(column)
+        return column_stats(self._table, col_idx).to_dict()
+    
+    def null_count(self, column: Union[int, str] = 0) -> int:
+        col_idx = self._get_column_index(column)
+        return column_validity(self._table, col_idx).null_count
+    
+    def is_null(self, column: Union[int, str] = 0, as_mask: bool = False) -> Union[List[bool], Mask]:
+        col_idx = self._get_column_index(column)
+        mask = ~column_validity(self._table, col_idx).mask()
+        return mask if as_mask else mask.to_list()
+    
+    def fill_null(self, column: Union[int, str], value: Any) -> 'TableProcessor':
+        if value is None:
+            raise TableError("Значение для заполнения пропусков не может быть None")
+    
+        col_idx = self._get_column_index(column)
+        validity = column_validity(self._table, col_idx)
+        if not validity.null_count:
+            return self
+    
+        values = list(self._typed_values(col_idx))
+        if len(values) != len(self._table.data):
+            values = [None if cell is _MISSING else cell
+                      for cell in raw_column_values(self._table, col_idx)]
+        for position in (~validity.mask()).indices():
+            values[position] = value
+        self.set_values(values, col_idx)
+        return self
+    
+    def drop_null(self, *columns: Union[int, str, List[Union[int, str]]],
+                  copy_table: bool = False) -> 'TableProcessor':
+        if columns:
+            col_indices = [self._get_column_index(column) for column in _flatten_keys(columns)]
+        else:
+            col_indices = list(range(len(self._table.columns)))
+    
+        length = len(self._table.data)
+        keep = Mask.full(length)
+        for col_idx in col_indices:
+            validity = column_validity(self._table, col_idx)
+            if validity.null_count:
+                keep &= validity.mask()
+    
+        positions = range(length) if keep.all() else keep.indices()
+        return self._select_rows(positions, copy_table)
+    
     def set_value(self, value: Any, column: Union[int, str] = 0):
         if len(self._table.data) != 1:
             raise TableError("Таблица должна содержать ровно одну строку")
         
         self.set_values([value], column)
     
-    def print_table(self):
-        if not self._table.columns:
-            print("Пустая таблица")
-            return
-        
-        col_widths = []
-        for i, col in enumerate(self._table.columns):
-            max_width = len(str(col))
-            
-            for row in self._table.data:
-                if i < len(row):
-                    max_width = max(max_width, len(str(row[i])))
-            
-            col_widths.append(max_width + 2)
-        
-        header = " | ".join(str(col).ljust(col_widths[i]) 
-                          for i, col in enumerate(self._table.columns))
-        print(header)
-        print("-" * len(header))
-        
-        for row in self._table.data:
-            row_str = " | ".join(
-                str(row[i] if i < len(row) else "").ljust(col_widths[i])
-                for i in range(len(self._table.columns))
-            )
-            print(row_str)
-        
-        print(f"\nВсего строк: {len(self._table.data)}, столбцов: {len(self._table.columns)}")
+    def print_table(self, head: Optional[int] = None, tail: Optional[int] = None,
+                    page_rows: Optional[int] = None):
+        write_table(self._table, sys.stdout, head=head, tail=tail, page_rows=page_rows, end="\n")
     
     def add(self, col1: Union[int, str], col2: Union[int, str, Any], 
            result_col: Optional[Union[int, str]] = None) -> 'TableProcessor':
@@ -202,45 +530,87 @@ class TableProcessor:
            result_col: Optional[Union[int, str]] = None) -> 'TableProcessor':
         return self._arithmetic_operation(col1, col2, result_col, lambda a, b: a / b, "div")
     
-    def eq(self, col1: Union[int, str], col2: Union[int, str, Any]) -> List[bool]:
-        return self._comparison_operation(col1, col2, lambda a, b: a == b)
+    def eq(self, col1: Union[int, str], col2: Union[int, str, Any],
+           as_mask: bool = False) -> Union[List[bool], Mask]:
+        return self._comparison_operation(col1, col2, lambda a, b: a == b, "eq", as_mask)
+    
+    def ne(self, col1: Union[int, str], col2: Union[int, str, Any],
+           as_mask: bool = False) -> Union[List[bool], Mask]:
+        return self._comparison_operation(col1, col2, lambda a, b: a != b, "ne", as_mask)
     
-    def ne(self, col1: Union[int, str], col2: Union[int, str, Any]) -> List[bool]:
-        return self._comparison_operation(col1, col2, lambda a, b: a != b)
+    def gr(self, col1: Union[int, str], col2: Union[int, str, Any],
+           as_mask: bool = False) -> Union[List[bool], Mask]:
+        return self._comparison_operation(col1, col2, lambda a, b: a > b, "gr", as_mask)
     
-    def gr(self, col1: Union[int, str], col2: Union[int, str, Any]) -> List[bool]:
-        return self._comparison_operation(col1, col2, lambda a, b: a > b)
+    def ls(self, col1: Union[int, str], col2: Union[int, str, Any],
+           as_mask: bool = False) -> Union[List[bool], Mask]:
+        return self._comparison_operation(col1, col2, lambda a, b: a < b, "ls", as_mask)
     
-    def ls(self, col1: Union[int, str], col2: Union[int, str, Any]) -> List[bool]:
-        return self._comparison_operation(col1, col2, lambda a, b: a < b)
+    def ge(self, col1: Union[int, str], col2: Union[int, str, Any],
+           as_mask: bool = False) -> Union[List[bool], Mask]:
+        return self._comparison_operation(col1, col2, lambda a, b: a >= b, "ge", as_mask)
     
-    def ge(self, col1: Union[int, str], col2: Union[int, str, Any]) -> List[bool]:
-        return self._comparison_operation(col1, col2, lambda a, b: a >= b)
+    def le(self, col1: Union[int, str], col2: Union[int, str, Any],
+           as_mask: bool = False) -> Union[List[bool], Mask]:
+        return self._comparison_operation(col1, col2, lambda a, b: a <= b, "le", as_mask)
     
-    def le(self, col1: Union[int, str], col2: Union[int, str, Any]) -> List[bool]:
-        return self._comparison_operation(col1, col2, lambda a, b: a <= b)
+    def eval(self, expression: str, result_col: Optional[Union[int, str]] = None
+             ) -> Union[List[Any], 'TableProcessor']:
+        compiled = compile_expression(expression, self)
+        values = compiled.values(self)
+        if result_col is None:
+            return values
+        
+        if self._is_column(result_col):
+            col_idx = self._get_column_index(result_col)
+            if compiled.result_type is not None:
+                self.set_column_types({col_idx: compiled.result_type})
+            self.set_values(values, col_idx)
+            return self
+        if not isinstance(result_col, str):
+            raise ColumnError(f"Некорректный индекс столбца: {result_col}")
+        
+        self._add_column(result_col, values, compiled.result_type)
+        return self
+    
+    def where(self, expression: str, as_mask: bool = False) -> Union[List[bool], Mask]:
+        mask = compile_expression(expression, self).mask(self)
+        return mask if as_mask else mask.to_list()
+    
+    def _add_column(self, name: str, values: List[Any], col_type: Optional[type]):
+        data = self._table.data
+        if isinstance(data, RowSelection):
+            raise TableError("Нельзя добавлять столбцы в представление таблицы")
+        
+        col_idx = len(self._table.columns)
+        if isinstance(data, ColumnarRows):
+            data.add_column(values)
+        else:
+            for row, value in zip(data, values):
+                while len(row) < col_idx:
+                    row.append(None)
+                row.append(value)
+        
+        self._table.columns = self._table.columns + [name]
+        if col_type is not None:
+            self._table.column_types[col_idx] = col_type
+            self._table.column_types[name] = col_type
+        self._table._touch(col_idx)
     
-    def filter_rows(self, bool_list: List[bool], copy_table: bool = False) -> 'TableProcessor':
+    def filter_rows(self, bool_list: Union[List[bool], Mask, range, array],
+                    copy_table: bool = False) -> 'TableProcessor':
+        if isinstance(bool_list, (Mask, range, array)):
+            positions = as_positions(bool_list, len(self._table.data))
+            return self._select_rows(positions, copy_table)
+        
         if len(bool_list) != len(self._table.data):
             raise TableError(
                 f"Длина bool_list ({len(bool_list)}) должна соответствовать "
                 f"количеству строк ({len(self._table.data)})"
             )
         
-        filtered_data = []
-        for i, keep in enumerate(bool_list):
-            if keep and i < len(self._table.data):
-                filtered_data.append(self._table.data[i])
-        
-        if copy_table:
-            new_data = copy.deepcopy(filtered_data)
-            new_table = TableData(new_data, self._table.columns.copy())
-            new_table.column_types = self._table.column_types.copy()
-        else:
-            new_table = TableData(filtered_data, self._table.columns)
-            new_table.column_types = self._table.column_types
-        
-        return TableProcessor(new_table)
+        positions = [i for i, keep in enumerate(bool_list) if keep]
+        return self._select_rows(positions, copy_table)
     
     def _get_column_index(self, column: Union[int, str]) -> int:
         if isinstance(column, int):
@@ -254,42 +624,125 @@ class TableProcessor:
         else:
             raise ColumnError(f"Некорректный тип столбца: {type(column)}")
     
+    @staticmethod
+    def _cast_value(value: Any, col_type: type) -> Any:
+        try:
+            return col_type(value)
+        except (ValueError, TypeError):
+            return value
+    
+    def _numeric_operand(self, col_idx: int) -> Union[List[Any], array]:
+        if self._table.is_columnar:
+            buffer = self._table.data.column(col_idx)
+            kind = column_kind(buffer)
+            if kind is not None and self._table.column_types.get(col_idx, kind) is kind:
+                return buffer
+        return self._typed_values(col_idx)
+    
+    def _is_column(self, operand: Any) -> bool:
+        return (isinstance(operand, (int, str)) and operand in self._table.columns or
+                isinstance(operand, int) and 0 <= operand < len(self._table.columns))
+    
+    def _resolve_operands(self, col1: Union[int, str], col2: Union[int, str, Any]
+                          ) -> Tuple[int, Any, Any, bool]:
+        col1_idx = self._get_column_index(col1)
+        operand1 = self._numeric_operand(col1_idx)
+        
+        if self._is_column(col2):
+            col2_idx = self._get_column_index(col2)
+            return col1_idx, operand1, self._numeric_operand(col2_idx), True
+        return col1_idx, operand1, col2, False
+    
+    @staticmethod
+    def _operand_values(operand: Any, is_column: bool, length: int) -> List[Any]:
+        if not is_column:
+            return [operand] * length
+        return column_to_list(operand) if isinstance(operand, (array, NullableColumn)) else operand
+    
+    @staticmethod
+    def _operand_validity(operand: Any, is_column: bool, length: int) -> Optional[Mask]:
+        if not is_column or isinstance(operand, array):
+            return None
+        if isinstance(operand, NullableColumn):
+            return Mask.from_packed(operand.validity, length) if operand.null_count else None
+        if None not in operand:
+            return None
+        return Mask.from_bools(bytes([value is not None for value in operand]))
+    
+    def _combined_validity(self, operand1: Any, operand2: Any, is_column2: bool) -> Optional[Mask]:
+        length = len(operand1)
+        valid1 = self._operand_validity(operand1, True, length)
+        valid2 = self._operand_validity(operand2, is_column2, length)
+        if valid1 is None or valid2 is None:
+            return valid1 if valid2 is None else valid2
+        return valid1 & valid2
+    
+    @staticmethod
+    def _scatter(values: List[Any], positions: List[int], length: int) -> List[Any]:
+        results: List[Any] = [None] * length
+        for position, value in zip(positions, values):
+            results[position] = value
+        return results
+    
+    def _dictionary_compare(self, column: DictColumn, col_idx: int, value: Any, equal: bool,
+                            as_mask: bool) -> Union[List[bool], Mask]:
+        col_type = self._table.column_types.get(col_idx)
+        try:
+            hits = [(self._cast_value(item, col_type) if col_type else item) == value
+                    for item in column.values]
+        except Exception as e:
+            raise OperationError(f"Ошибка сравнения: {e}")
+        if not equal:
+            hits = [not hit for hit in hits]
+        null_code = column.code(None)
+        if null_code is not None:
+            hits[null_code] = equal and value is None
+        
+        if column.codes.typecode == 'B':
+            table = bytes(hits) + bytes(256 - len(hits))
+            flags = column.codes.tobytes().translate(table)
+            return Mask.from_bools(flags) if as_mask else list(map(bool, flags))
+        results = list(map(hits.__getitem__, column.codes))
+        return Mask.from_bools(results) if as_mask else results
+    
     def _arithmetic_operation(self, col1: Union[int, str], col2: Union[int, str, Any],
                             result_col: Optional[Union[int, str]], 
                             operation: callable, op_name: str) -> 'TableProcessor':
-        col1_idx = self._get_column_index(col1)
+        col1_idx, operand1, operand2, is_column2 = self._resolve_operands(col1, col2)
         
-        values1 = self.get_values(col1_idx)
-        
-        if isinstance(col2, (int, str)) and col2 in self._table.columns or \
-           isinstance(col2, int) and 0 <= col2 < len(self._table.columns):
-            col2_idx = self._get_column_index(col2)
-            values2 = self.get_values(col2_idx)
+        if isinstance(operand1, (array, NullableColumn)):
+            col1_type = column_kind(operand1)
         else:
-            values2 = [col2] * len(values1)
-        
-        col1_type = self._table.column_types.get(col1_idx, type(values1[0]) if values1 else None)
+            col1_type = self._table.column_types.get(
+                col1_idx, next((type(value) for value in operand1 if value is not None), None))
         if col1_type not in (int, float, bool):
             raise OperationError(
                 f"Операция {op_name} поддерживается только для числовых типов и bool. "
                 f"Тип столбца {col1}: {col1_type}"
             )
         
-        results = []
-        for v1, v2 in zip(values1, values2):
+        length = len(operand1)
+        valid = self._combined_validity(operand1, operand2, is_column2)
+        results = vectorized.arithmetic(operand1, operand2, op_name,
+                                        None if valid is None else valid.packed())
+        
+        if results is None:
+            values1 = self._operand_values(operand1, True, length)
+            values2 = self._operand_values(operand2, is_column2, length)
+            positions = None
+            if valid is not None:
+                positions = valid.indices()
+                values1 = list(map(values1.__getitem__, positions))
+                values2 = list(map(values2.__getitem__, positions))
+            
+            if op_name == "div" and 0 in values2:
+                raise OperationError(f"Ошибка операции {op_name}: Деление на ноль")
             try:
-                if isinstance(v1, bool):
-                    v1 = int(v1)
-                if isinstance(v2, bool):
-                    v2 = int(v2)
-                
-                if op_name == "div" and v2 == 0:
-                    raise OperationError("Деление на ноль")
-                
-                result = operation(v1, v2)                    
-                results.append(result)
+                results = list(map(operation, values1, values2))
             except Exception as e:
                 raise OperationError(f"Ошибка операции {op_name}: {e}")
+            if positions is not None:
+                results = self._scatter(results, positions, length)
         
         if result_col is None:
             result_idx = col1_idx
@@ -298,8 +751,8 @@ class TableProcessor:
         
         self.set_values(results, result_idx)
         
-        if results:
-            result_type = type(results[0])
+        result_type = next((type(value) for value in results if value is not None), None)
+        if result_type is not None:
             self._table.column_types[result_idx] = result_type
             if result_idx < len(self._table.columns):
                 self._table.column_types[self._table.columns[result_idx]] = result_type
@@ -307,27 +760,74 @@ class TableProcessor:
         return self
     
     def _comparison_operation(self, col1: Union[int, str], col2: Union[int, str, Any],
-                            operation: callable) -> List[bool]:
-        col1_idx = self._get_column_index(col1)
-        values1 = self.get_values(col1_idx)
-        
-        if isinstance(col2, (int, str)) and col2 in self._table.columns or \
-           isinstance(col2, int) and 0 <= col2 < len(self._table.columns):
-            col2_idx = self._get_column_index(col2)
-            values2 = self.get_values(col2_idx)
+                            operation: callable, op_name: str,
+                            as_mask: bool = False) -> Union[List[bool], Mask]:
+        length = len(self._table.data)
+        if not self._is_column(col2):
+            col1_idx = self._get_column_index(col1)
+            stats = self._table._stats.get(col1_idx)
+            if stats is not None and stats.is_valid(self._table):
+                decided = stats.decide(op_name, col2, self._table.column_types.get(col1_idx))
+                if decided is not None:
+                    return Mask.full(length, decided) if as_mask else [decided] * length
+            
+            if op_name in ('eq', 'ne') and self._table.is_columnar:
+                column = self._table.data.column(col1_idx)
+                if isinstance(column, DictColumn):
+                    return self._dictionary_compare(column, col1_idx, col2, op_name == 'eq', as_mask)
+        
+            if op_name in _RANGE_BOUNDS:
+                index = self._get_sorted_index(col1_idx)
+                if index is not None:
+                    low, high, include_low, include_high = _RANGE_BOUNDS[op_name](col2)
+                    try:
+                        positions = index.range(low, high, include_low, include_high)
+                    except TypeError as e:
+                        raise OperationError(f"Ошибка сравнения: {e}")
+                    if as_mask:
+                        return Mask.from_indices(positions, length)
+                    results = [False] * length
+                    for position in positions:
+                        results[position] = True
+                    return results
+        
+        _, operand1, operand2, is_column2 = self._resolve_operands(col1, col2)
+        length = len(operand1)
+        valid = self._combined_validity(operand1, operand2, is_column2)
+        
+        if not is_column2 and col2 is None and op_name in ('eq', 'ne'):
+            mask = Mask.full(length) if valid is None else valid
+            mask = ~mask if op_name == 'eq' else mask
+            return mask if as_mask else mask.to_list()
+        
+        if valid is not None:
+            packed = vectorized.compare_packed(operand1, operand2, op_name)
+            if packed is not None:
+                mask = Mask.from_packed(packed, length) & valid
+                return mask if as_mask else mask.to_list()
+        elif as_mask:
+            packed = vectorized.compare_packed(operand1, operand2, op_name)
+            if packed is not None:
+                return Mask.from_packed(packed, length)
         else:
-            values2 = [col2] * len(values1)
-        
-        results = []
-        for v1, v2 in zip(values1, values2):
-            try:
-                if isinstance(v1, bool):
-                    v1 = int(v1)
-                if isinstance(v2, bool):
-                    v2 = int(v2)
-                
-                results.append(operation(v1, v2))
-            except Exception as e:
-                raise OperationError(f"Ошибка сравнения: {e}")
-        
-        return results
\ No newline at end of file
+            results = vectorized.compare(operand1, operand2, op_name)
+            if results is not None:
+                return results
+        
+        values1 = self._operand_values(operand1, True, length)
+        values2 = self._operand_values(operand2, is_column2, length)
+        positions = None
+        if valid is not None:
+            positions = valid.indices()
+            values1 = list(map(values1.__getitem__, positions))
+            values2 = list(map(values2.__getitem__, positions))
+        
+        try:
+            results = list(map(operation, values1, values2))
+        except Exception as e:
+            raise OperationError(f"Ошибка сравнения: {e}")
+        
+        if positions is not None:
+            mask = Mask.from_indices(compress(positions, results), length)
+            return mask if as_mask else mask.to_list()
+        return Mask.from_bools(results) if as_mask else results
@@ -0,0 +1,310 @@
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from .bitmap import unpack_flags
+from .columnar import ColumnarRows, Column, NullableColumn, column_to_list
+from .utils import TableData, LoadError, SaveError, atomic_open, save_parts
+from .profiling import instrumented
+
+MAGIC = b"TPCOL\x00\x01\x00"
+_ALIGNMENT = 8
+_HEADER_LEN = struct.Struct("<Q")
+_TYPECODES = {int: 'q', float: 'd', bool: 'b'}
+_TYPE_NAMES = {'int': int, 'float': float, 'bool': bool, 'str': str}
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+@instrumented("load_binary", reads=True)
+def load_table(*file_paths, columns: Optional[Sequence[str]] = None) -> TableData:
+    if not file_paths:
+        raise LoadError("Не указаны файлы для загрузки")
+
+    segments = []
+    names = None
+    column_types: Dict[int, type] = {}
+
+    try:
+        for file_idx, file_path in enumerate(file_paths):
+            if not os.path.exists(file_path):
+                raise LoadError(f"Файл не существует: {file_path}")
+            try:
+                mapped, header, data_start = _open_mapped(file_path)
+            except LoadError:
+                raise
+            except Exception as e:
+                raise LoadError(f"Ошибка чтения файла {file_path}: {str(e)}")
+            segments.append((mapped, data_start, header))
+
+            if file_idx == 0:
+                names = header['columns']
+                column_types = {int(k): _TYPE_NAMES[v] for k, v in header['column_types'].items()}
+            elif header['columns'] != names:
+                raise LoadError(f"Ошибка чтения файла {file_path}: "
+                                f"Несоответствие столбцов в файле {file_path}")
+
+        if columns is None:
+            selected = list(range(len(names)))
+        else:
+            missing = [name for name in columns if name not in names]
+            if missing:
+                raise LoadError(f"Столбцы не найдены: {missing}")
+            selected = [names.index(name) for name in columns]
+    except BaseException:
+        for mapped, _, _ in segments:
+            mapped.close()
+        raise
+
+    rows = sum(header['rows'] for _, _, header in segments)
+    mapped_columns = MappedColumns(segments, selected)
+    if not selected:
+        mapped_columns.close()
+    data = ColumnarRows(mapped_columns, rows)
+    types = {new_idx: column_types[old_idx]
+             for new_idx, old_idx in enumerate(selected) if old_idx in column_types}
+    return TableData(data, [names[i] for i in selected], column_types=types)
+
+
+@instrumented("save_binary", writes=True)
+def save_table(table: TableData, file_path: str, max_rows: Optional[int] = None,
+               workers: Optional[int] = 1):
+    if not table.data and not table.columns:
+        raise SaveError("Пустая таблица")
+
+    if max_rows is None or len(table.data) <= max_rows:
+        _save_binary(table, file_path, 0, len(table.data))
+    else:
+        save_parts(table, file_path, max_rows, _save_binary, workers)
+
+
+class MappedColumns:
+    def __init__(self, segments: List[Tuple[mmap.mmap, int, Dict[str, Any]]], selected: List[int]):
+        self._segments = segments
+        self._selected = selected
+        self._decoded: Dict[int, Column] = {}
+
+    def is_decoded(self, col: int) -> bool:
+        return col in self._decoded
+
+    def __getitem__(self, col: int) -> Column:
+        column = self._decoded.get(col)
+        if column is None:
+            column = self._decoded[col] = self._decode(self._selected[col])
+            if len(self._decoded) == len(self._selected):
+                self.close()
+        return column
+
+    def __setitem__(self, col: int, column: Column):
+        self._decoded[col] = column
+
+    def __len__(self) -> int:
+        return len(self._selected)
+
+    def __iter__(self) -> Iterator[Column]:
+        for col in range(len(self._selected)):
+            yield self[col]
+
+    def close(self):
+        for col, source_col in enumerate(self._selected):
+            if col not in self._decoded:
+                self._decoded[col] = self._decode(source_col)
+        for mapped, _, _ in self._segments:
+            mapped.close()
+        self._segments = []
+
+    @property
+    def closed(self) -> bool:
+        return not self._segments
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+    def _decode(self, source_col: int) -> Column:
+        parts = [_decode_column(mapped, data_start, header['rows'], header['blocks'][source_col])
+                 for mapped, data_start, header in self._segments]
+        if len(parts) == 1:
+            return parts[0]
+        if all(isinstance(part, array) for part in parts) and \
+                len({part.typecode for part in parts}) == 1:
+            merged = array(parts[0].typecode)
+            for part in parts:
+                merged.extend(part)
+            return merged
+        typecodes = {part.values.typecode if isinstance(part, NullableColumn) else part.typecode
+                     for part in parts if isinstance(part, (array, NullableColumn))}
+        if len(typecodes) == 1 and all(isinstance(part, (array, NullableColumn)) for part in parts):
+            merged = NullableColumn(array(typecodes.pop()))
+            for part in parts:
+                merged.extend(part)
+            return merged
+        merged = []
+        for part in parts:
+            merged.extend(column_to_list(part))
+        return merged
+
+
+def _open_mapped(file_path: str) -> Tuple[mmap.mmap, Dict[str, Any], int]:
+    with open(file_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if mapped[:len(MAGIC)] != MAGIC:
+        mapped.close()
+        raise LoadError(f"Файл {file_path} не является бинарной таблицей")
+
+    header_start = len(MAGIC) + _HEADER_LEN.size
+    (header_len,) = _HEADER_LEN.unpack_from(mapped, len(MAGIC))
+    header = json.loads(mapped[header_start:header_start + header_len].decode('utf-8'))
+    return mapped, header, _align(header_start + header_len)
+
+
+def _decode_column(mapped: mmap.mmap, data_start: int, rows: int, block: Dict[str, Any]) -> Column:
+    kind = block['kind']
+
+    if kind == 'object':
+        return pickle.loads(_slice(mapped, data_start, block['data']))
+
+    if kind == 'str':
+        offsets = _read_array('Q', mapped, data_start, block['offsets'])
+        blob = _slice(mapped, data_start, block['data'])
+        values = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(rows)]
+    else:
+        values = _read_array(kind, mapped, data_start, block['data'])
+        if 'validity' not in block:
+            return values
+        return NullableColumn(values, bytearray(_slice(mapped, data_start, block['validity'])))
+
+    if 'validity' in block:
+        flags = unpack_flags(_slice(mapped, data_start, block['validity']), rows)
+        values = [value if flag else None for value, flag in zip(values, flags)]
+    return values
+
+
+def _read_array(typecode: str, mapped: mmap.mmap, data_start: int, extent: List[int]) -> array:
+    values = array(typecode)
+    offset, length = extent
+    with memoryview(mapped) as view, view[data_start + offset:data_start + offset + length] as chunk:
+        values.frombytes(chunk)
+    if sys.byteorder != 'little' and values.itemsize > 1:
+        values.byteswap()
+    return values
+
+
+def _slice(mapped: mmap.mmap, data_start: int, extent: List[int]) -> bytes:
+    offset, length = extent
+    return mapped[data_start + offset:data_start + offset + length]
+
+
+def _save_binary(table: TableData, file_path: str, start: int, stop: int):
+    try:
+        blocks = []
+        chunks: List[bytes] = []
+        position = 0
+
+        def add_chunk(payload: bytes) -> List[int]:
+            nonlocal position
+            extent = [position, len(payload)]
+            padding = _align(len(payload)) - len(payload)
+            chunks.append(payload + b"\x00" * padding)
+            position += len(payload) + padding
+            return extent
+
+        rows = None if table.is_columnar else list(table.data[start:stop])
+        transposed = None
+        if rows is not None and set(map(len, rows)) == {len(table.columns)}:
+            transposed = list(zip(*rows))
+        for col_idx in range(len(table.columns)):
+            if transposed is not None:
+                values = transposed[col_idx]
+            elif rows is None:
+                column = table.data.column(col_idx)[start:stop]
+                if isinstance(column, array):
+                    blocks.append({'kind': column.typecode, 'data': add_chunk(_little_endian(column))})
+                    continue
+                if isinstance(column, NullableColumn):
+                    blocks.append({'kind': column.values.typecode,
+                                   'data': add_chunk(_little_endian(column.values)),
+                                   'validity': add_chunk(bytes(column.validity))})
+                    continue
+                values = column
+            else:
+                values = [row[col_idx] if col_idx < len(row) else None for row in rows]
+            blocks.append(_encode_column(values, add_chunk))
+
+        column_types = {str(k): v.__name__ for k, v in table.column_types.items()
+                        if isinstance(k, int) and v.__name__ in _TYPE_NAMES}
+        header = json.dumps({
+            'rows': stop - start,
+            'columns': list(table.columns),
+            'column_types': column_types,
+            'blocks': blocks,
+        }).encode('utf-8')
+
+        header_end = len(MAGIC) + _HEADER_LEN.size + len(header)
+        with atomic_open(file_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            f.write(b"\x00" * (_align(header_end) - header_end))
+            for chunk in chunks:
+                f.write(chunk)
+    except Exception as e:
+        raise SaveError(f"Ошибка сохранения в {file_path}: {str(e)}")
+
+
+def _encode_column(values: Sequence[Any], add_chunk) -> Dict[str, Any]:
+    kinds = set(map(type, values))
+    has_nulls = type(None) in kinds or not values
+    kinds.discard(type(None))
+    present = [value for value in values if value is not None] if has_nulls else values
+
+    if len(kinds) > 1 or (kinds and next(iter(kinds)) not in (int, float, bool, str)):
+        return _encode_objects(values, add_chunk)
+
+    kind = next(iter(kinds)) if kinds else str
+    block: Dict[str, Any] = {}
+
+    if kind is str:
+        encoded = [value.encode('utf-8') if value is not None else b"" for value in values]
+        offsets = array('Q', accumulate(map(len, encoded), initial=0))
+        block['kind'] = 'str'
+        block['offsets'] = add_chunk(_little_endian(offsets))
+        block['data'] = add_chunk(b"".join(encoded))
+    else:
+        if kind is int and present and \
+                (min(present) < _INT64_MIN or max(present) > _INT64_MAX):
+            return _encode_objects(values, add_chunk)
+        filler = kind()
+        buffer = array(_TYPECODES[kind],
+                       [filler if value is None else value for value in values] if has_nulls else values)
+        block['kind'] = _TYPECODES[kind]
+        block['data'] = add_chunk(_little_endian(buffer))
+
+    if has_nulls:
+        validity = bytearray((len(values) + 7) // 8)
+        for i, value in enumerate(values):
+            if value is not None:
+                validity[i >> 3] |= 1 << (i & 7)
+        block['validity'] = add_chunk(bytes(validity))
+
+    return block
+
+
+def _encode_objects(values: Sequence[Any], add_chunk) -> Dict[str, Any]:
+    payload = pickle.dumps(list(values), protocol=pickle.HIGHEST_PROTOCOL)
+    return {'kind': 'object', 'data': add_chunk(payload)}
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != 'little' and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _align(size: int) -> int:
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
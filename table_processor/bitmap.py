@@ -0,0 +1,20 @@
+from typing import Iterable
+
+_DIGITS = bytes.maketrans(bytes(range(256)), b"0" + b"1" * 255)
+_EXPANDED = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+
+def flags_to_bits(flags: bytes) -> int:
+    return int(flags[::-1].translate(_DIGITS), 2) if flags else 0
+
+
+def pack_flags(flags: bytes) -> bytearray:
+    return bytearray(flags_to_bits(flags).to_bytes((len(flags) + 7) // 8, 'little'))
+
+
+def unpack_flags(packed: Iterable[int], length: int) -> bytes:
+    return b"".join(map(_EXPANDED.__getitem__, packed))[:length]
+
+
+def count_bits(packed: bytes) -> int:
+    return int.from_bytes(packed, 'little').bit_count()
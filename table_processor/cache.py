@@ -0,0 +1,76 @@
+import sys
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+CACHE_BUDGET = 64 * 1024 * 1024
+_SIZE_SAMPLE = 16
+
+
+class ColumnCache:
+    def __init__(self, budget: int = CACHE_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[int, Tuple[Any, int, int, Optional[type], List[Any], int]]' = OrderedDict()
+
+    def get(self, table, col_idx: int, col_type: Optional[type]) -> Optional[List[Any]]:
+        entry = self._entries.get(col_idx)
+        if entry is None:
+            self.misses += 1
+            return None
+        data, length, version, cached_type, values, _ = entry
+        if (data is not table.data or length != len(table.data)
+                or version != table.column_version(col_idx) or cached_type is not col_type):
+            self.discard(col_idx)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(col_idx)
+        self.hits += 1
+        return values
+
+    def put(self, table, col_idx: int, col_type: Optional[type], values: List[Any]):
+        self.discard(col_idx)
+        size = _estimate_size(values)
+        if size > self.budget:
+            return
+        self._entries[col_idx] = (table.data, len(table.data), table.column_version(col_idx),
+                                  col_type, values, size)
+        self.size += size
+        self._evict()
+
+    def discard(self, col_idx: int):
+        entry = self._entries.pop(col_idx, None)
+        if entry is not None:
+            self.size -= entry[5]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def resize(self, budget: int):
+        self.budget = budget
+        self._evict()
+
+    def _evict(self):
+        while self.size > self.budget and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self.size -= entry[5]
+
+    def __contains__(self, col_idx: int) -> bool:
+        return col_idx in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"ColumnCache(columns={len(self._entries)}, size={self.size}, budget={self.budget})"
+
+
+def _estimate_size(values: List[Any]) -> int:
+    size = sys.getsizeof(values)
+    if not values:
+        return size
+    step = max(1, len(values) // _SIZE_SAMPLE)
+    sample = values[::step][:_SIZE_SAMPLE]
+    return size + len(values) * sum(map(sys.getsizeof, sample)) // len(sample)
@@ -0,0 +1,490 @@
+from array import array
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .bitmap import count_bits, pack_flags, unpack_flags
+
+_TYPECODES = {int: 'q', float: 'd', bool: 'b'}
+_CODE_TYPECODES = (('B', 1 << 8), ('H', 1 << 16), ('i', 1 << 31))
+_ENCODE_CHUNK = 1 << 16
+
+DICTIONARY_MAX_VALUES = 1 << 16
+DICTIONARY_MAX_RATIO = 0.5
+
+Column = Union[array, List[Any], 'DictColumn', 'NullableColumn']
+
+
+def _detect_kind(values: List[Any]) -> Tuple[Optional[type], bool]:
+    kind = None
+    nulls = False
+    for value in values:
+        if value is None:
+            nulls = True
+            continue
+        value_type = type(value)
+        if value_type not in _TYPECODES:
+            return None, nulls
+        if kind is None:
+            kind = value_type
+        elif kind is not value_type:
+            return None, nulls
+    return kind, nulls
+
+
+def make_column(values: Iterable[Any], dictionary: Optional[int] = DICTIONARY_MAX_VALUES) -> Column:
+    if isinstance(values, (DictColumn, NullableColumn)):
+        return values
+    values = values if isinstance(values, list) else list(values)
+    kind, nulls = _detect_kind(values)
+    if kind is None:
+        encoded = DictColumn.encode(values, dictionary) if dictionary else None
+        return encoded if encoded is not None else values
+    try:
+        if nulls:
+            return NullableColumn.from_values(values, kind)
+        return array(_TYPECODES[kind], values)
+    except OverflowError:
+        return values
+
+
+class DictColumn:
+    __slots__ = ('codes', 'values', 'lookup')
+
+    def __init__(self, codes: array, values: List[Any], lookup: Optional[Dict[Any, int]] = None):
+        self.codes = codes
+        self.values = values
+        self.lookup = lookup if lookup is not None else {value: code for code, value in enumerate(values)}
+
+    @classmethod
+    def encode(cls, values: List[Any], max_values: int = DICTIONARY_MAX_VALUES) -> Optional['DictColumn']:
+        if len(values) < 2 or not set(map(type, values)) <= {str, type(None)}:
+            return None
+        limit = min(max_values, max(1, int(len(values) * DICTIONARY_MAX_RATIO)))
+        lookup: Dict[Any, int] = {}
+        codes: List[int] = []
+        for start in range(0, len(values), _ENCODE_CHUNK):
+            codes.extend([lookup.setdefault(value, len(lookup))
+                          for value in values[start:start + _ENCODE_CHUNK]])
+            if len(lookup) > limit:
+                return None
+        return cls(array(_code_typecode(len(lookup)), codes), list(lookup), lookup)
+
+    def code(self, value: Any) -> Optional[int]:
+        return self.lookup.get(value)
+
+    def decode(self, convert: Optional[Callable[[Any], Any]] = None) -> List[Any]:
+        values = self.values if convert is None else [convert(value) for value in self.values]
+        return list(map(values.__getitem__, self.codes))
+
+    def positions(self) -> List[List[int]]:
+        groups: List[List[int]] = [[] for _ in self.values]
+        for position, code in enumerate(self.codes):
+            groups[code].append(position)
+        return groups
+
+    def take(self, indices: Iterable[int]) -> 'DictColumn':
+        codes = self.codes
+        return DictColumn(array(codes.typecode, [codes[i] for i in indices]), self.values, self.lookup)
+
+    def append(self, value: Any):
+        self.codes.append(self._encode(value))
+
+    def extend(self, values: Iterable[Any]):
+        if isinstance(values, DictColumn) and values.values is self.values:
+            self.codes.extend(values.codes)
+            return
+        if isinstance(values, DictColumn):
+            remap = [self._encode(value) for value in values.values]
+            if remap == list(range(len(remap))) and values.codes.typecode == self.codes.typecode:
+                self.codes.extend(values.codes)
+            else:
+                self.codes.extend(array(self.codes.typecode, map(remap.__getitem__, values.codes)))
+            return
+        self.codes.extend([self._encode(value) for value in values])
+
+    def _encode(self, value: Any) -> int:
+        code = self.lookup.get(value)
+        if code is None:
+            code = self.lookup[value] = len(self.values)
+            self.values.append(value)
+            if code >= _code_capacity(self.codes.typecode):
+                self.codes = array(_code_typecode(code + 1), self.codes)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return DictColumn(self.codes[index], self.values, self.lookup)
+        return self.values[self.codes[index]]
+
+    def __setitem__(self, index: Union[int, slice], value: Any):
+        if isinstance(index, slice):
+            self.codes[index] = array(self.codes.typecode, [self._encode(item) for item in value])
+            return
+        code = self._encode(value)
+        self.codes[index] = code
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.values.__getitem__, self.codes)
+
+    def __contains__(self, value: Any) -> bool:
+        code = self.lookup.get(value)
+        return code is not None and code in self.codes
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (DictColumn, list, tuple)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        return (DictColumn, (self.codes, self.values))
+
+    def __repr__(self) -> str:
+        return f"DictColumn(rows={len(self.codes)}, values={len(self.values)})"
+
+
+def _code_typecode(size: int) -> str:
+    for typecode, capacity in _CODE_TYPECODES:
+        if size <= capacity:
+            return typecode
+    return 'q'
+
+
+def _code_capacity(typecode: str) -> int:
+    return dict(_CODE_TYPECODES).get(typecode, 1 << 63)
+
+
+class NullableColumn:
+    __slots__ = ('values', 'validity')
+
+    def __init__(self, values: array, validity: Optional[bytearray] = None):
+        self.values = values
+        self.validity = validity if validity is not None else _full_validity(len(values))
+
+    @classmethod
+    def from_values(cls, values: List[Any], kind: type) -> 'NullableColumn':
+        filler = kind()
+        flags = bytes([value is not None for value in values])
+        return cls(array(_TYPECODES[kind], [filler if value is None else value for value in values]),
+                   pack_flags(flags))
+
+    @property
+    def kind(self) -> type:
+        return column_kind(self.values)
+
+    @property
+    def null_count(self) -> int:
+        return len(self.values) - count_bits(self.validity)
+
+    def accepts(self, value: Any) -> bool:
+        return value is None or type(value) is self.kind
+
+    def flags(self) -> bytes:
+        return unpack_flags(self.validity, len(self.values))
+
+    def is_valid(self, index: int) -> bool:
+        return bool(self.validity[index >> 3] >> (index & 7) & 1)
+
+    def null_positions(self) -> List[int]:
+        flags = self.flags()
+        positions = []
+        position = flags.find(0)
+        while position >= 0:
+            positions.append(position)
+            position = flags.find(0, position + 1)
+        return positions
+
+    def to_list(self) -> List[Any]:
+        values = column_to_list(self.values)
+        return [value if flag else None for value, flag in zip(values, self.flags())]
+
+    def take(self, indices: Iterable[int]) -> 'NullableColumn':
+        indices = indices if isinstance(indices, (list, range)) else list(indices)
+        flags = self.flags()
+        return NullableColumn(array(self.values.typecode, map(self.values.__getitem__, indices)),
+                              pack_flags(bytes(map(flags.__getitem__, indices))))
+
+    def append(self, value: Any):
+        length = len(self.values)
+        self.values.append(self.kind() if value is None else value)
+        if length % 8 == 0:
+            self.validity.append(0)
+        if value is not None:
+            self.validity[length >> 3] |= 1 << (length & 7)
+
+    def extend(self, values: Iterable[Any]):
+        if isinstance(values, (array, NullableColumn)) and \
+                _buffer(values).typecode == self.values.typecode:
+            flags = values.flags() if isinstance(values, NullableColumn) else b"\x01" * len(values)
+            flags = self.flags() + flags
+            self.values.extend(_buffer(values))
+            self.validity = pack_flags(flags)
+            return
+        for value in values:
+            self.append(value)
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += len(self.values)
+        if index < 0 or index >= len(self.values):
+            raise IndexError("Индекс строки вне диапазона")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return self.take(range(*index.indices(len(self.values))))
+        index = self._position(index)
+        if not self.is_valid(index):
+            return None
+        value = self.values[index]
+        return value != 0 if self.values.typecode == 'b' else value
+
+    def __setitem__(self, index: int, value: Any):
+        index = self._position(index)
+        if value is None:
+            self.values[index] = self.kind()
+            self.validity[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+        else:
+            self.values[index] = value
+            self.validity[index >> 3] |= 1 << (index & 7)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.to_list())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (NullableColumn, list, tuple)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        return (NullableColumn, (self.values, self.validity))
+
+    def __repr__(self) -> str:
+        return f"NullableColumn(rows={len(self.values)}, nulls={self.null_count})"
+
+
+def _full_validity(length: int) -> bytearray:
+    validity = bytearray(b"\xff" * (length // 8))
+    if length % 8:
+        validity.append((1 << length % 8) - 1)
+    return validity
+
+
+def _buffer(column: Column) -> Optional[array]:
+    if isinstance(column, NullableColumn):
+        return column.values
+    return column if isinstance(column, array) else None
+
+
+def column_kind(column: Column) -> Optional[type]:
+    if isinstance(column, NullableColumn):
+        column = column.values
+    if isinstance(column, array):
+        if column.typecode == 'b':
+            return bool
+        return int if column.typecode == 'q' else float
+    return None
+
+
+def column_to_list(column: Column) -> List[Any]:
+    if isinstance(column, NullableColumn):
+        return column.to_list()
+    if isinstance(column, array):
+        if column.typecode == 'b':
+            return [value != 0 for value in column]
+        return column.tolist()
+    return list(column)
+
+
+class RowView:
+    __slots__ = ('_rows', '_index')
+
+    def __init__(self, rows: 'ColumnarRows', index: int):
+        self._rows = rows
+        self._index = index
+
+    def __len__(self) -> int:
+        return len(self._rows.columns)
+
+    def __getitem__(self, col: Union[int, slice]) -> Any:
+        if isinstance(col, slice):
+            return [self[i] for i in range(*col.indices(len(self)))]
+        return self._rows.get_cell(self._index, col)
+
+    def __setitem__(self, col: int, value: Any):
+        self._rows.set_cell(self._index, col, value)
+
+    def __iter__(self) -> Iterator[Any]:
+        for col in range(len(self)):
+            yield self._rows.get_cell(self._index, col)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (RowView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo) -> List[Any]:
+        return list(self)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class ColumnarRows:
+    def __init__(self, columns: Optional[List[Column]] = None, length: int = 0):
+        self.columns: List[Column] = columns if columns is not None else []
+        self._length = length
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[List[Any]], num_columns: int,
+                  dictionary: Optional[int] = DICTIONARY_MAX_VALUES) -> 'ColumnarRows':
+        rows = rows if isinstance(rows, list) else list(rows)
+        columns = [
+            make_column([row[i] if i < len(row) else None for row in rows], dictionary)
+            for i in range(num_columns)
+        ]
+        return cls(columns, len(rows))
+
+    @classmethod
+    def from_columns(cls, columns: List[Iterable[Any]]) -> 'ColumnarRows':
+        built = [make_column(values) for values in columns]
+        length = len(built[0]) if built else 0
+        if any(len(column) != length for column in built):
+            raise ValueError("Столбцы имеют разную длину")
+        return cls(built, length)
+
+    def column(self, col: int) -> Column:
+        return self.columns[col]
+
+    def column_values(self, col: int) -> List[Any]:
+        return column_to_list(self.columns[col])
+
+    def set_column(self, col: int, values: Iterable[Any]):
+        column = make_column(values)
+        if len(column) != self._length:
+            raise ValueError(
+                f"Длина столбца ({len(column)}) не соответствует количеству строк ({self._length})"
+            )
+        self.columns[col] = column
+
+    def add_column(self, values: Iterable[Any]):
+        column = make_column(values)
+        if len(column) != self._length:
+            raise ValueError(
+                f"Длина столбца ({len(column)}) не соответствует количеству строк ({self._length})"
+            )
+        if not isinstance(self.columns, list):
+            self.columns = list(self.columns)
+        self.columns.append(column)
+
+    def get_cell(self, row: int, col: int) -> Any:
+        column = self.columns[col]
+        value = column[row]
+        if isinstance(column, array) and column.typecode == 'b':
+            return value != 0
+        return value
+
+    def set_cell(self, row: int, col: int, value: Any):
+        self._writable(col, value)[row] = value
+
+    def append(self, row: Iterable[Any]):
+        row = list(row)
+        for col in range(len(self.columns)):
+            value = row[col] if col < len(row) else None
+            self._writable(col, value).append(value)
+        self._length += 1
+
+    def _writable(self, col: int, value: Any) -> Column:
+        column = self.columns[col]
+        if isinstance(column, array):
+            if type(value) is column_kind(column):
+                return column
+            column = self.columns[col] = NullableColumn(column) if value is None \
+                else column_to_list(column)
+        elif isinstance(column, NullableColumn) and not column.accepts(value):
+            column = self.columns[col] = column_to_list(column)
+        return column
+
+    def extend(self, rows: Iterable[Iterable[Any]]):
+        if isinstance(rows, ColumnarRows) and len(rows.columns) == len(self.columns):
+            for col, other in enumerate(rows.columns):
+                column = self.columns[col]
+                buffer, other_buffer = _buffer(column), _buffer(other)
+                if buffer is not None and other_buffer is not None \
+                        and buffer.typecode == other_buffer.typecode:
+                    if isinstance(column, array) and isinstance(other, array):
+                        column.extend(other)
+                        continue
+                    if isinstance(column, array):
+                        column = self.columns[col] = NullableColumn(column)
+                    column.extend(other)
+                    continue
+                if buffer is not None:
+                    column = self.columns[col] = column_to_list(column)
+                column.extend(column_to_list(other))
+            self._length += len(rows)
+            return
+        for row in rows:
+            self.append(row)
+
+    def take(self, indices: Union[range, List[int]]) -> 'ColumnarRows':
+        if isinstance(indices, range) and indices.step == 1:
+            return ColumnarRows([column[indices.start:indices.stop] for column in self.columns],
+                                len(indices))
+        columns = []
+        for column in self.columns:
+            if isinstance(column, (DictColumn, NullableColumn)):
+                columns.append(column.take(indices))
+                continue
+            taken = [column[i] for i in indices]
+            columns.append(array(column.typecode, taken) if isinstance(column, array) else taken)
+        return ColumnarRows(columns, len(indices))
+
+    def copy(self) -> 'ColumnarRows':
+        return ColumnarRows([column[:] for column in self.columns], self._length)
+
+    def to_rows(self) -> List[List[Any]]:
+        decoded = [column_to_list(column) for column in self.columns]
+        return [list(row) for row in zip(*decoded)] if decoded else [[] for _ in range(self._length)]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[RowView, List[RowView]]:
+        if isinstance(index, slice):
+            return [RowView(self, i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("Индекс строки вне диапазона")
+        return RowView(self, index)
+
+    def __iter__(self) -> Iterator[RowView]:
+        for i in range(self._length):
+            yield RowView(self, i)
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (ColumnarRows, list, tuple)) or hasattr(other, 'positions'):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def __repr__(self) -> str:
+        return f"ColumnarRows(rows={self._length}, columns={len(self.columns)})"
@@ -1,105 +1,420 @@
 import csv
-from typing import List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice, repeat
+from array import array
 import os
-from .utils import TableData, LoadError, SaveError
+import re
+from .columnar import ColumnarRows, Column, DICTIONARY_MAX_VALUES
+from .utils import (TableData, LoadError, SaveError, resolve_workers, atomic_open,
+                    save_parts, part_path, write_manifest)
+from .profiling import instrumented
 
+SAMPLE_ROWS = 100
+WRITE_BATCH = 8192
+WRITE_BUFFER = 1 << 20
+_INT_TEXT = re.compile(r'-?\d+')
+_FLOAT_TEXT = re.compile(r'-?(?:\d+\.?\d*|\.\d+)')
+
+@instrumented("load_csv", reads=True)
 def load_table(*file_paths, **kwargs) -> TableData:
     if not file_paths:
         raise LoadError("Не указаны файлы для загрузки")
     
-    all_data = []
-    columns = None
-    delimiter = kwargs.get('delimiter', ',')
+    dictionary = kwargs.get('dictionary', DICTIONARY_MAX_VALUES)
+    reader = _RowReader(file_paths, kwargs.get('delimiter', ','), kwargs.get('schema'),
+                        kwargs.get('sample_rows', SAMPLE_ROWS), dictionary=dictionary)
+    workers = resolve_workers(kwargs.get('workers', 1), len(file_paths), LoadError)
+    
+    if workers > 1:
+        data = _load_parallel(reader, workers)
+    else:
+        data = []
+        for batch in reader.batches():
+            data.extend(batch)
+    
+    columnar = kwargs.get('columnar', False)
+    if columnar and reader.columns:
+        data = ColumnarRows.from_rows(data, len(reader.columns), dictionary)
+    return TableData(data, reader.columns, columnar=columnar, column_types=reader.column_types)
+
+def iter_table(*file_paths, chunk_rows: int = 10000, **kwargs) -> Iterator[TableData]:
+    if not file_paths:
+        raise LoadError("Не указаны файлы для загрузки")
+    
+    if chunk_rows <= 0:
+        raise LoadError(f"Некорректный размер блока: {chunk_rows}")
     
-    for file_idx, file_path in enumerate(file_paths):
+    for file_path in file_paths:
         if not os.path.exists(file_path):
             raise LoadError(f"Файл не существует: {file_path}")
-        
+    
+    reader = _RowReader(file_paths, kwargs.get('delimiter', ','), kwargs.get('schema'),
+                        kwargs.get('sample_rows', SAMPLE_ROWS),
+                        dictionary=kwargs.get('dictionary', DICTIONARY_MAX_VALUES))
+    return _iter_chunks(reader, chunk_rows, kwargs.get('columnar', False))
+
+def _iter_chunks(reader: '_RowReader', chunk_rows: int, columnar: bool) -> Iterator[TableData]:
+    chunk = []
+    
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield _chunk_table(reader, chunk, columnar)
+            chunk = []
+    
+    if chunk:
+        yield _chunk_table(reader, chunk, columnar)
+
+def _chunk_table(reader: '_RowReader', chunk: List[List[Any]], columnar: bool) -> TableData:
+    data = chunk
+    if columnar and reader.columns:
+        data = ColumnarRows.from_rows(chunk, len(reader.columns), reader.dictionary)
+    return TableData(data, list(reader.columns), columnar=columnar,
+                     column_types=reader.column_types)
+
+def _load_parallel(reader: '_RowReader', workers: int) -> List[List[Any]]:
+    for file_path in reader.file_paths:
+        if not os.path.exists(file_path):
+            raise LoadError(f"Файл не существует: {file_path}")
+    
+    reader.prepare()
+    data = []
+    
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = executor.map(_load_part, reader.file_paths, repeat(reader.delimiter),
+                                 repeat(reader.columns), repeat(reader.column_types),
+                                 repeat(reader.dictionary))
+            
+            for file_path, (header, rows) in zip(reader.file_paths, parts):
+                if header is None:
+                    continue
+                if header != reader.columns:
+                    raise LoadError(
+                        f"Ошибка чтения файла {file_path}: "
+                        f"Несоответствие столбцов в файле {file_path}. "
+                        f"Ожидалось: {reader.columns}, получено: {header}"
+                    )
+                data.extend(rows)
+    except LoadError:
+        raise
+    except Exception as e:
+        raise LoadError(f"Ошибка параллельной загрузки: {str(e)}")
+    
+    return data
+
+def _load_part(file_path: str, delimiter: str, columns: Optional[List[str]],
+               column_types: Dict[int, type],
+               dictionary: Optional[int]) -> Tuple[Optional[List[str]], List[List[Any]]]:
+    reader = _RowReader((file_path,), delimiter, column_types, infer=False, expected=columns,
+                        dictionary=dictionary)
+    rows = []
+    for batch in reader.batches():
+        rows.extend(batch)
+    return reader.columns, rows
+
+class _RowReader:
+    BATCH_ROWS = 1024
+    
+    def __init__(self, file_paths, delimiter: str,
+                 schema: Optional[Dict[Union[int, str], type]] = None,
+                 sample_rows: int = SAMPLE_ROWS, infer: bool = True,
+                 expected: Optional[List[str]] = None,
+                 dictionary: Optional[int] = DICTIONARY_MAX_VALUES):
+        self.file_paths = file_paths
+        self.dictionary = dictionary
+        self.delimiter = delimiter
+        self.schema = schema
+        self.sample_rows = max(sample_rows, 1)
+        self.infer = infer
+        self.expected = expected
+        self.columns: Optional[List[str]] = None
+        self.column_types: Dict[int, type] = {}
+        self._converters: Optional[List[Callable[[Sequence[str]], List[Any]]]] = None
+    
+    def __iter__(self) -> Iterator[List[Any]]:
+        for batch in self.batches():
+            yield from batch
+    
+    def prepare(self):
+        file_path = self.file_paths[0]
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f, delimiter=delimiter)
-                file_data = list(reader)
-                
-                if not file_data:
-                    continue
-                
-                if file_idx == 0:
-                    columns = file_data[0] if file_data else []
-                    all_data.extend(file_data[1:] if len(file_data) > 1 else [])
-                else:
-                    if file_data[0] != columns:
+                reader = csv.reader(f, delimiter=self.delimiter)
+                header = next(reader, None)
+                if header is None:
+                    return
+                self.columns = header
+                self._converters = self._build_converters(list(islice(reader, self.sample_rows)))
+        except LoadError:
+            raise
+        except Exception as e:
+            raise LoadError(f"Ошибка чтения файла {file_path}: {str(e)}")
+    
+    def batches(self) -> Iterator[List[List[Any]]]:
+        expected = self.expected
+        
+        for file_idx, file_path in enumerate(self.file_paths):
+            if not os.path.exists(file_path):
+                raise LoadError(f"Файл не существует: {file_path}")
+            
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    reader = csv.reader(f, delimiter=self.delimiter)
+                    header = next(reader, None)
+                    
+                    if header is None:
+                        continue
+                    
+                    if file_idx == 0 and expected is None:
+                        expected = header
+                        self.columns = header
+                    elif header != expected:
                         raise LoadError(
                             f"Несоответствие столбцов в файле {file_path}. "
-                            f"Ожидалось: {columns}, получено: {file_data[0]}"
+                            f"Ожидалось: {expected}, получено: {header}"
                         )
-                    all_data.extend(file_data[1:] if len(file_data) > 1 else [])
+                    else:
+                        self.columns = header
                     
-        except Exception as e:
-            raise LoadError(f"Ошибка чтения файла {file_path}: {str(e)}")
+                    if self._converters is None:
+                        sample = list(islice(reader, self.sample_rows))
+                        self._converters = self._build_converters(sample)
+                        yield self._convert_batch(sample)
+                        if not sample and not self.schema:
+                            self._converters = None
+                    
+                    while True:
+                        batch = list(islice(reader, self.BATCH_ROWS))
+                        if not batch:
+                            break
+                        yield self._convert_batch(batch)
+                        
+            except Exception as e:
+                raise LoadError(f"Ошибка чтения файла {file_path}: {str(e)}")
     
-    if columns is None:
-        columns = []
-    
-    converted_data = []
-    for row in all_data:
-        converted_row = []
-        for i, val in enumerate(row):
-            if val == '':
-                converted_row.append(None)
-            else:
-                try:
-                    if val.isdigit() or (val[0] == '-' and val[1:].isdigit()):
-                        converted_row.append(int(val))
-                    elif val.replace('.', '', 1).isdigit() or \
-                         (val[0] == '-' and val[1:].replace('.', '', 1).isdigit()):
-                        converted_row.append(float(val))
-                    elif val.lower() in ('true', 'false'):
-                        converted_row.append(val.lower() == 'true')
-                    else:
-                        converted_row.append(val)
-                except:
-                    converted_row.append(val)
+    def _build_converters(self, sample: List[List[str]]) -> List[Callable[[Sequence[str]], List[Any]]]:
+        types: Dict[int, type] = {}
         
-        converted_data.append(converted_row)
+        if self.schema:
+            for key, col_type in self.schema.items():
+                if col_type not in _COLUMN_CONVERTERS:
+                    raise LoadError(f"Неподдерживаемый тип: {col_type}")
+                if isinstance(key, int) and 0 <= key < len(self.columns):
+                    types[key] = col_type
+                elif isinstance(key, str) and key in self.columns:
+                    types[self.columns.index(key)] = col_type
+                else:
+                    raise LoadError(f"Столбец не найден: {key}")
+        
+        for col_idx in range(len(self.columns) if self.infer else 0):
+            if col_idx not in types:
+                inferred = _infer_type(row[col_idx] for row in sample if col_idx < len(row))
+                if inferred is not None:
+                    types[col_idx] = inferred
+        
+        self.column_types = types
+        return [_StringPool(self.dictionary) if types.get(col_idx) is str and self.dictionary
+                else _COLUMN_CONVERTERS.get(types.get(col_idx), _convert_generic)
+                for col_idx in range(len(self.columns))]
     
-    return TableData(converted_data, columns)
+    def _convert_batch(self, batch: List[List[str]]) -> List[List[Any]]:
+        width = len(self._converters)
+        if batch and set(map(len, batch)) != {width}:
+            return [self._convert_row(row) for row in batch]
+        
+        converted = [convert(column) for convert, column in zip(self._converters, zip(*batch))]
+        return [list(row) for row in zip(*converted)] if width else [[] for _ in batch]
+    
+    def _convert_row(self, row: List[str]) -> List[Any]:
+        converted_row = [convert((val,))[0] for convert, val in zip(self._converters, row)]
+        if len(row) > len(converted_row):
+            converted_row.extend(_convert_value(val) for val in row[len(converted_row):])
+        return converted_row
 
-def save_table(table: TableData, file_path: str, max_rows: Optional[int] = None, **kwargs):
-    if not table.data and not table.columns:
-        raise SaveError("Пустая таблица")
+def _infer_type(values: Iterable[str]) -> Optional[type]:
+    found = set()
+    for val in values:
+        value = _convert_value(val)
+        if value is not None:
+            found.add(type(value))
+    
+    if found == {int, float}:
+        return float
+    return found.pop() if len(found) == 1 else None
+
+def _convert_value(val: str) -> Any:
+    if val == '':
+        return None
+    try:
+        if val.isdigit() or (val[0] == '-' and val[1:].isdigit()):
+            return int(val)
+        elif val.replace('.', '', 1).isdigit() or \
+             (val[0] == '-' and val[1:].replace('.', '', 1).isdigit()):
+            return float(val)
+        elif val.lower() in ('true', 'false'):
+            return val.lower() == 'true'
+        else:
+            return val
+    except:
+        return val
+
+def _convert_generic(column: Sequence[str]) -> List[Any]:
+    return [_convert_value(val) for val in column]
+
+def _convert_int(column: Sequence[str]) -> List[Any]:
+    return _convert_matching(column, int, _INT_TEXT.fullmatch)
+
+def _convert_float(column: Sequence[str]) -> List[Any]:
+    return _convert_matching(column, float, _FLOAT_TEXT.fullmatch)
+
+_BOOL_VALUES = {'True': True, 'true': True, 'False': False, 'false': False, '': None}
+
+def _convert_bool(column: Sequence[str]) -> List[Any]:
+    try:
+        return [_BOOL_VALUES[val] for val in column]
+    except KeyError:
+        return [_BOOL_VALUES[val] if val in _BOOL_VALUES else _convert_value(val) for val in column]
+
+def _convert_str(column: Sequence[str]) -> List[Any]:
+    return [val if val else None for val in column]
+
+class _StringPool:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.pool: Optional[Dict[str, str]] = {}
     
+    def __call__(self, column: Sequence[str]) -> List[Any]:
+        pool = self.pool
+        if pool is None:
+            return _convert_str(column)
+        values = [pool.setdefault(val, val) if val else None for val in column]
+        if len(pool) > self.limit:
+            self.pool = None
+        return values
+
+def _convert_matching(column: Sequence[str], parse: Callable[[str], Any],
+                      match: Callable[[str], Any]) -> List[Any]:
+    return [parse(val) if match(val) else _convert_value(val) for val in column]
+
+_COLUMN_CONVERTERS: Dict[type, Callable[[Sequence[str]], List[Any]]] = {
+    int: _convert_int,
+    float: _convert_float,
+    bool: _convert_bool,
+    str: _convert_str,
+}
+
+@instrumented("save_csv", writes=True)
+def save_table(table: Union[TableData, Iterable[Any]], file_path: str,
+               max_rows: Optional[int] = None, **kwargs):
     delimiter = kwargs.get('delimiter', ',')
     
+    if not isinstance(table, TableData):
+        _save_stream(table, file_path, max_rows, delimiter, kwargs.get('columns'))
+        return
+    
+    if not table.data and not table.columns:
+        raise SaveError("Пустая таблица")
+    
     if max_rows is None or len(table.data) <= max_rows:
-        _save_csv(table, file_path, delimiter)
+        _save_csv(table, file_path, 0, len(table.data), delimiter)
     else:
-        base_name, ext = os.path.splitext(file_path)
-        
-        total_rows = len(table.data)
-        num_files = (total_rows + max_rows - 1) // max_rows
-        
-        for i in range(num_files):
-            start_idx = i * max_rows
-            end_idx = min((i + 1) * max_rows, total_rows)
-            
-            partial_table = TableData(
-                data=table.data[start_idx:end_idx],
-                columns=table.columns
-            )
-            partial_table.column_types = table.column_types.copy()
-            
-            partial_path = f"{base_name}_part{i+1}{ext}"
-            _save_csv(partial_table, partial_path, delimiter)
+        save_parts(table, file_path, max_rows, partial(_save_csv, delimiter=delimiter),
+                   kwargs.get('workers', 1))
 
-def _save_csv(table: TableData, file_path: str, delimiter: str):
+def _save_csv(table: TableData, file_path: str, start: int, stop: int, delimiter: str = ','):
     try:
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        with atomic_open(file_path, 'w', newline='', encoding='utf-8',
+                         buffering=WRITE_BUFFER) as f:
             writer = csv.writer(f, delimiter=delimiter)
             
             writer.writerow(table.columns)
             
-            for row in table.data:
-                writer.writerow(row)
+            for batch in _format_batches(table.data, start, stop):
+                writer.writerows(batch)
                 
     except Exception as e:
-        raise SaveError(f"Ошибка сохранения в {file_path}: {str(e)}")
\ No newline at end of file
+        raise SaveError(f"Ошибка сохранения в {file_path}: {str(e)}")
+
+def _save_stream(chunks: Iterable[Any], file_path: str, max_rows: Optional[int],
+                 delimiter: str, columns: Optional[List[str]]):
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None and columns is None:
+        raise SaveError("Пустая таблица")
+    
+    if columns is None:
+        columns = first.columns if isinstance(first, TableData) else None
+    if columns is None:
+        raise SaveError("Не указаны столбцы для сохранения потока строк")
+    
+    rows = chain.from_iterable(_iter_chunk_batches(chain([first] if first is not None else [], chunks),
+                                                   columns))
+    
+    if max_rows is None:
+        _write_rows(file_path, columns, rows, None, delimiter)
+        return
+    
+    if max_rows <= 0:
+        raise SaveError(f"Некорректное количество строк в файле: {max_rows}")
+    
+    part_paths = []
+    part_rows = []
+    for row in rows:
+        path = part_path(file_path, len(part_paths) + 1)
+        part_rows.append(_write_rows(path, columns, chain([row], rows), max_rows, delimiter))
+        part_paths.append(path)
+    write_manifest(file_path, columns, part_paths, part_rows)
+
+def _iter_chunk_batches(chunks: Iterable[Any], columns: List[str]) -> Iterator[Iterable[Sequence[Any]]]:
+    for chunk in chunks:
+        if isinstance(chunk, TableData):
+            if chunk.columns != columns:
+                raise SaveError(
+                    f"Несоответствие столбцов в потоке. "
+                    f"Ожидалось: {columns}, получено: {chunk.columns}"
+                )
+            yield from _format_batches(chunk.data, 0, len(chunk.data))
+        else:
+            yield chunk
+
+def _write_rows(file_path: str, columns: List[str], rows: Iterator[Sequence[Any]],
+                limit: Optional[int], delimiter: str) -> int:
+    written = 0
+    try:
+        with atomic_open(file_path, 'w', newline='', encoding='utf-8',
+                         buffering=WRITE_BUFFER) as f:
+            writer = csv.writer(f, delimiter=delimiter)
+            writer.writerow(columns)
+            
+            while limit is None or written < limit:
+                size = WRITE_BATCH if limit is None else min(WRITE_BATCH, limit - written)
+                batch = list(islice(rows, size))
+                if not batch:
+                    break
+                writer.writerows(batch)
+                written += len(batch)
+    except SaveError:
+        raise
+    except Exception as e:
+        raise SaveError(f"Ошибка сохранения в {file_path}: {str(e)}")
+    return written
+
+def _format_batches(data: Any, start: int, stop: int) -> Iterator[Iterable[Sequence[Any]]]:
+    for offset in range(start, stop, WRITE_BATCH):
+        end = min(offset + WRITE_BATCH, stop)
+        if isinstance(data, ColumnarRows):
+            columns = [_format_column(data.column(col)[offset:end])
+                       for col in range(len(data.columns))]
+            yield zip(*columns) if columns else [()] * (end - offset)
+        else:
+            yield data[offset:end]
+
+def _format_column(column: Column) -> Iterable[Any]:
+    if isinstance(column, array) and column.typecode == 'b':
+        return map(_BOOL_TEXT.__getitem__, column)
+    return column
+
+_BOOL_TEXT = ('False', 'True')
@@ -0,0 +1,389 @@
+import glob
+import json
+import os
+import re
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from .base_operations import TableProcessor, _flatten_keys
+from .binary_processor import MAGIC as BINARY_MAGIC, load_table as load_binary, save_table as save_binary
+from .columnar import ColumnarRows
+from .csv_processor import load_table as load_csv, iter_table as iter_csv, save_table as save_csv
+from .groupby import GroupBy
+from .pickle_processor import MAGIC as PICKLE_MAGIC, load_table as load_pickle, save_table as save_pickle
+from .profiling import instrumented
+from .utils import (TableData, TableError, LoadError, SaveError, OperationError,
+                    manifest_path, part_path, write_manifest)
+from .views import RowSelection
+
+DATASET_BUDGET = 256 * 1024 * 1024
+_COUNT_BUFFER = 1 << 20
+_MANIFEST_SUFFIX = ".manifest.json"
+
+
+class PartFormat:
+    def __init__(self, name: str, extensions: Sequence[str],
+                 load: Callable[[str, Optional[List[str]]], TableData],
+                 save: Callable[[TableData, str], None], magic: Optional[bytes] = None,
+                 iterate: Optional[Callable[[str, int], Iterator[TableData]]] = None,
+                 expansion: float = 1.0):
+        self.name = name
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.load = load
+        self.save = save
+        self.magic = magic
+        self.iterate = iterate
+        self.expansion = expansion
+
+    def __repr__(self) -> str:
+        return f"PartFormat({self.name!r}, extensions={self.extensions})"
+
+
+FORMATS: Dict[str, PartFormat] = {}
+
+
+def register_format(name: str, extensions: Sequence[str],
+                    load: Callable[[str, Optional[List[str]]], TableData],
+                    save: Callable[[TableData, str], None], magic: Optional[bytes] = None,
+                    iterate: Optional[Callable[[str, int], Iterator[TableData]]] = None,
+                    expansion: float = 1.0) -> PartFormat:
+    if expansion <= 0:
+        raise TableError(f"Некорректный коэффициент расширения формата {name}: {expansion}")
+    part_format = FORMATS[name] = PartFormat(name, extensions, load, save, magic, iterate, expansion)
+    return part_format
+
+
+def _load_csv_part(file_path: str, columns: Optional[List[str]]) -> TableData:
+    return load_csv(file_path, columnar=True)
+
+
+def _iter_csv_part(file_path: str, chunk_rows: int) -> Iterator[TableData]:
+    return iter_csv(file_path, chunk_rows=chunk_rows, columnar=True)
+
+
+def _load_pickle_part(file_path: str, columns: Optional[List[str]]) -> TableData:
+    return load_pickle(file_path)
+
+
+def _load_binary_part(file_path: str, columns: Optional[List[str]]) -> TableData:
+    return load_binary(file_path, columns=columns)
+
+
+register_format('csv', ['.csv'], _load_csv_part, save_csv, iterate=_iter_csv_part, expansion=6.0)
+register_format('pickle', ['.pkl', '.pickle'], _load_pickle_part, save_pickle, magic=PICKLE_MAGIC,
+                expansion=4.0)
+register_format('binary', ['.bin'], _load_binary_part, save_binary, magic=BINARY_MAGIC)
+
+
+def open_dataset(source: Union[str, Sequence[str]], format: Optional[str] = None,
+                 memory_budget: int = DATASET_BUDGET) -> 'Dataset':
+    part_paths, part_rows, columns = _resolve_parts(source)
+    formats = [_detect_format(path, format) for path in part_paths]
+    return Dataset(part_paths, formats, columns, part_rows, memory_budget)
+
+
+class Dataset:
+    def __init__(self, part_paths: List[str], formats: List[PartFormat],
+                 columns: Optional[List[str]] = None, part_rows: Optional[List[Optional[int]]] = None,
+                 memory_budget: int = DATASET_BUDGET):
+        if not isinstance(memory_budget, int) or memory_budget <= 0:
+            raise TableError(f"Некорректный бюджет памяти: {memory_budget}")
+        self.part_paths = list(part_paths)
+        self.formats = list(formats)
+        self.columns = columns
+        self.part_rows = list(part_rows) if part_rows is not None else [None] * len(self.part_paths)
+        self.memory_budget = memory_budget
+        self._steps: List[Tuple] = []
+
+    def select(self, *columns: Union[str, List[str]]) -> 'Dataset':
+        names = _flatten_keys(columns)
+        if not names:
+            raise TableError("Не указаны столбцы для выборки")
+        return self._with_step(('select', names))
+
+    def filter(self, expression: str) -> 'Dataset':
+        return self._with_step(('filter', expression))
+
+    def eval(self, expression: str, result_col: Union[int, str]) -> 'Dataset':
+        return self._with_step(('eval', expression, result_col))
+
+    def add(self, col1: Union[int, str], col2: Union[int, str, Any],
+            result_col: Optional[Union[int, str]] = None) -> 'Dataset':
+        return self._arithmetic(col1, col2, result_col, 'add')
+
+    def sub(self, col1: Union[int, str], col2: Union[int, str, Any],
+            result_col: Optional[Union[int, str]] = None) -> 'Dataset':
+        return self._arithmetic(col1, col2, result_col, 'sub')
+
+    def mul(self, col1: Union[int, str], col2: Union[int, str, Any],
+            result_col: Optional[Union[int, str]] = None) -> 'Dataset':
+        return self._arithmetic(col1, col2, result_col, 'mul')
+
+    def div(self, col1: Union[int, str], col2: Union[int, str, Any],
+            result_col: Optional[Union[int, str]] = None) -> 'Dataset':
+        return self._arithmetic(col1, col2, result_col, 'div')
+
+    def get_rows_by_number(self, start: int, stop: Optional[int] = None) -> 'Dataset':
+        if start < 0:
+            raise TableError(f"Некорректный начальный индекс: {start}")
+        if stop is not None and start >= stop:
+            raise TableError(f"Начальный индекс должен быть меньше конечного")
+        return self._with_step(('rows', start, start + 1 if stop is None else stop))
+
+    def group_by(self, *keys: Union[int, str, List[Union[int, str]]]) -> GroupBy:
+        return GroupBy(self, _flatten_keys(keys), TableProcessor)
+
+    def explain(self) -> str:
+        lines = [f"parts {len(self.part_paths)} "
+                 f"[{', '.join(sorted({part_format.name for part_format in self.formats}))}], "
+                 f"budget {self.memory_budget}"]
+        projection = self._projection()
+        if projection is not None:
+            lines.append(f"load columns {projection}")
+        for step in self._steps:
+            if step[0] == 'select':
+                lines.append(f"select {step[1]}")
+            elif step[0] == 'filter':
+                lines.append(f"filter {step[1]}")
+            elif step[0] == 'eval':
+                lines.append(f"eval {step[1]} -> {step[2]}")
+            elif step[0] == 'rows':
+                lines.append(f"rows [{step[1]}:{step[2]}]")
+            else:
+                lines.append(f"{step[1]}({step[2]}, {step[3]!r}) -> {step[4]}")
+        return "\n".join(lines)
+
+    def __iter__(self) -> Iterator[TableProcessor]:
+        seen = [0] * len(self._steps)
+        for table in self._load_chunks():
+            processor = TableProcessor(table)
+            for position, step in enumerate(self._steps):
+                kind = step[0]
+                if kind == 'select':
+                    processor = TableProcessor(_project(processor.table, step[1]))
+                elif kind == 'filter':
+                    processor = processor.filter_rows(processor.where(step[1], as_mask=True),
+                                                      copy_table=True)
+                elif kind == 'eval':
+                    processor.eval(step[1], step[2])
+                elif kind == 'rows':
+                    length = len(processor.table.data)
+                    start = max(step[1] - seen[position], 0)
+                    stop = min(step[2] - seen[position], length)
+                    seen[position] += length
+                    processor = processor.filter_rows(range(start, max(start, stop)), copy_table=True)
+                else:
+                    getattr(processor, step[1])(step[2], step[3], step[4])
+            yield TableProcessor(_materialize(processor.table))
+            if self._exhausted(seen):
+                return
+
+    def count(self) -> int:
+        return sum(len(processor.table.data) for processor in self)
+
+    @instrumented("dataset.collect", method=True)
+    def collect(self) -> TableProcessor:
+        return TableProcessor(_concat([processor.table for processor in self], self.columns))
+
+    @instrumented("dataset.save", writes=True, method=True)
+    def save(self, file_path: str, format: Optional[str] = None,
+             max_rows: Optional[int] = None) -> 'Dataset':
+        if max_rows is not None and max_rows <= 0:
+            raise SaveError(f"Некорректное количество строк в файле: {max_rows}")
+        part_format = _detect_format(file_path, format, sniff=False)
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+
+        part_paths: List[str] = []
+        part_rows: List[int] = []
+        columns = None
+        pending: List[TableData] = []
+
+        def flush(table: TableData):
+            path = part_path(file_path, len(part_paths) + 1)
+            part_format.save(table, path)
+            part_paths.append(path)
+            part_rows.append(len(table.data))
+
+        for processor in self:
+            table = processor.table
+            if columns is None:
+                columns = table.columns
+            elif table.columns != columns:
+                raise SaveError(f"Несоответствие столбцов в блоке. "
+                                f"Ожидалось: {columns}, получено: {table.columns}")
+            if not table.data:
+                continue
+            if max_rows is None:
+                flush(table)
+                continue
+            pending.append(table)
+            buffered = sum(len(part.data) for part in pending)
+            if buffered >= max_rows:
+                merged = _concat(pending, columns)
+                start = 0
+                while buffered - start >= max_rows:
+                    flush(_slice(merged, start, start + max_rows))
+                    start += max_rows
+                pending = [_slice(merged, start, buffered)] if start < buffered else []
+        if pending:
+            flush(_concat(pending, columns))
+
+        columns = columns if columns is not None else self.columns or []
+        write_manifest(file_path, columns, part_paths, part_rows)
+        return Dataset(part_paths, [part_format] * len(part_paths), list(columns), part_rows,
+                       self.memory_budget)
+
+    def _arithmetic(self, col1, col2, result_col, op_name: str) -> 'Dataset':
+        return self._with_step(('arith', op_name, col1, col2, result_col))
+
+    def _with_step(self, step: Tuple) -> 'Dataset':
+        dataset = Dataset(self.part_paths, self.formats, self.columns, self.part_rows, self.memory_budget)
+        dataset._steps = self._steps + [step]
+        return dataset
+
+    def _projection(self) -> Optional[List[str]]:
+        if not self._steps or self._steps[0][0] != 'select':
+            return None
+        names = self._steps[0][1]
+        return names if all(isinstance(name, str) for name in names) else None
+
+    def _exhausted(self, seen: List[int]) -> bool:
+        return any(step[0] == 'rows' and count >= step[2] for step, count in zip(self._steps, seen))
+
+    def _load_chunks(self) -> Iterator[TableData]:
+        projection = self._projection()
+        for file_path, part_format, rows in zip(self.part_paths, self.formats, self.part_rows):
+            if not os.path.exists(file_path):
+                raise LoadError(f"Файл не существует: {file_path}")
+            estimate = int(os.path.getsize(file_path) * part_format.expansion)
+            if estimate <= self.memory_budget:
+                yield part_format.load(file_path, projection)
+                continue
+            if part_format.iterate is None:
+                raise OperationError(
+                    f"Часть {file_path} не помещается в бюджет памяти "
+                    f"({estimate} > {self.memory_budget}). Разбейте её на части меньшего размера"
+                )
+            rows = rows if rows is not None else _count_lines(file_path)
+            chunk_rows = max(1, rows * self.memory_budget // estimate)
+            yield from part_format.iterate(file_path, chunk_rows)
+
+    def __repr__(self) -> str:
+        return f"Dataset(parts={len(self.part_paths)}, steps={len(self._steps)}, budget={self.memory_budget})"
+
+
+def _resolve_parts(source: Union[str, Sequence[str]]
+                   ) -> Tuple[List[str], List[Optional[int]], Optional[List[str]]]:
+    if not isinstance(source, str):
+        part_paths = list(source)
+        if not part_paths:
+            raise LoadError("Не указаны файлы для загрузки")
+        return part_paths, [None] * len(part_paths), None
+
+    if source.endswith(_MANIFEST_SUFFIX) and os.path.isfile(source):
+        return _read_manifest(source)
+    if os.path.isfile(manifest_path(source)):
+        return _read_manifest(manifest_path(source))
+    if os.path.isfile(source):
+        return [source], [None], None
+
+    if os.path.isdir(source):
+        candidates = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        candidates = glob.glob(source)
+    part_paths = sorted((path for path in candidates if os.path.isfile(path)
+                         and not path.endswith(_MANIFEST_SUFFIX)
+                         and not os.path.basename(path).startswith('.')), key=_natural_key)
+    if not part_paths:
+        raise LoadError(f"Файлы не найдены: {source}")
+    return part_paths, [None] * len(part_paths), None
+
+
+def _read_manifest(file_path: str) -> Tuple[List[str], List[Optional[int]], Optional[List[str]]]:
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        directory = os.path.dirname(file_path)
+        parts = manifest['parts']
+        return ([os.path.join(directory, part['path']) for part in parts],
+                [part.get('rows') for part in parts], manifest.get('columns'))
+    except Exception as e:
+        raise LoadError(f"Ошибка чтения манифеста {file_path}: {str(e)}")
+
+
+def _natural_key(path: str) -> List[Union[int, str]]:
+    return [int(token) if token.isdigit() else token for token in re.split(r"(\d+)", path)]
+
+
+def _detect_format(file_path: str, name: Optional[str] = None, sniff: bool = True) -> PartFormat:
+    if name is not None:
+        if name not in FORMATS:
+            raise TableError(f"Неизвестный формат: {name}")
+        return FORMATS[name]
+
+    if sniff and os.path.isfile(file_path):
+        with open(file_path, 'rb') as f:
+            head = f.read(max((len(part_format.magic) for part_format in FORMATS.values()
+                               if part_format.magic), default=0))
+        for part_format in FORMATS.values():
+            if part_format.magic and head.startswith(part_format.magic):
+                return part_format
+
+    ext = os.path.splitext(file_path)[1].lower()
+    for part_format in FORMATS.values():
+        if ext in part_format.extensions:
+            return part_format
+    raise LoadError(f"Не удалось определить формат файла: {file_path}")
+
+
+def _count_lines(file_path: str) -> int:
+    with open(file_path, 'rb') as f:
+        lines = sum(block.count(b"\n") for block in iter(partial(f.read, _COUNT_BUFFER), b""))
+    return max(lines - 1, 1)
+
+
+def _project(table: TableData, names: List[Union[int, str]]) -> TableData:
+    processor = TableProcessor(table)
+    indices = [processor._get_column_index(name) for name in names]
+    columns = [table.columns[i] for i in indices]
+    column_types = {new_idx: table.column_types[old_idx]
+                    for new_idx, old_idx in enumerate(indices) if old_idx in table.column_types}
+    if table.is_columnar:
+        data = ColumnarRows([table.data.column(i) for i in indices], len(table.data))
+    else:
+        data = [[row[i] if i < len(row) else None for i in indices] for row in table.data]
+    return TableData(data, columns, column_types=column_types)
+
+
+def _materialize(table: TableData) -> TableData:
+    if not isinstance(table.data, RowSelection):
+        return table
+    result = TableData(list(table.data), table.columns)
+    result.column_types = table.column_types.copy()
+    return result
+
+
+def _slice(table: TableData, start: int, stop: int) -> TableData:
+    if table.is_columnar:
+        data = table.data.take(range(start, stop))
+    else:
+        data = table.data[start:stop]
+    result = TableData(data, table.columns)
+    result.column_types = table.column_types.copy()
+    return result
+
+
+def _concat(tables: List[TableData], columns: Optional[List[str]]) -> TableData:
+    if not tables:
+        return TableData([], list(columns or []))
+    first = tables[0]
+    if all(table.is_columnar for table in tables):
+        data = first.data.copy()
+        for table in tables[1:]:
+            data.extend(table.data)
+    else:
+        data = []
+        for table in tables:
+            data.extend(table.data.to_rows() if table.is_columnar else table.data)
+    result = TableData(data, list(first.columns))
+    result.column_types = first.column_types.copy()
+    return result
@@ -0,0 +1,319 @@
+import ast
+import re
+from functools import lru_cache
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .mask import Mask
+from .nulls import column_validity
+from .utils import ColumnError, OperationError
+from . import vectorized
+
+KERNEL_CACHE_SIZE = 256
+
+_BACKTICK = re.compile(r"`([^`]*)`")
+_QUOTED_PREFIX = "__column_"
+
+_ARITHMETIC = {
+    ast.Add: '+',
+    ast.Sub: '-',
+    ast.Mult: '*',
+    ast.Div: '/',
+    ast.FloorDiv: '//',
+    ast.Mod: '%',
+}
+
+_COMPARISON = {
+    ast.Eq: '==',
+    ast.NotEq: '!=',
+    ast.Gt: '>',
+    ast.Lt: '<',
+    ast.GtE: '>=',
+    ast.LtE: '<=',
+}
+
+_LOGICAL = {ast.BitAnd: 'and', ast.BitOr: 'or'}
+
+_NUMERIC = {int, float, bool}
+_LITERALS = (bool, int, float, str)
+_NONE = ('const', type(None), None)
+
+Node = Tuple[Any, ...]
+
+
+class Expression:
+    def __init__(self, source: str, tree: Node, columns: List[int], result_type: Optional[type]):
+        self.source = source
+        self.tree = tree
+        self.columns = columns
+        self.result_type = result_type
+
+    def evaluate(self, processor) -> Tuple[Any, Any]:
+        length = len(processor.table.data)
+        operands = [processor._numeric_operand(col_idx) if processor.table.column_types.get(col_idx)
+                    in _NUMERIC else processor._typed_values(col_idx) for col_idx in self.columns]
+        for col_idx, operand in zip(self.columns, operands):
+            if len(operand) != length:
+                raise ColumnError(f"Столбец {processor.table.columns[col_idx]} содержит неполные строки")
+
+        try:
+            if all(processor.table.column_types.get(col_idx) in _NUMERIC for col_idx in self.columns):
+                result = vectorized.evaluate(self.tree, operands, length)
+                if result is not None:
+                    return result
+
+            nullable = tuple(column_validity(processor.table, col_idx).null_count > 0
+                             for col_idx in self.columns)
+            kernel = _kernel(self.tree, nullable)
+            columns = [processor._typed_values(col_idx) for col_idx in self.columns]
+            return kernel(length, *columns), None
+        except ZeroDivisionError:
+            raise OperationError(f"Ошибка вычисления выражения {self.source}: Деление на ноль")
+        except OperationError:
+            raise
+        except Exception as e:
+            raise OperationError(f"Ошибка вычисления выражения {self.source}: {e}")
+
+    def values(self, processor) -> List[Any]:
+        values, valid = self.evaluate(processor)
+        if isinstance(values, list):
+            return values
+        return vectorized.to_list(values, valid)
+
+    def mask(self, processor) -> Mask:
+        if self.result_type is not bool:
+            raise OperationError(f"Выражение должно возвращать логическое значение: {self.source}")
+        values, _ = self.evaluate(processor)
+        if isinstance(values, list):
+            return Mask.from_bools(values)
+        return Mask.from_packed(vectorized.pack_bools(values), len(values))
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r}, type={getattr(self.result_type, '__name__', None)})"
+
+
+def compile_expression(source: str, processor) -> Expression:
+    if not isinstance(source, str) or not source.strip():
+        raise OperationError("Пустое выражение")
+    parsed = _parse(source)
+    table = processor.table
+    columns: List[int] = []
+    slots: Dict[int, int] = {}
+
+    def resolve(name: str) -> Tuple[int, Optional[type]]:
+        col_idx = processor._get_column_index(name)
+        if col_idx not in slots:
+            slots[col_idx] = len(columns)
+            columns.append(col_idx)
+        return slots[col_idx], table.column_types.get(col_idx)
+
+    tree, result_type = _check(parsed, resolve, source)
+    return Expression(source, tree, columns, result_type)
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def _parse(source: str) -> Node:
+    names: List[str] = []
+
+    def quote(match) -> str:
+        names.append(match.group(1))
+        return f"{_QUOTED_PREFIX}{len(names) - 1}"
+
+    try:
+        tree = ast.parse(_BACKTICK.sub(quote, source).strip(), mode='eval')
+    except SyntaxError as e:
+        raise OperationError(f"Ошибка разбора выражения {source}: {e.msg}")
+    return _lower(tree.body, names)
+
+
+def _lower(node: ast.AST, names: List[str]) -> Node:
+    if isinstance(node, ast.Name):
+        if node.id.startswith(_QUOTED_PREFIX):
+            return ('col', names[int(node.id[len(_QUOTED_PREFIX):])])
+        return ('col', node.id)
+    if isinstance(node, ast.Constant):
+        if node.value is not None and not isinstance(node.value, _LITERALS):
+            raise OperationError(f"Неподдерживаемый литерал в выражении: {node.value!r}")
+        return ('const', type(node.value), node.value)
+    if isinstance(node, ast.BinOp) and type(node.op) in _ARITHMETIC:
+        return ('arith', _ARITHMETIC[type(node.op)], _lower(node.left, names), _lower(node.right, names))
+    if isinstance(node, ast.BinOp) and type(node.op) in _LOGICAL:
+        return (_LOGICAL[type(node.op)], _lower(node.left, names), _lower(node.right, names))
+    if isinstance(node, ast.UnaryOp):
+        operand = _lower(node.operand, names)
+        if isinstance(node.op, ast.USub):
+            if operand[0] == 'const' and operand[1] in (int, float):
+                return ('const', operand[1], -operand[2])
+            return ('neg', operand)
+        if isinstance(node.op, ast.UAdd):
+            return ('pos', operand)
+        return ('not', operand)
+    if isinstance(node, ast.BoolOp):
+        op = 'and' if isinstance(node.op, ast.And) else 'or'
+        result = _lower(node.values[0], names)
+        for value in node.values[1:]:
+            result = (op, result, _lower(value, names))
+        return result
+    if isinstance(node, ast.Compare):
+        parts = []
+        left = _lower(node.left, names)
+        for op, comparator in zip(node.ops, node.comparators):
+            right = _lower(comparator, names)
+            parts.append(_compare(op, left, right))
+            left = right
+        result = parts[0]
+        for part in parts[1:]:
+            result = ('and', result, part)
+        return result
+    raise OperationError(f"Неподдерживаемая конструкция в выражении: {type(node).__name__}")
+
+
+def _compare(op: ast.cmpop, left: Node, right: Node) -> Node:
+    if isinstance(op, (ast.Is, ast.IsNot, ast.Eq, ast.NotEq)):
+        negate = isinstance(op, (ast.IsNot, ast.NotEq))
+        if right == _NONE:
+            return ('null', left, negate)
+        if left == _NONE:
+            return ('null', right, negate)
+    if type(op) not in _COMPARISON:
+        raise OperationError(f"Неподдерживаемое сравнение в выражении: {type(op).__name__}")
+    return ('cmp', _COMPARISON[type(op)], left, right)
+
+
+def _check(node: Node, resolve: Callable[[str], Tuple[int, Optional[type]]],
+           source: str) -> Tuple[Node, Optional[type]]:
+    kind = node[0]
+    if kind == 'col':
+        slot, col_type = resolve(node[1])
+        return ('col', slot), col_type
+    if kind == 'const':
+        return node, node[1] if node[2] is not None else None
+
+    if kind == 'null':
+        operand, _ = _check(node[1], resolve, source)
+        return ('null', operand, node[2]), bool
+
+    if kind in ('neg', 'pos'):
+        operand, operand_type = _check(node[1], resolve, source)
+        _require_numeric('-' if kind == 'neg' else '+', operand_type, None, source)
+        result_type = float if operand_type is float else int if operand_type is not None else None
+        if kind == 'neg':
+            return ('neg', operand), result_type
+        if operand_type is bool:
+            return ('arith', '+', ('const', int, 0), operand), result_type
+        return operand, result_type
+
+    if kind == 'not':
+        operand, operand_type = _check(node[1], resolve, source)
+        _require_bool('not', operand_type, source)
+        return ('not', operand), bool
+
+    if kind in ('and', 'or'):
+        left, left_type = _check(node[1], resolve, source)
+        right, right_type = _check(node[2], resolve, source)
+        _require_bool(kind, left_type, source)
+        _require_bool(kind, right_type, source)
+        return (kind, left, right), bool
+
+    op = node[1]
+    left, left_type = _check(node[2], resolve, source)
+    right, right_type = _check(node[3], resolve, source)
+    if kind == 'arith':
+        _require_numeric(op, left_type, right_type, source)
+        if op == '/' or float in (left_type, right_type):
+            result_type = float
+        elif left_type is None or right_type is None:
+            result_type = None
+        else:
+            result_type = int
+        return ('arith', op, left, right), result_type
+
+    comparable = (left_type is None or right_type is None
+                  or left_type in _NUMERIC and right_type in _NUMERIC
+                  or left_type is right_type)
+    if not comparable:
+        raise OperationError(
+            f"Несовместимые типы в сравнении {op}: {_type_name(left_type)} и {_type_name(right_type)} "
+            f"({source})"
+        )
+    return ('cmp', op, left, right), bool
+
+
+def _require_numeric(op: str, left_type: Optional[type], right_type: Optional[type], source: str):
+    for operand_type in (left_type, right_type):
+        if operand_type is not None and operand_type not in _NUMERIC:
+            raise OperationError(
+                f"Операция {op} поддерживается только для числовых типов и bool. "
+                f"Получен тип {_type_name(operand_type)} ({source})"
+            )
+
+
+def _require_bool(op: str, operand_type: Optional[type], source: str):
+    if operand_type is not None and operand_type is not bool:
+        raise OperationError(
+            f"Операция {op} требует логических операндов. Получен тип {_type_name(operand_type)} ({source})"
+        )
+
+
+def _type_name(value_type: Optional[type]) -> str:
+    return value_type.__name__ if value_type is not None else "None"
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def _kernel(tree: Node, nullable: Tuple[bool, ...]) -> Callable[..., List[Any]]:
+    constants: Dict[str, Any] = {}
+    temps = count()
+
+    def guard(parts: List[Tuple[str, bool]], build: Callable[..., str], fallback: str) -> str:
+        checks = []
+        names = []
+        for code, is_nullable in parts:
+            if is_nullable:
+                name = f"_t{next(temps)}"
+                checks.append(f"({name} := {code}) is None")
+                names.append(name)
+            else:
+                names.append(code)
+        if not checks:
+            return build(*names)
+        return f"({fallback} if {' or '.join(checks)} else {build(*names)})"
+
+    def truth(code: str, is_nullable: bool) -> str:
+        return f"({code} is True)" if is_nullable else code
+
+    def emit(node: Node) -> Tuple[str, bool]:
+        kind = node[0]
+        if kind == 'col':
+            return f"c{node[1]}", nullable[node[1]]
+        if kind == 'const':
+            name = f"k{len(constants)}"
+            constants[name] = node[2]
+            return name, node[2] is None
+        if kind == 'null':
+            code, _ = emit(node[1])
+            return f"({code} is {'not ' if node[2] else ''}None)", False
+        if kind == 'neg':
+            operand = emit(node[1])
+            return guard([operand], lambda x: f"(-{x})", "None"), operand[1]
+        if kind == 'not':
+            return f"(not {truth(*emit(node[1]))})", False
+        if kind in ('and', 'or'):
+            return f"({truth(*emit(node[1]))} {kind} {truth(*emit(node[2]))})", False
+        op = node[1]
+        left, right = emit(node[2]), emit(node[3])
+        if kind == 'arith':
+            return guard([left, right], lambda x, y: f"({x} {op} {y})", "None"), left[1] or right[1]
+        return guard([left, right], lambda x, y: f"({x} {op} {y})", "False"), False
+
+    code, _ = emit(tree)
+    args = [f"a{slot}" for slot in range(len(nullable))]
+    if not args:
+        body = f"[{code}] * length"
+    elif len(args) == 1:
+        body = f"[{code} for c0 in a0]"
+    else:
+        targets = ", ".join(f"c{slot}" for slot in range(len(args)))
+        body = f"[{code} for {targets} in zip({', '.join(args)})]"
+    source = f"def kernel(length, {', '.join(args)}):\n    return {body}\n"
+    namespace = dict(constants)
+    exec(compile(source, "<expression>", "exec"), namespace)
+    return namespace['kernel']
@@ -0,0 +1,199 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from .columnar import NullableColumn, column_kind, column_to_list
+from .utils import TableData, ColumnError, OperationError
+from .profiling import instrumented
+from . import vectorized
+
+AGGREGATES = ('sum', 'mean', 'min', 'max', 'count')
+
+Spec = Dict[Union[int, str], Union[str, Sequence[str]]]
+
+
+class GroupBy:
+    def __init__(self, tables: Iterable[Any], keys: Sequence[Union[int, str]], processor_type: type):
+        if not keys:
+            raise ColumnError("Не указаны столбцы для группировки")
+        self._tables = tables
+        self._keys = list(keys)
+        self._processor_type = processor_type
+
+    @instrumented("group_by.agg", method=True)
+    def agg(self, spec: Spec):
+        if not spec:
+            raise OperationError("Не указаны агрегатные функции")
+
+        plan: List[Tuple[Union[int, str], str, str]] = []
+        for column, funcs in spec.items():
+            names = [funcs] if isinstance(funcs, str) else list(funcs)
+            for func in names:
+                if func not in AGGREGATES:
+                    raise OperationError(f"Неподдерживаемая агрегатная функция: {func}")
+                name = str(column) if isinstance(funcs, str) else f"{column}_{func}"
+                plan.append((column, func, name))
+
+        groups: Dict[Any, int] = {}
+        states: List[List[Any]] = [[] for _ in plan]
+        key_names: Optional[List[str]] = None
+        key_types: List[Optional[type]] = []
+        value_types: List[Optional[type]] = [None] * len(plan)
+        columns = None
+
+        for table in self._tables:
+            if not isinstance(table, TableData):
+                table = table.table
+            if columns is None:
+                columns = table.columns
+            elif table.columns != columns:
+                raise OperationError(
+                    f"Несоответствие столбцов в блоке. Ожидалось: {columns}, получено: {table.columns}"
+                )
+
+            processor = self._processor_type(table)
+            key_idx = [processor._get_column_index(key) for key in self._keys]
+            value_idx = [processor._get_column_index(column) for column, _, _ in plan]
+            if key_names is None:
+                key_names = [table.columns[i] for i in key_idx]
+                key_types = [table.column_types.get(i) for i in key_idx]
+                value_types = [table.column_types.get(i) for i in value_idx]
+
+            if not table.data:
+                continue
+            key_values = [_column(processor, i, len(table.data)) for i in key_idx]
+            local_groups: Dict[Any, int] = {}
+            try:
+                ids = [local_groups.setdefault(key, len(local_groups))
+                       for key in (key_values[0] if len(key_values) == 1 else zip(*key_values))]
+            except TypeError as e:
+                raise OperationError(f"Ошибка группировки: {e}")
+
+            mapping = [groups.setdefault(key, len(groups)) for key in local_groups]
+            id_vector = vectorized.group_ids(ids)
+            operands: Dict[int, Tuple[Any, Any]] = {}
+            for step, ((_, func, _), col_idx) in enumerate(zip(plan, value_idx)):
+                if col_idx not in operands:
+                    operand = processor._numeric_operand(col_idx)
+                    if isinstance(operand, NullableColumn):
+                        operand = operand.to_list() if operand.null_count else operand.values
+                    if len(operand) != len(table.data):
+                        raise OperationError(f"Столбец {table.columns[col_idx]} содержит неполные строки")
+                    vector = None
+                    if id_vector is not None and (isinstance(operand, array) or None not in operand):
+                        vector = vectorized.group_vector(operand)
+                    operands[col_idx] = (operand, vector)
+                operand, vector = operands[col_idx]
+                if value_types[step] is None:
+                    value_types[step] = column_kind(operand) if isinstance(operand, array) else \
+                        next((type(value) for value in operand if value is not None), None)
+                partial = _reduce(ids, id_vector, len(local_groups), operand, vector, func)
+                _merge(states[step], mapping, partial, func, len(groups))
+
+        keys = list(groups)
+        rows = [list(key) if len(self._keys) > 1 else [key] for key in keys]
+        column_types: Dict[Union[int, str], type] = {}
+        for i, key_type in enumerate(key_types):
+            if key_type is not None:
+                column_types[i] = key_type
+
+        for step, (_, func, _) in enumerate(plan):
+            result_type = _result_type(func, value_types[step])
+            values = _finalize(states[step], func, result_type, len(keys))
+            for row, value in zip(rows, values):
+                row.append(value)
+            if result_type is not None:
+                column_types[len(self._keys) + step] = result_type
+
+        names = list(key_names or [str(key) for key in self._keys]) + [name for _, _, name in plan]
+        if len(set(names)) != len(names):
+            raise OperationError(f"Повторяющиеся имена столбцов результата: {names}")
+        return self._processor_type(TableData(rows, names, column_types=column_types))
+
+
+def _column(processor, col_idx: int, length: int) -> List[Any]:
+    values = processor._typed_values(col_idx)
+    if len(values) != length:
+        raise OperationError(
+            f"Столбец {processor.table.columns[col_idx]} содержит неполные строки"
+        )
+    return values
+
+
+def _reduce(ids: List[int], id_vector: Any, groups: int, values: Any, vector: Any,
+            func: str) -> List[Any]:
+    if func == 'mean':
+        return list(zip(_reduce(ids, id_vector, groups, values, vector, 'sum'),
+                        _reduce(ids, id_vector, groups, values, vector, 'count')))
+
+    if vector is not None:
+        reduced = vectorized.group_reduce(id_vector, groups, vector, func)
+        if reduced is not None:
+            return reduced
+
+    if isinstance(values, array):
+        values = column_to_list(values)
+    try:
+        if func == 'count':
+            counts = [0] * groups
+            for group, value in zip(ids, values):
+                if value is not None:
+                    counts[group] += 1
+            return counts
+        if func == 'sum':
+            totals = [0] * groups
+            for group, value in zip(ids, values):
+                if value is not None:
+                    totals[group] += value
+            return totals
+        best: List[Any] = [None] * groups
+        smaller = func == 'min'
+        for group, value in zip(ids, values):
+            if value is not None:
+                current = best[group]
+                if current is None or (value < current if smaller else value > current):
+                    best[group] = value
+        return best
+    except TypeError as e:
+        raise OperationError(f"Ошибка агрегации {func}: {e}")
+
+
+def _merge(state: List[Any], mapping: List[int], partial: List[Any], func: str, groups: int):
+    if len(state) < groups:
+        state.extend([None] * (groups - len(state)))
+    try:
+        for local, target in enumerate(mapping):
+            value = partial[local]
+            current = state[target]
+            if current is None:
+                state[target] = value
+            elif func == 'mean':
+                state[target] = (current[0] + value[0], current[1] + value[1])
+            elif func in ('sum', 'count'):
+                state[target] = current + value
+            elif value is not None and (value < current if func == 'min' else value > current):
+                state[target] = value
+    except TypeError as e:
+        raise OperationError(f"Ошибка агрегации {func}: {e}")
+
+
+def _result_type(func: str, value_type: Optional[type]) -> Optional[type]:
+    if func == 'count':
+        return int
+    if func == 'mean':
+        return float
+    if func == 'sum':
+        return float if value_type is float else int
+    return value_type
+
+
+def _finalize(state: List[Any], func: str, result_type: Optional[type], groups: int) -> List[Any]:
+    state = state + [None] * (groups - len(state))
+    if func == 'mean':
+        return [total / count if count else None for total, count in
+                (value or (0, 0) for value in state)]
+    if func in ('sum', 'count'):
+        zero = result_type() if result_type is not None else 0
+        return [zero if value is None else result_type(value) if result_type else value
+                for value in state]
+    if result_type is not None:
+        return [value if value is None else result_type(value) for value in state]
+    return state
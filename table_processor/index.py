@@ -0,0 +1,204 @@
+from bisect import bisect_left, bisect_right, insort
+from math import isnan
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional
+from .columnar import DictColumn
+
+_MISSING = object()
+
+
+def raw_column_values(table, col_idx: int) -> List[Any]:
+    if table.is_columnar:
+        return table.data.column_values(col_idx)
+    try:
+        return list(map(itemgetter(col_idx), table.data))
+    except IndexError:
+        return [row[col_idx] if col_idx < len(row) else _MISSING for row in table.data]
+
+
+class HashIndex:
+    REBUILD_RATIO = 0.25
+
+    def __init__(self, col_idx: int):
+        self.col_idx = col_idx
+        self.usable = True
+        self._buckets: Dict[Any, List[int]] = {}
+        self._data = None
+        self._length = -1
+        self._version = -1
+
+    def is_valid(self, table) -> bool:
+        return (self._data is table.data
+                and self._length == len(table.data)
+                and self._version == table.column_version(self.col_idx))
+
+    def build(self, table, values: Optional[List[Any]] = None):
+        column = table.data.column(self.col_idx) if values is None and table.is_columnar else None
+        if isinstance(column, DictColumn):
+            self._buckets = {value: positions for value, positions in
+                             zip(column.values, column.positions()) if positions}
+            self.usable = True
+            self._mark_valid(table)
+            return
+        if values is None:
+            values = raw_column_values(table, self.col_idx)
+        buckets: Dict[Any, List[int]] = {}
+        try:
+            for position, value in enumerate(values):
+                if value is _MISSING:
+                    continue
+                bucket = buckets.get(value)
+                if bucket is None:
+                    buckets[value] = [position]
+                else:
+                    bucket.append(position)
+            self.usable = True
+        except TypeError:
+            buckets = {}
+            self.usable = False
+        self._buckets = buckets
+        self._mark_valid(table)
+
+    def refresh(self, table, old_values: List[Any]):
+        new_values = raw_column_values(table, self.col_idx)
+        if not self.usable or len(old_values) != len(new_values):
+            self.build(table, new_values)
+            return
+        changed = [i for i, (old, new) in enumerate(zip(old_values, new_values))
+                   if old is not new and old != new]
+        if len(changed) > len(new_values) * self.REBUILD_RATIO:
+            self.build(table, new_values)
+            return
+        try:
+            for position in changed:
+                self._move(position, old_values[position], new_values[position])
+        except TypeError:
+            self.build(table, new_values)
+            return
+        self._mark_valid(table)
+
+    def lookup(self, values: Iterable[Any]) -> List[int]:
+        positions: List[int] = []
+        matched = 0
+        for value in dict.fromkeys(values):
+            bucket = self._buckets.get(value)
+            if bucket:
+                positions.extend(bucket)
+                matched += 1
+        if matched > 1:
+            positions.sort()
+        return positions
+
+    def _move(self, position: int, old: Any, new: Any):
+        if old is not _MISSING:
+            bucket = self._buckets[old]
+            bucket.remove(position)
+            if not bucket:
+                del self._buckets[old]
+        if new is not _MISSING:
+            bucket = self._buckets.get(new)
+            if bucket is None:
+                self._buckets[new] = [position]
+            else:
+                insort(bucket, position)
+
+    def _mark_valid(self, table):
+        self._data = table.data
+        self._length = len(table.data)
+        self._version = table.column_version(self.col_idx)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def __repr__(self) -> str:
+        return f"HashIndex(column={self.col_idx}, keys={len(self._buckets)})"
+
+
+class SortedIndex:
+    REBUILD_RATIO = 0.25
+
+    def __init__(self, col_idx: int):
+        self.col_idx = col_idx
+        self.usable = True
+        self.keys: List[Any] = []
+        self.positions: List[int] = []
+        self._column: List[Any] = []
+        self._col_type: Optional[type] = None
+        self._data = None
+        self._length = -1
+        self._version = -1
+
+    def is_valid(self, table) -> bool:
+        return (table.is_columnar
+                and self._data is table.data
+                and self._length == len(table.data)
+                and self._version == table.column_version(self.col_idx)
+                and self._col_type is table.column_types.get(self.col_idx))
+
+    def build(self, table, values: List[Any]):
+        self._column = values
+        self.keys, self.positions = [], []
+        self.usable = len(values) == len(table.data) and _orderable(values)
+        if self.usable:
+            try:
+                self.positions = sorted(range(len(values)), key=values.__getitem__)
+                self.keys = [values[p] for p in self.positions]
+            except TypeError:
+                self.usable = False
+                self.positions = []
+        self._mark_valid(table)
+
+    def refresh(self, table, values: List[Any]):
+        old_values = self._column
+        if not self.usable or len(old_values) != len(values) or not _orderable(values):
+            self.build(table, values)
+            return
+        changed = [i for i, (old, new) in enumerate(zip(old_values, values))
+                   if old is not new and old != new]
+        if len(changed) > len(values) * self.REBUILD_RATIO:
+            self.build(table, values)
+            return
+        try:
+            for position in changed:
+                self._move(position, old_values[position], values[position])
+        except (TypeError, ValueError):
+            self.build(table, values)
+            return
+        self._column = values
+        self._mark_valid(table)
+
+    def range(self, low: Any = None, high: Any = None,
+              include_low: bool = True, include_high: bool = True) -> List[int]:
+        start = 0
+        stop = len(self.keys)
+        if low is not None:
+            start = bisect_left(self.keys, low) if include_low else bisect_right(self.keys, low)
+        if high is not None:
+            stop = bisect_right(self.keys, high) if include_high else bisect_left(self.keys, high)
+        return self.positions[start:stop] if start < stop else []
+
+    def _move(self, position: int, old: Any, new: Any):
+        slot = self.positions.index(position, bisect_left(self.keys, old),
+                                    bisect_right(self.keys, old))
+        del self.keys[slot]
+        del self.positions[slot]
+        slot = bisect_right(self.keys, new)
+        self.keys.insert(slot, new)
+        self.positions.insert(slot, position)
+
+    def _mark_valid(self, table):
+        self._data = table.data
+        self._length = len(table.data)
+        self._version = table.column_version(self.col_idx)
+        self._col_type = table.column_types.get(self.col_idx)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:
+        return f"SortedIndex(column={self.col_idx}, rows={len(self.keys)})"
+
+
+def _orderable(values: List[Any]) -> bool:
+    return None not in values and not any(isinstance(value, float) and isnan(value)
+                                          for value in values)
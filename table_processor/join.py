@@ -0,0 +1,210 @@
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from .columnar import ColumnarRows
+from .utils import TableData, TableError, ColumnError, OperationError, _part_table
+
+JOIN_TYPES = ('inner', 'left')
+SPILL_BATCH = 8192
+
+Pairs = Tuple[List[int], List[int]]
+
+
+def hash_join(left, right, left_on: Sequence[Union[int, str]], right_on: Sequence[Union[int, str]],
+              how: str = 'inner', suffixes: Tuple[str, str] = ("_left", "_right"),
+              max_build_rows: Optional[int] = None):
+    if how not in JOIN_TYPES:
+        raise OperationError(f"Неподдерживаемый тип соединения: {how}")
+    if not left_on or len(left_on) != len(right_on):
+        raise ColumnError("Столбцы соединения должны быть заданы для обеих таблиц в равном количестве")
+    if max_build_rows is not None and (not isinstance(max_build_rows, int) or max_build_rows < 1):
+        raise TableError(f"Некорректное значение max_build_rows: {max_build_rows}")
+    if len(suffixes) != 2 or suffixes[0] == suffixes[1]:
+        raise TableError(f"Некорректные суффиксы: {suffixes}")
+
+    left_idx = [left._get_column_index(column) for column in left_on]
+    right_idx = [right._get_column_index(column) for column in right_on]
+
+    build_left = how == 'inner' and len(left.table.data) < len(right.table.data)
+    build, build_idx = (left, left_idx) if build_left else (right, right_idx)
+    probe, probe_idx = (right, right_idx) if build_left else (left, left_idx)
+    build_rows = len(build.table.data)
+    partitioned = max_build_rows is not None and build_rows > max_build_rows
+    if partitioned:
+        partitions = -(-build_rows // max_build_rows)
+        build_pos, probe_pos = _partitioned_join(build, build_idx, probe, probe_idx, partitions, how)
+    else:
+        build_keys = _keys(build, build_idx)
+        probe_keys = _keys(probe, probe_idx)
+        build_pos, probe_pos = _join(range(len(build_keys)), build_keys,
+                                     range(len(probe_keys)), probe_keys, how)
+    left_pos, right_pos = (build_pos, probe_pos) if build_left else (probe_pos, build_pos)
+
+    if build_left or partitioned:
+        order = sorted(range(len(left_pos)), key=lambda i: (left_pos[i], right_pos[i]))
+        left_pos = [left_pos[i] for i in order]
+        right_pos = [right_pos[i] for i in order]
+
+    return _materialize(left, right, left_idx, right_idx, left_pos, right_pos, suffixes)
+
+
+def _keys(processor, col_indices: List[int]) -> List[Any]:
+    length = len(processor.table.data)
+    columns = []
+    for col_idx in col_indices:
+        values = processor._typed_values(col_idx)
+        if len(values) != length:
+            raise ColumnError(f"Столбец {processor.table.columns[col_idx]} содержит неполные строки")
+        columns.append(values)
+    if len(columns) == 1:
+        return columns[0]
+    return [None if None in key else key for key in zip(*columns)]
+
+
+def _key_batches(processor, col_indices: List[int]):
+    table = processor.table
+    length = len(table.data)
+    for start in range(0, length, SPILL_BATCH):
+        batch = type(processor)(_part_table(table, start, min(start + SPILL_BATCH, length)))
+        yield start, _keys(batch, col_indices)
+
+
+def _join(build_positions: Sequence[int], build_keys: Sequence[Any],
+          probe_positions: Sequence[int], probe_keys: Sequence[Any], how: str) -> Pairs:
+    outer = how == 'left'
+    try:
+        unique = dict(zip(build_keys, build_positions))
+    except TypeError as e:
+        raise OperationError(f"Ошибка соединения: {e}")
+
+    if len(unique) == len(build_keys):
+        unique.pop(None, None)
+        matches = list(map(unique.get, probe_keys))
+        if outer:
+            return [-1 if match is None else match for match in matches], list(probe_positions)
+        return ([match for match in matches if match is not None],
+                [position for position, match in zip(probe_positions, matches) if match is not None])
+
+    table: Dict[Any, List[int]] = {}
+    for position, key in zip(build_positions, build_keys):
+        if key is not None:
+            table.setdefault(key, []).append(position)
+
+    build_pos: List[int] = []
+    probe_pos: List[int] = []
+    for position, key in zip(probe_positions, probe_keys):
+        matches = table.get(key) if key is not None else None
+        if matches:
+            build_pos.extend(matches)
+            probe_pos.extend([position] * len(matches))
+        elif outer:
+            build_pos.append(-1)
+            probe_pos.append(position)
+    return build_pos, probe_pos
+
+
+def _partitioned_join(build, build_idx: List[int], probe, probe_idx: List[int],
+                      partitions: int, how: str) -> Pairs:
+    build_pos: List[int] = []
+    probe_pos: List[int] = []
+    with tempfile.TemporaryDirectory(prefix="tp_join_") as directory:
+        build_files = _spill(build, build_idx, partitions, os.path.join(directory, "build"),
+                             skip_nulls=True)
+        probe_files = _spill(probe, probe_idx, partitions, os.path.join(directory, "probe"),
+                             skip_nulls=how != 'left')
+        for build_file, probe_file in zip(build_files, probe_files):
+            part_build, part_probe = _join(*_read_spill(build_file), *_read_spill(probe_file), how)
+            build_pos.extend(part_build)
+            probe_pos.extend(part_probe)
+    return build_pos, probe_pos
+
+
+def _spill(processor, col_indices: List[int], partitions: int, prefix: str,
+           skip_nulls: bool) -> List[str]:
+    paths = [f"{prefix}_{n}.pkl" for n in range(partitions)]
+    buffers: List[Tuple[List[int], List[Any]]] = [([], []) for _ in range(partitions)]
+    files = [open(path, 'wb') for path in paths]
+    try:
+        for start, keys in _key_batches(processor, col_indices):
+            for position, key in enumerate(keys, start):
+                if key is None:
+                    if skip_nulls:
+                        continue
+                    part = 0
+                else:
+                    try:
+                        part = hash(key) % partitions
+                    except TypeError as e:
+                        raise OperationError(f"Ошибка соединения: {e}")
+                positions, part_keys = buffers[part]
+                positions.append(position)
+                part_keys.append(key)
+                if len(positions) >= SPILL_BATCH:
+                    _flush(files[part], buffers[part])
+        for part, buffer in enumerate(buffers):
+            if buffer[0]:
+                _flush(files[part], buffer)
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+def _flush(f, buffer: Tuple[List[int], List[Any]]):
+    pickle.dump(buffer, f, protocol=pickle.HIGHEST_PROTOCOL)
+    for values in buffer:
+        values.clear()
+
+
+def _read_spill(path: str) -> Tuple[List[int], List[Any]]:
+    positions: List[int] = []
+    keys: List[Any] = []
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                batch_positions, batch_keys = pickle.load(f)
+            except EOFError:
+                return positions, keys
+            positions.extend(batch_positions)
+            keys.extend(batch_keys)
+
+
+def _materialize(left, right, left_idx: List[int], right_idx: List[int],
+                 left_pos: List[int], right_pos: List[int], suffixes: Tuple[str, str]):
+    left_table, right_table = left.table, right.table
+    shared = {r for l, r in zip(left_idx, right_idx)
+              if left_table.columns[l] == right_table.columns[r]}
+    right_cols = [i for i in range(len(right_table.columns)) if i not in shared]
+
+    left_names = set(left_table.columns)
+    right_names = {right_table.columns[i] for i in right_cols}
+    names = [name + suffixes[0] if name in right_names else name for name in left_table.columns]
+    names += [right_table.columns[i] + suffixes[1] if right_table.columns[i] in left_names
+              else right_table.columns[i] for i in right_cols]
+    if len(set(names)) != len(names):
+        raise OperationError(f"Повторяющиеся имена столбцов результата: {names}")
+
+    outputs = []
+    column_types: Dict[Union[int, str], type] = {}
+    sources = [(left, i, left_pos) for i in range(len(left_table.columns))] + \
+              [(right, i, right_pos) for i in right_cols]
+    for out_idx, (processor, col_idx, positions) in enumerate(sources):
+        values = processor._typed_values(col_idx)
+        if len(values) != len(processor.table.data):
+            raise ColumnError(f"Столбец {processor.table.columns[col_idx]} содержит неполные строки")
+        if not positions or min(positions) >= 0:
+            outputs.append(list(map(values.__getitem__, positions)))
+        else:
+            padded = list(values)
+            padded.append(None)
+            outputs.append(list(map(padded.__getitem__, positions)))
+        col_type = processor.table.column_types.get(col_idx)
+        if col_type is not None:
+            column_types[out_idx] = col_type
+
+    if left_table.is_columnar:
+        data = ColumnarRows.from_columns(outputs)
+    else:
+        data = list(map(list, zip(*outputs))) if outputs and left_pos else []
+    return type(left)(TableData(data, names, column_types=column_types))
@@ -0,0 +1,362 @@
+import operator
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from .utils import TableData, TableError, ColumnError, OperationError
+from .profiling import instrumented
+
+_ARITHMETIC = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'div': operator.truediv,
+}
+
+_COMPARISON = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'gr': operator.gt,
+    'ls': operator.lt,
+    'ge': operator.ge,
+    'le': operator.le,
+}
+
+Operand = Tuple[bool, Any]
+
+
+def _read(row: List[Any], col_idx: int, col_type: Optional[type]) -> Any:
+    value = row[col_idx] if col_idx < len(row) else None
+    if col_type is not None:
+        try:
+            return col_type(value)
+        except (ValueError, TypeError):
+            return value
+    return value
+
+
+class Predicate:
+    def __init__(self, columns: Set[int]):
+        self.columns = columns
+
+    def evaluate(self, row: List[Any], types: Dict[int, type]) -> bool:
+        raise NotImplementedError
+
+    def __and__(self, other: 'Predicate') -> 'Predicate':
+        return _Combined(all, (self, other))
+
+    def __or__(self, other: 'Predicate') -> 'Predicate':
+        return _Combined(any, (self, other))
+
+    def __invert__(self) -> 'Predicate':
+        return _Negated(self)
+
+
+class _Comparison(Predicate):
+    def __init__(self, op_name: str, col_idx: int, operand: Operand):
+        is_column, value = operand
+        super().__init__({col_idx, value} if is_column else {col_idx})
+        self.op_name = op_name
+        self.col_idx = col_idx
+        self.operand = operand
+
+    def evaluate(self, row: List[Any], types: Dict[int, type]) -> bool:
+        v1 = _read(row, self.col_idx, types.get(self.col_idx))
+        is_column, v2 = self.operand
+        if is_column:
+            v2 = _read(row, v2, types.get(v2))
+        elif v2 is None and self.op_name in ('eq', 'ne'):
+            return (v1 is None) == (self.op_name == 'eq')
+        if v1 is None or v2 is None and is_column:
+            return False
+        try:
+            if isinstance(v1, bool):
+                v1 = int(v1)
+            if isinstance(v2, bool):
+                v2 = int(v2)
+            return _COMPARISON[self.op_name](v1, v2)
+        except Exception as e:
+            raise OperationError(f"Ошибка сравнения: {e}")
+
+    def __repr__(self) -> str:
+        is_column, value = self.operand
+        operand = f"#{value}" if is_column else repr(value)
+        return f"{self.op_name}(#{self.col_idx}, {operand})"
+
+
+class _Combined(Predicate):
+    def __init__(self, combine: Callable, parts: Tuple[Predicate, ...]):
+        super().__init__(set().union(*(part.columns for part in parts)))
+        self.combine = combine
+        self.parts = parts
+
+    def evaluate(self, row: List[Any], types: Dict[int, type]) -> bool:
+        return self.combine(part.evaluate(row, types) for part in self.parts)
+
+    def __repr__(self) -> str:
+        joiner = " & " if self.combine is all else " | "
+        return "(" + joiner.join(map(repr, self.parts)) + ")"
+
+
+class _Negated(Predicate):
+    def __init__(self, part: Predicate):
+        super().__init__(set(part.columns))
+        self.part = part
+
+    def evaluate(self, row: List[Any], types: Dict[int, type]) -> bool:
+        return not self.part.evaluate(row, types)
+
+    def __repr__(self) -> str:
+        return f"~{self.part!r}"
+
+
+class LazyTable:
+    def __init__(self, processor):
+        self._processor = processor
+        self._steps: List[Tuple] = []
+
+    def add(self, col1: Union[int, str], col2: Union[int, str, Any],
+            result_col: Optional[Union[int, str]] = None) -> 'LazyTable':
+        return self._arithmetic(col1, col2, result_col, 'add')
+
+    def sub(self, col1: Union[int, str], col2: Union[int, str, Any],
+            result_col: Optional[Union[int, str]] = None) -> 'LazyTable':
+        return self._arithmetic(col1, col2, result_col, 'sub')
+
+    def mul(self, col1: Union[int, str], col2: Union[int, str, Any],
+            result_col: Optional[Union[int, str]] = None) -> 'LazyTable':
+        return self._arithmetic(col1, col2, result_col, 'mul')
+
+    def div(self, col1: Union[int, str], col2: Union[int, str, Any],
+            result_col: Optional[Union[int, str]] = None) -> 'LazyTable':
+        return self._arithmetic(col1, col2, result_col, 'div')
+
+    def eq(self, col1: Union[int, str], col2: Union[int, str, Any]) -> Predicate:
+        return self._comparison(col1, col2, 'eq')
+
+    def ne(self, col1: Union[int, str], col2: Union[int, str, Any]) -> Predicate:
+        return self._comparison(col1, col2, 'ne')
+
+    def gr(self, col1: Union[int, str], col2: Union[int, str, Any]) -> Predicate:
+        return self._comparison(col1, col2, 'gr')
+
+    def ls(self, col1: Union[int, str], col2: Union[int, str, Any]) -> Predicate:
+        return self._comparison(col1, col2, 'ls')
+
+    def ge(self, col1: Union[int, str], col2: Union[int, str, Any]) -> Predicate:
+        return self._comparison(col1, col2, 'ge')
+
+    def le(self, col1: Union[int, str], col2: Union[int, str, Any]) -> Predicate:
+        return self._comparison(col1, col2, 'le')
+
+    def filter_rows(self, predicate: Predicate) -> 'LazyTable':
+        if not isinstance(predicate, Predicate):
+            raise TableError("В ленивом режиме filter_rows принимает только условия, "
+                             "построенные методами eq, ne, gr, ls, ge, le")
+        self._steps.append(('filter', predicate))
+        return self
+
+    def get_rows_by_number(self, start: int, stop: Optional[int] = None) -> 'LazyTable':
+        self._steps.append(('rows', start, stop))
+        return self
+
+    def get_rows_by_index(self, *indices: Any, column: Union[int, str] = 0) -> 'LazyTable':
+        if not indices:
+            raise TableError("Не указаны значения для поиска")
+        self._steps.append(('index', self._processor._get_column_index(column), indices))
+        return self
+
+    def explain(self) -> str:
+        lines = []
+        for step in self._optimize():
+            if step[0] == 'fused':
+                ops = ", ".join(f"{op}(#{c1}, {'#' if is_col else ''}{v}) -> #{res}"
+                                for op, c1, (is_col, v), res in step[1])
+                lines.append(f"fused[{ops}]")
+            elif step[0] == 'filter':
+                lines.append(f"filter {step[1]!r}")
+            elif step[0] == 'rows':
+                lines.append(f"rows [{step[1]}:{step[2]}]")
+            else:
+                lines.append(f"index #{step[1]} in {step[2]!r}")
+        return "\n".join(lines)
+
+    @instrumented("lazy.collect", method=True)
+    def collect(self):
+        source = self._processor.table
+        types = {k: v for k, v in source.column_types.items() if isinstance(k, int)}
+        positions: Union[range, List[int]] = range(len(source.data))
+        rows: Optional[List[List[Any]]] = None
+
+        for step in self._optimize():
+            kind = step[0]
+            if kind == 'fused':
+                if rows is None:
+                    rows = [list(source.data[p]) for p in positions]
+                self._run_fused(step[1], rows, types)
+            elif kind == 'filter':
+                predicate = step[1]
+                if rows is None:
+                    data = source.data
+                    positions = [p for p in positions if predicate.evaluate(data[p], types)]
+                else:
+                    rows = [row for row in rows if predicate.evaluate(row, types)]
+            elif kind == 'rows':
+                start, stop = step[1], step[2]
+                length = len(positions) if rows is None else len(rows)
+                self._check_row_range(start, stop, length)
+                window = slice(start, start + 1 if stop is None else stop)
+                if rows is None:
+                    positions = positions[window]
+                else:
+                    rows = rows[window]
+            else:
+                col_idx, indices = step[1], step[2]
+                if rows is None and positions == range(len(source.data)):
+                    positions = self._processor._lookup_rows(col_idx, indices)
+                elif rows is None:
+                    data = source.data
+                    positions = [p for p in positions
+                                 if col_idx < len(data[p]) and data[p][col_idx] in indices]
+                else:
+                    rows = [row for row in rows if col_idx < len(row) and row[col_idx] in indices]
+
+        if rows is None:
+            rows = [list(source.data[p]) for p in positions]
+
+        result = TableData(columns=source.columns.copy())
+        result.data = rows
+        for col_idx, col_type in types.items():
+            result.column_types[col_idx] = col_type
+            if col_idx < len(result.columns):
+                result.column_types[result.columns[col_idx]] = col_type
+        return type(self._processor)(result)
+
+    def _arithmetic(self, col1, col2, result_col, op_name: str) -> 'LazyTable':
+        col1_idx = self._processor._get_column_index(col1)
+        result_idx = col1_idx if result_col is None else self._processor._get_column_index(result_col)
+        self._steps.append(('arith', op_name, col1_idx, self._operand(col2), result_idx))
+        return self
+
+    def _comparison(self, col1, col2, op_name: str) -> Predicate:
+        return _Comparison(op_name, self._processor._get_column_index(col1), self._operand(col2))
+
+    def _operand(self, col2: Any) -> Operand:
+        columns = self._processor.table.columns
+        if isinstance(col2, (int, str)) and col2 in columns or \
+           isinstance(col2, int) and 0 <= col2 < len(columns):
+            return True, self._processor._get_column_index(col2)
+        return False, col2
+
+    def _optimize(self) -> List[Tuple]:
+        ordered: List[Tuple] = []
+        for step in self._steps:
+            position = len(ordered)
+            if step[0] in ('filter', 'index', 'rows'):
+                reads = self._step_reads(step)
+                while position > 0 and ordered[position - 1][0] == 'arith' and \
+                        (reads is None or ordered[position - 1][4] not in reads):
+                    position -= 1
+            ordered.insert(position, step)
+
+        plan: List[Tuple] = []
+        for step in ordered:
+            if step[0] == 'arith':
+                fused = (step[1], step[2], step[3], step[4])
+                if plan and plan[-1][0] == 'fused':
+                    plan[-1][1].append(fused)
+                else:
+                    plan.append(('fused', [fused]))
+            else:
+                plan.append(step)
+        return plan
+
+    @staticmethod
+    def _step_reads(step: Tuple) -> Optional[Set[int]]:
+        if step[0] == 'filter':
+            return step[1].columns
+        if step[0] == 'index':
+            return {step[1]}
+        return None
+
+    @staticmethod
+    def _check_row_range(start: int, stop: Optional[int], length: int):
+        if not length:
+            return
+        if start < 0 or start >= length:
+            raise TableError(f"Некорректный начальный индекс: {start}")
+        if stop is not None:
+            if stop < 0 or stop > length:
+                raise TableError(f"Некорректный конечный индекс: {stop}")
+            if start >= stop:
+                raise TableError(f"Начальный индекс должен быть меньше конечного")
+
+    @staticmethod
+    def _run_fused(ops: List[Tuple], rows: List[List[Any]], types: Dict[int, type]):
+        read_types: List[Tuple[Optional[type], Optional[type]]] = []
+        write_types: List[Optional[type]] = []
+        result_types: List[Optional[type]] = []
+
+        for op_name, col1_idx, (is_column, operand), result_idx in ops:
+            col1_type = types.get(col1_idx)
+            if col1_type is None and any(op[3] == col1_idx for op in ops[:len(result_types)]):
+                col1_type = int
+            elif col1_type is None and rows:
+                col1_type = next((type(row[col1_idx]) for row in rows
+                                  if col1_idx < len(row) and row[col1_idx] is not None), None)
+            if col1_type not in (int, float, bool):
+                raise OperationError(
+                    f"Операция {op_name} поддерживается только для числовых типов и bool. "
+                    f"Тип столбца {col1_idx}: {col1_type}"
+                )
+            if not rows:
+                return
+            read_types.append((types.get(col1_idx), types.get(operand) if is_column else None))
+            write_types.append(types.get(result_idx))
+            first = LazyTable._apply(rows[0], op_name, col1_idx, is_column, operand,
+                                     result_idx, read_types[-1], write_types[-1])
+            result_types.append(None if first is None else type(first))
+            if first is not None:
+                types[result_idx] = type(first)
+
+        for row in rows[1:]:
+            for step, ((op_name, col1_idx, (is_column, operand), result_idx), read, write) in \
+                    enumerate(zip(ops, read_types, write_types)):
+                result = LazyTable._apply(row, op_name, col1_idx, is_column, operand,
+                                          result_idx, read, write)
+                if result_types[step] is None and result is not None:
+                    result_types[step] = type(result)
+
+        for (_, _, _, result_idx), result_type in zip(ops, result_types):
+            if result_type is not None:
+                types[result_idx] = result_type
+
+    @staticmethod
+    def _apply(row: List[Any], op_name: str, col1_idx: int, is_column: bool, operand: Any,
+               result_idx: int, read: Tuple[Optional[type], Optional[type]],
+               write: Optional[type]) -> Any:
+        v1 = _read(row, col1_idx, read[0])
+        v2 = _read(row, operand, read[1]) if is_column else operand
+        if v1 is None or v2 is None and is_column:
+            while len(row) <= result_idx:
+                row.append(None)
+            row[result_idx] = None
+            return None
+        try:
+            if isinstance(v1, bool):
+                v1 = int(v1)
+            if isinstance(v2, bool):
+                v2 = int(v2)
+            if op_name == 'div' and v2 == 0:
+                raise OperationError("Деление на ноль")
+            result = _ARITHMETIC[op_name](v1, v2)
+        except Exception as e:
+            raise OperationError(f"Ошибка операции {op_name}: {e}")
+
+        while len(row) <= result_idx:
+            row.append(None)
+        if write is not None:
+            try:
+                row[result_idx] = write(result)
+            except (ValueError, TypeError) as e:
+                raise ColumnError(f"Ошибка преобразования значения: {result}") from e
+        else:
+            row[result_idx] = result
+        return result
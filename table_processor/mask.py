@@ -0,0 +1,156 @@
+import sys
+from array import array
+from itertools import compress
+from typing import Any, Iterable, Iterator, List, Union
+from .bitmap import flags_to_bits, unpack_flags
+from .utils import TableError, OperationError
+from . import vectorized
+
+_BOOLS = (False, True)
+_SPARSE_RATIO = 64
+
+
+class Mask:
+    __slots__ = ('bits', 'length')
+
+    def __init__(self, bits: int = 0, length: int = 0):
+        self.bits = bits
+        self.length = length
+
+    @classmethod
+    def from_bools(cls, values: Iterable[Any]) -> 'Mask':
+        if isinstance(values, Mask):
+            return values
+        if not isinstance(values, (list, bytes, bytearray)):
+            values = list(values)
+        if not values:
+            return cls(0, 0)
+        try:
+            flags = bytes(values)
+        except (TypeError, ValueError):
+            flags = bytes(map(bool, values))
+        return cls(flags_to_bits(flags), len(values))
+
+    @classmethod
+    def from_indices(cls, indices: Iterable[int], length: int) -> 'Mask':
+        packed = bytearray((length + 7) // 8)
+        for position in indices:
+            if position < 0 or position >= length:
+                raise OperationError(f"Индекс строки вне диапазона: {position}")
+            packed[position >> 3] |= 1 << (position & 7)
+        return cls(int.from_bytes(packed, 'little'), length)
+
+    @classmethod
+    def from_packed(cls, packed: bytes, length: int) -> 'Mask':
+        return cls(int.from_bytes(packed, 'little') & ((1 << length) - 1), length)
+
+    @classmethod
+    def full(cls, length: int, value: bool = True) -> 'Mask':
+        return cls((1 << length) - 1 if value else 0, length)
+
+    def count(self) -> int:
+        return self.bits.bit_count()
+
+    def any(self) -> bool:
+        return self.bits != 0
+
+    def all(self) -> bool:
+        return self.bits == (1 << self.length) - 1
+
+    def packed(self) -> bytes:
+        return self.bits.to_bytes((self.length + 7) // 8, 'little')
+
+    def indices(self) -> List[int]:
+        if not self.bits:
+            return []
+        packed = self.packed()
+        found = vectorized.unpack_indices(packed, self.length)
+        if found is not None:
+            return found
+        if self.count() * _SPARSE_RATIO < self.length:
+            return self._sparse_indices(packed)
+        return list(compress(range(self.length), self._flags(packed)))
+
+    def to_list(self) -> List[bool]:
+        return list(map(_BOOLS.__getitem__, self._flags(self.packed())))
+
+    def _flags(self, packed: bytes) -> bytes:
+        return unpack_flags(packed, self.length)
+
+    def _sparse_indices(self, packed: bytes) -> List[int]:
+        words = array('Q', packed + bytes(-len(packed) % 8))
+        if sys.byteorder != 'little':
+            words.byteswap()
+        found = []
+        for offset, word in enumerate(words):
+            base = offset * 64
+            while word:
+                low = word & -word
+                found.append(base + low.bit_length() - 1)
+                word ^= low
+        return found
+
+    def _check(self, other: Any) -> 'Mask':
+        if not isinstance(other, Mask):
+            other = Mask.from_bools(other)
+        if other.length != self.length:
+            raise OperationError(
+                f"Длины масок не совпадают: {self.length} и {other.length}"
+            )
+        return other
+
+    def __and__(self, other: Any) -> 'Mask':
+        return Mask(self.bits & self._check(other).bits, self.length)
+
+    def __or__(self, other: Any) -> 'Mask':
+        return Mask(self.bits | self._check(other).bits, self.length)
+
+    def __xor__(self, other: Any) -> 'Mask':
+        return Mask(self.bits ^ self._check(other).bits, self.length)
+
+    __rand__ = __and__
+    __ror__ = __or__
+    __rxor__ = __xor__
+
+    def __invert__(self) -> 'Mask':
+        return Mask(self.bits ^ ((1 << self.length) - 1), self.length)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, position: int) -> bool:
+        if position < 0:
+            position += self.length
+        if position < 0 or position >= self.length:
+            raise IndexError("Индекс маски вне диапазона")
+        return bool(self.bits >> position & 1)
+
+    def __iter__(self) -> Iterator[bool]:
+        return iter(self.to_list())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Mask):
+            return self.length == other.length and self.bits == other.bits
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.bits, self.length))
+
+    def __repr__(self) -> str:
+        return f"Mask(length={self.length}, count={self.count()})"
+
+
+def as_positions(selector: Union[Mask, range, array], length: int) -> List[int]:
+    if isinstance(selector, Mask):
+        if selector.length != length:
+            raise TableError(
+                f"Длина маски ({selector.length}) должна соответствовать количеству строк ({length})"
+            )
+        return selector.indices()
+    positions = list(selector)
+    for position in positions:
+        if type(position) is not int or position < 0 or position >= length:
+            raise TableError(f"Некорректный индекс строки: {position}")
+    return positions
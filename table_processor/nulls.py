@@ -0,0 +1,63 @@
+from array import array
+from .bitmap import count_bits, pack_flags
+from .columnar import DictColumn, NullableColumn
+from .index import _MISSING, raw_column_values
+from .mask import Mask
+
+
+def column_validity(table, col_idx: int) -> 'ColumnValidity':
+    validity = table._validity.get(col_idx)
+    if validity is None:
+        validity = table._validity[col_idx] = ColumnValidity(col_idx)
+    if not validity.is_valid(table):
+        validity.build(table)
+    return validity
+
+
+class ColumnValidity:
+    def __init__(self, col_idx: int):
+        self.col_idx = col_idx
+        self.packed = b""
+        self.length = 0
+        self.null_count = 0
+        self._data = None
+        self._length = -1
+        self._version = -1
+
+    def is_valid(self, table) -> bool:
+        return (table.is_columnar
+                and self._data is table.data
+                and self._length == len(table.data)
+                and self._version == table.column_version(self.col_idx))
+
+    def build(self, table):
+        column = table.data.column(self.col_idx) if table.is_columnar else None
+        self.length = len(table.data)
+        if isinstance(column, array):
+            self.packed = Mask.full(self.length).packed()
+        elif isinstance(column, NullableColumn):
+            self.packed = bytes(column.validity)
+        else:
+            self.packed = bytes(pack_flags(_flags(table, self.col_idx, column)))
+        self.null_count = self.length - count_bits(self.packed)
+        self._data = table.data
+        self._length = len(table.data)
+        self._version = table.column_version(self.col_idx)
+
+    def mask(self) -> Mask:
+        return Mask.from_packed(self.packed, self.length)
+
+    def __repr__(self) -> str:
+        return f"ColumnValidity(column={self.col_idx}, rows={self.length}, nulls={self.null_count})"
+
+
+def _flags(table, col_idx: int, column) -> bytes:
+    if isinstance(column, DictColumn):
+        null_code = column.code(None)
+        if null_code is None:
+            return b"\x01" * len(column)
+        if column.codes.typecode == 'B':
+            return column.codes.tobytes().translate(bytes(code != null_code for code in range(256)))
+        return bytes([code != null_code for code in column.codes])
+    values = raw_column_values(table, col_idx)
+    return bytes([value is not None and value is not _MISSING for value in values])
@@ -1,76 +1,286 @@
+import io
 import pickle
-from typing import List, Optional
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import os
-from .utils import TableData, LoadError, SaveError
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .columnar import ColumnarRows, Column, DictColumn, NullableColumn, column_to_list
+from .utils import TableData, LoadError, SaveError, resolve_workers, atomic_open, save_parts
+from .profiling import instrumented
 
-def load_table(*file_paths) -> TableData:
+MAGIC = b"TPPKL\x00\x01\x00"
+PROTOCOL = 5
+
+@instrumented("load_pickle", reads=True)
+def load_table(*file_paths, workers: int = 1) -> TableData:
     if not file_paths:
         raise LoadError("Не указаны файлы для загрузки")
     
-    all_data = []
     columns = None
+    column_types = {}
+    workers = resolve_workers(workers, len(file_paths), LoadError)
     
-    for file_idx, file_path in enumerate(file_paths):
+    for file_path in file_paths:
         if not os.path.exists(file_path):
             raise LoadError(f"Файл не существует: {file_path}")
-        
+    
+    headers = [_peek_header(file_path) for file_path in file_paths]
+    total_rows = None
+    if all(header is not None for header in headers):
+        total_rows = sum(header['rows'] for header in headers)
+        for file_path, header in zip(file_paths[1:], headers[1:]):
+            if header['columns'] != headers[0]['columns']:
+                raise LoadError(f"Ошибка чтения файла {file_path}: "
+                                f"Несоответствие столбцов в файле {file_path}")
+    
+    columnar = total_rows is not None and all(header['columnar'] for header in headers)
+    concatenation = _Concatenation(total_rows, columnar)
+    contents = _iter_contents(file_paths, workers)
+    data = None
+    
+    for file_idx, (file_path, content) in enumerate(zip(file_paths, contents)):
         try:
-            with open(file_path, 'rb') as f:
-                table_part = pickle.load(f)
-                
-                if not isinstance(table_part, TableData):
-                    raise LoadError(f"Файл {file_path} не содержит TableData")
-                
-                if file_idx == 0:
-                    columns = table_part.columns
-                    all_data = table_part.data.copy()
-                else:
-                    if table_part.columns != columns:
-                        raise LoadError(
-                            f"Несоответствие столбцов в файле {file_path}"
-                        )
-                    all_data.extend(table_part.data)
-                    
+            if isinstance(content, Exception):
+                raise content
+            
+            part_columns, part_types, part_data = _decode(content, file_path,
+                                                          columnar and len(file_paths) > 1)
+            
+            if file_idx == 0:
+                columns = part_columns
+                column_types = part_types
+            elif part_columns != columns:
+                raise LoadError(
+                    f"Несоответствие столбцов в файле {file_path}"
+                )
+            
+            if len(file_paths) == 1:
+                data = part_data
+            else:
+                concatenation.add(part_data)
+        
         except Exception as e:
             raise LoadError(f"Ошибка чтения файла {file_path}: {str(e)}")
     
-    result = TableData(all_data, columns)
+    if data is None:
+        data = concatenation.result()
+    
+    return TableData(data, columns, column_types=column_types)
+
+def _peek_header(file_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(file_path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            return pickle.load(f)
+    except Exception as e:
+        raise LoadError(f"Ошибка чтения файла {file_path}: {str(e)}")
+
+def _decode(content: bytes, file_path: str,
+            deferred: bool = False) -> Tuple[List[str], Dict[Union[int, str], type], Any]:
+    if not content.startswith(MAGIC):
+        table_part = pickle.loads(content)
+        if not isinstance(table_part, TableData):
+            raise LoadError(f"Файл {file_path} не содержит TableData")
+        return table_part.columns, table_part.column_types, table_part.data
+    
+    view = memoryview(content)
+    stream = io.BytesIO(view[len(MAGIC):])
+    header = pickle.load(stream)
+    position = len(MAGIC) + stream.tell()
+    
+    buffers = []
+    for size in header['buffers']:
+        buffers.append(view[position:position + size])
+        position += size
+    
+    if deferred and header['byteorder'] == sys.byteorder:
+        data = _DeferredUnpickler(io.BytesIO(view[position:]), buffers=buffers).load()
+        data.columns = [column if isinstance(column, (_PendingArray, NullableColumn))
+                        else _resolve_pending(column) for column in data.columns]
+        return header['columns'], header['column_types'], data
+    
+    data = pickle.loads(view[position:], buffers=buffers)
+    if header['byteorder'] != sys.byteorder and isinstance(data, ColumnarRows):
+        for column in data.columns:
+            if isinstance(column, NullableColumn):
+                column = column.values
+            if isinstance(column, array):
+                column.byteswap()
+    return header['columns'], header['column_types'], data
+
+def _restore_array(typecode: str, buffer: Any) -> array:
+    values = array(typecode)
+    values.frombytes(buffer)
+    return values
+
+class _PendingArray:
+    __slots__ = ('typecode', 'buffer')
+    
+    def __init__(self, typecode: str, buffer: Any):
+        self.typecode = typecode
+        self.buffer = memoryview(buffer).cast('B')
+    
+    @property
+    def itemsize(self) -> int:
+        return array(self.typecode).itemsize
     
-    if file_paths:
-        with open(file_paths[0], 'rb') as f:
-            first_table = pickle.load(f)
-            result.column_types = first_table.column_types.copy()
+    def view(self) -> memoryview:
+        return self.buffer.cast(self.typecode)
     
-    return result
+    def materialize(self) -> array:
+        return _restore_array(self.typecode, self.buffer)
+    
+    def __len__(self) -> int:
+        return self.buffer.nbytes // self.itemsize
+
+class _DeferredUnpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str):
+        if module == __name__ and name == _restore_array.__name__:
+            return _PendingArray
+        return super().find_class(module, name)
+
+def _resolve_pending(column: Any) -> Column:
+    if isinstance(column, _PendingArray):
+        return column.materialize()
+    if isinstance(column, NullableColumn) and isinstance(column.values, _PendingArray):
+        column.values = column.values.materialize()
+    elif isinstance(column, DictColumn) and isinstance(column.codes, _PendingArray):
+        column.codes = column.codes.materialize()
+    return column
+
+class _ColumnPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if type(obj) is array:
+            return _restore_array, (obj.typecode, pickle.PickleBuffer(obj))
+        return NotImplemented
+
+class _Concatenation:
+    def __init__(self, total_rows: Optional[int], columnar: bool):
+        self.total_rows = total_rows
+        self.columnar = columnar
+        self.rows: List[Any] = [None] * total_rows if total_rows is not None and not columnar else []
+        self.columns: Optional[List[Column]] = None
+        self.offset = 0
+
+    def add(self, data: Any):
+        size = len(data)
+        if self.columnar:
+            self._add_columns(data.columns, size)
+        else:
+            if isinstance(data, ColumnarRows):
+                data = data.to_rows()
+            if self.total_rows is None:
+                self.rows.extend(data)
+            else:
+                self.rows[self.offset:self.offset + size] = data
+        self.offset += size
+
+    def _add_columns(self, columns: List[Column], size: int):
+        if self.columns is None:
+            self.columns = [self._allocate(column) for column in columns]
+        
+        stop = self.offset + size
+        for col, column in enumerate(columns):
+            target = self.columns[col]
+            if isinstance(target, DictColumn):
+                if isinstance(column, DictColumn):
+                    target.extend(_resolve_pending(column))
+                    continue
+                target = self.columns[col] = list(target) + [None] * (self.total_rows - self.offset)
+            buffer = column.values if isinstance(column, NullableColumn) else column
+            if isinstance(target, array) and isinstance(column, NullableColumn) \
+                    and buffer.typecode == target.typecode:
+                target = self.columns[col] = NullableColumn(target)
+            if isinstance(target, (array, NullableColumn)):
+                values = target.values if isinstance(target, NullableColumn) else target
+                if isinstance(buffer, (array, _PendingArray)) and buffer.typecode == values.typecode:
+                    source = buffer.view() if isinstance(buffer, _PendingArray) else memoryview(buffer)
+                    memoryview(values)[self.offset:stop] = source
+                    if buffer is not column:
+                        for position in column.null_positions():
+                            target[self.offset + position] = None
+                    continue
+                target = self.columns[col] = column_to_list(target)
+            target[self.offset:stop] = column_to_list(_resolve_pending(column))
+
+    def _allocate(self, column: Column) -> Column:
+        if isinstance(column, NullableColumn):
+            return NullableColumn(self._allocate(column.values))
+        if isinstance(column, (array, _PendingArray)):
+            return array(column.typecode, bytes(self.total_rows * column.itemsize))
+        if isinstance(column, DictColumn):
+            return DictColumn(array('B'), [], {})
+        return [None] * self.total_rows
+
+    def result(self) -> Any:
+        if self.columnar:
+            return ColumnarRows(self.columns or [], self.offset)
+        return self.rows
+
+def _iter_contents(file_paths, workers: int) -> Iterator[Union[bytes, Exception]]:
+    if workers == 1:
+        for file_path in file_paths:
+            yield _read_bytes(file_path)
+        return
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for file_path in file_paths:
+            pending.append(executor.submit(_read_bytes, file_path))
+            if len(pending) > workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def _read_bytes(file_path: str) -> Union[bytes, Exception]:
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read()
+    except Exception as e:
+        return e
 
-def save_table(table: TableData, file_path: str, max_rows: Optional[int] = None):
+@instrumented("save_pickle", writes=True)
+def save_table(table: TableData, file_path: str, max_rows: Optional[int] = None,
+               workers: Optional[int] = 1):
     if not table.data and not table.columns:
         raise SaveError("Пустая таблица")
     
     if max_rows is None or len(table.data) <= max_rows:
-        _save_pickle(table, file_path)
+        _save_pickle(table, file_path, 0, len(table.data))
     else:
-        base_name, ext = os.path.splitext(file_path)
-        
-        total_rows = len(table.data)
-        num_files = (total_rows + max_rows - 1) // max_rows
-        
-        for i in range(num_files):
-            start_idx = i * max_rows
-            end_idx = min((i + 1) * max_rows, total_rows)
-            
-            partial_table = TableData(
-                data=table.data[start_idx:end_idx],
-                columns=table.columns
-            )
-            partial_table.column_types = table.column_types.copy()
-            
-            partial_path = f"{base_name}_part{i+1}{ext}"
-            _save_pickle(partial_table, partial_path)
+        save_parts(table, file_path, max_rows, _save_pickle, workers)
 
-def _save_pickle(table: TableData, file_path: str):
+def _save_pickle(table: TableData, file_path: str, start: int, stop: int):
     try:
-        with open(file_path, 'wb') as f:
-            pickle.dump(table, f)
+        if start == 0 and stop == len(table.data):
+            data = table.data
+        elif table.is_columnar:
+            data = table.data.take(range(start, stop))
+        else:
+            data = table.data[start:stop]
+        
+        buffers = []
+        body = io.BytesIO()
+        _ColumnPickler(body, protocol=PROTOCOL, buffer_callback=buffers.append).dump(data)
+        raw_buffers = [buffer.raw() for buffer in buffers]
+        
+        header = {
+            'rows': stop - start,
+            'columns': list(table.columns),
+            'column_types': {k: v for k, v in table.column_types.items() if isinstance(k, int)},
+            'columnar': table.is_columnar,
+            'buffers': [raw.nbytes for raw in raw_buffers],
+            'byteorder': sys.byteorder,
+        }
+        
+        with atomic_open(file_path, 'wb') as f:
+            f.write(MAGIC)
+            pickle.dump(header, f, protocol=PROTOCOL)
+            for raw in raw_buffers:
+                f.write(raw)
+            f.write(body.getbuffer())
     except Exception as e:
-        raise SaveError(f"Ошибка сохранения в {file_path}: {str(e)}")
\ No newline at end of file
+        raise SaveError(f"Ошибка сохранения в {file_path}: {str(e)}")
@@ -0,0 +1,237 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+from .mask import Mask
+from .utils import TableData, manifest_path, part_path
+
+Hook = Callable[['OperationEvent'], Any]
+
+_hooks: List[Hook] = []
+_classes: List[Tuple[type, Dict[str, Callable]]] = []
+_state = threading.local()
+_memory_sessions = 0
+_SUMMARY_WIDTH = 40
+
+
+class OperationEvent:
+    __slots__ = ('name', 'args', 'rows_in', 'rows_out', 'wall', 'cpu',
+                 'bytes_read', 'bytes_written', 'memory_peak', 'depth', 'error')
+
+    def __init__(self, name: str, args: str, depth: int):
+        self.name = name
+        self.args = args
+        self.depth = depth
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.bytes_read: Optional[int] = None
+        self.bytes_written: Optional[int] = None
+        self.memory_peak: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (f"OperationEvent({self.name}({self.args}), rows {self.rows_in}->{self.rows_out}, "
+                f"wall={self.wall:.6f}s, cpu={self.cpu:.6f}s)")
+
+
+def add_hook(hook: Hook) -> Hook:
+    if not _hooks:
+        _swap_methods(True)
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook: Hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+        if not _hooks:
+            _swap_methods(False)
+
+
+@contextmanager
+def profile(hook: Optional[Hook] = None, memory: bool = False) -> Iterator['Profiler']:
+    global _memory_sessions
+    profiler = Profiler()
+    hooks = [profiler] + ([hook] if hook is not None else [])
+    started = memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    if memory:
+        _memory_sessions += 1
+    for item in hooks:
+        add_hook(item)
+    try:
+        yield profiler
+    finally:
+        for item in hooks:
+            remove_hook(item)
+        if memory:
+            _memory_sessions -= 1
+        if started:
+            tracemalloc.stop()
+
+
+def instrumented(name: Optional[str] = None, reads: bool = False, writes: bool = False,
+                 method: bool = False):
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return func(*args, **kwargs)
+            return _run(label, func, args, kwargs, reads, writes, method)
+        return wrapper
+    return decorate
+
+
+def instrument_methods(cls: type) -> type:
+    originals = {attr: value for attr, value in vars(cls).items()
+                 if not attr.startswith('_') and callable(value) and not isinstance(value, type)}
+    _classes.append((cls, originals))
+    if _hooks:
+        _swap_methods(True)
+    return cls
+
+
+def _swap_methods(enabled: bool):
+    for cls, originals in _classes:
+        for attr, func in originals.items():
+            setattr(cls, attr, instrumented(attr, method=True)(func) if enabled else func)
+
+
+def _run(label: str, func: Callable, args: Tuple[Any, ...], kwargs: Dict[str, Any],
+         reads: bool, writes: bool, method: bool) -> Any:
+    depth = getattr(_state, 'depth', 0)
+    event = OperationEvent(label, _summarize(args[1:] if method else args, kwargs), depth)
+    if args and not isinstance(args[0], (str, list, tuple)):
+        event.rows_in = _rows(args[0])
+    if reads:
+        event.bytes_read = sum(_file_size(path) for path in args if isinstance(path, str))
+
+    measure_memory = _memory_sessions > 0 and depth == 0 and tracemalloc.is_tracing()
+    if measure_memory:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+
+    _state.depth = depth + 1
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        event.error = type(e).__name__
+        raise
+    else:
+        event.rows_out = _rows(result)
+        return result
+    finally:
+        event.wall = time.perf_counter() - wall
+        event.cpu = time.process_time() - cpu
+        _state.depth = depth
+        if measure_memory:
+            event.memory_peak = tracemalloc.get_traced_memory()[1] - baseline
+        if writes and len(args) > 1 and isinstance(args[1], str):
+            event.bytes_written = _output_size(args[1])
+        for hook in list(_hooks):
+            hook(event)
+
+
+def _rows(value: Any) -> Optional[int]:
+    if isinstance(value, (list, tuple, Mask)):
+        return len(value)
+    table = getattr(value, 'table', value)
+    if isinstance(table, TableData):
+        return len(table.data)
+    return None
+
+
+def _summarize(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    parts = [_summary(value) for value in args]
+    parts.extend(f"{key}={_summary(value)}" for key, value in kwargs.items())
+    return ", ".join(parts)
+
+
+def _summary(value: Any) -> str:
+    if isinstance(value, (list, tuple, Mask)) and len(value) > 5:
+        return f"{type(value).__name__}[{len(value)}]"
+    rows = _rows(value) if not isinstance(value, (list, tuple, Mask)) else None
+    if rows is not None:
+        return f"{type(value).__name__}[{rows}]"
+    text = repr(value)
+    return text if len(text) <= _SUMMARY_WIDTH else text[:_SUMMARY_WIDTH - 3] + "..."
+
+
+def _file_size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _output_size(file_path: str) -> int:
+    total = _file_size(file_path) + _file_size(manifest_path(file_path))
+    part = 1
+    while os.path.exists(part_path(file_path, part)):
+        total += _file_size(part_path(file_path, part))
+        part += 1
+    return total
+
+
+class Profiler:
+    def __init__(self):
+        self.events: List[OperationEvent] = []
+
+    def __call__(self, event: OperationEvent):
+        self.events.append(event)
+
+    def clear(self):
+        self.events.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        totals: Dict[str, Dict[str, Any]] = {}
+        for event in self.events:
+            entry = totals.setdefault(event.name, {
+                'calls': 0, 'wall': 0.0, 'cpu': 0.0, 'rows_in': 0, 'rows_out': 0,
+                'bytes_read': 0, 'bytes_written': 0, 'memory_peak': None, 'errors': 0,
+            })
+            entry['calls'] += 1
+            entry['wall'] += event.wall
+            entry['cpu'] += event.cpu
+            entry['rows_in'] += event.rows_in or 0
+            entry['rows_out'] += event.rows_out or 0
+            entry['bytes_read'] += event.bytes_read or 0
+            entry['bytes_written'] += event.bytes_written or 0
+            entry['errors'] += event.error is not None
+            if event.memory_peak is not None:
+                entry['memory_peak'] = max(entry['memory_peak'] or 0, event.memory_peak)
+        return dict(sorted(totals.items(), key=lambda item: -item[1]['wall']))
+
+    def total_time(self) -> float:
+        return sum(event.wall for event in self.events if event.depth == 0)
+
+    def report(self) -> str:
+        header = (f"{'Операция':<22} {'Вызовы':>7} {'Время, с':>10} {'CPU, с':>10} "
+                  f"{'Строк вход':>11} {'Строк выход':>12} {'Прочитано':>11} {'Записано':>11} "
+                  f"{'Пик памяти':>11}")
+        lines = [header, "-" * len(header)]
+        for name, entry in self.summary().items():
+            peak = entry['memory_peak']
+            lines.append(
+                f"{name:<22} {entry['calls']:>7} {entry['wall']:>10.4f} {entry['cpu']:>10.4f} "
+                f"{entry['rows_in']:>11} {entry['rows_out']:>12} {entry['bytes_read']:>11} "
+                f"{entry['bytes_written']:>11} {'-' if peak is None else peak:>11}"
+            )
+        lines.append(f"Общее время верхнеуровневых операций: {self.total_time():.4f} с")
+        return "\n".join(lines)
+
+    def print_report(self, stream: Optional[TextIO] = None):
+        print(self.report(), file=stream or sys.stdout)
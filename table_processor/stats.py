@@ -0,0 +1,217 @@
+from math import isnan, log
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from .index import _MISSING, raw_column_values
+from . import vectorized
+
+_SKETCH_BITS = 10
+_SKETCH_SIZE = 1 << _SKETCH_BITS
+_MASK64 = (1 << 64) - 1
+_NUMERIC = {int, float, bool}
+_CAST_KINDS = {int: {int, bool}, float: _NUMERIC, bool: {bool}, str: {str}}
+
+
+def column_stats(table, col_idx: int) -> 'ColumnStats':
+    stats = table._stats.get(col_idx)
+    if stats is None:
+        stats = table._stats[col_idx] = ColumnStats(col_idx)
+    if not stats.is_valid(table):
+        stats.build(table)
+    return stats
+
+
+class ColumnStats:
+    REBUILD_RATIO = 0.25
+
+    def __init__(self, col_idx: int):
+        self.col_idx = col_idx
+        self.min: Any = None
+        self.max: Any = None
+        self.null_count = 0
+        self.count = 0
+        self.width = 0
+        self.kinds: set = set()
+        self.ordered = True
+        self.stale = False
+        self._registers: Optional[bytearray] = bytearray(_SKETCH_SIZE)
+        self._drift = 0
+        self._data = None
+        self._length = -1
+        self._version = -1
+
+    def is_valid(self, table) -> bool:
+        return (not self.stale
+                and table.is_columnar
+                and self._data is table.data
+                and self._length == len(table.data)
+                and self._version == table.column_version(self.col_idx))
+
+    def build(self, table, values: Optional[List[Any]] = None):
+        if values is None:
+            values = raw_column_values(table, self.col_idx)
+        self.min = self.max = None
+        self.null_count = self.count = self.width = 0
+        self.kinds = set()
+        self.ordered = True
+        self.stale = False
+        self._registers = bytearray(_SKETCH_SIZE)
+        self._drift = 0
+        self._add(values)
+        self._mark_valid(table)
+
+    def refresh(self, table, old_values: List[Any]):
+        new_values = raw_column_values(table, self.col_idx)
+        if len(old_values) != len(new_values):
+            self.build(table, new_values)
+            return
+        changed = [i for i, (old, new) in enumerate(zip(old_values, new_values))
+                   if old is not new and old != new]
+        if len(changed) > len(new_values) * self.REBUILD_RATIO:
+            self.build(table, new_values)
+            return
+        removed = [old_values[i] for i in changed]
+        if self._touches_bounds(removed):
+            self.stale = True
+            return
+        self._remove(removed)
+        self._add([new_values[i] for i in changed])
+        self._drift += len(changed)
+        if self._drift > len(new_values) * self.REBUILD_RATIO:
+            self.stale = True
+            return
+        self._mark_valid(table)
+
+    def extend(self, table, values: List[Any]):
+        self._add(values)
+        self._mark_valid(table)
+
+    @property
+    def distinct(self) -> Optional[int]:
+        if self._registers is None:
+            return None
+        if self.count == 0:
+            return 0
+        total = sum(2.0 ** -rank for rank in self._registers)
+        estimate = 0.7213 / (1 + 1.079 / _SKETCH_SIZE) * _SKETCH_SIZE ** 2 / total
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * _SKETCH_SIZE and zeros:
+            estimate = _SKETCH_SIZE * log(_SKETCH_SIZE / zeros)
+        return max(1, min(self.count, round(estimate)))
+
+    def decide(self, op_name: str, operand: Any, col_type: Optional[type] = None) -> Optional[bool]:
+        if self.null_count or not self.ordered or not self.count:
+            return None
+        if col_type is not None and not self.kinds <= _CAST_KINDS.get(col_type, set()):
+            return None
+        if not (type(operand) in _NUMERIC and self.kinds <= _NUMERIC
+                or type(operand) is str and self.kinds == {str}) or operand != operand:
+            return None
+
+        low, high = self.min, self.max
+        if op_name in ('eq', 'ne'):
+            if operand < low or operand > high:
+                return op_name == 'ne'
+            if low == high == operand:
+                return op_name == 'eq'
+        elif op_name == 'gr':
+            return False if operand >= high else True if operand < low else None
+        elif op_name == 'ls':
+            return False if operand <= low else True if operand > high else None
+        elif op_name == 'ge':
+            return False if operand > high else True if operand <= low else None
+        elif op_name == 'le':
+            return False if operand < low else True if operand >= high else None
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'min': self.min,
+            'max': self.max,
+            'null_count': self.null_count,
+            'distinct': self.distinct,
+            'width': self.width,
+        }
+
+    def _add(self, values: Sequence[Any]):
+        present = [value for value in values if value is not _MISSING]
+        if not present:
+            return
+        if len(present) < len(values):
+            self.null_count += len(values) - len(present)
+
+        kinds = set(map(type, present))
+        non_null = present
+        if type(None) in kinds:
+            kinds.discard(type(None))
+            non_null = [value for value in present if value is not None]
+            self.null_count += len(present) - len(non_null)
+        self.kinds |= kinds
+        self.count += len(non_null)
+
+        low = high = None
+        if non_null and self.ordered:
+            try:
+                if float in kinds and any(map(isnan, non_null)):
+                    raise TypeError
+                low, high = min(non_null), max(non_null)
+                self.min = low if self.min is None else min(self.min, low)
+                self.max = high if self.max is None else max(self.max, high)
+            except (TypeError, OverflowError):
+                self.ordered = False
+                self.min = self.max = None
+
+        if kinds == {int} and low is not None:
+            width = max(len(str(low)), len(str(high)))
+        elif kinds == {bool}:
+            width = 5 if False in non_null else 4
+        else:
+            width = max(map(len, map(str, non_null)), default=0)
+        if len(non_null) < len(present):
+            width = max(width, len("None"))
+        self.width = max(self.width, width)
+
+        if self._registers is not None:
+            try:
+                self._sketch(non_null)
+            except TypeError:
+                self._registers = None
+
+    def _remove(self, values: Sequence[Any]):
+        for value in values:
+            if value is _MISSING or value is None:
+                self.null_count -= 1
+            else:
+                self.count -= 1
+
+    def _touches_bounds(self, values: Iterable[Any]) -> bool:
+        for value in values:
+            if value is _MISSING:
+                continue
+            if value is not None and self.ordered and (value == self.min or value == self.max):
+                return True
+            if len(str(value)) >= self.width:
+                return True
+        return False
+
+    def _sketch(self, values: Sequence[Any]):
+        hashes = list(map(hash, values))
+        registers = vectorized.sketch_registers(hashes, _SKETCH_BITS)
+        if registers is not None:
+            for slot, rank in enumerate(registers):
+                if rank > self._registers[slot]:
+                    self._registers[slot] = rank
+            return
+        for h in hashes:
+            h = (h & _MASK64) * 0x9E3779B97F4A7C15 & _MASK64
+            h ^= h >> 29
+            slot = h & (_SKETCH_SIZE - 1)
+            rank = 64 - _SKETCH_BITS - (h >> _SKETCH_BITS).bit_length() + 1
+            if rank > self._registers[slot]:
+                self._registers[slot] = rank
+
+    def _mark_valid(self, table):
+        self._data = table.data
+        self._length = len(table.data)
+        self._version = table.column_version(self.col_idx)
+
+    def __repr__(self) -> str:
+        return f"ColumnStats(column={self.col_idx}, {self.to_dict()})"
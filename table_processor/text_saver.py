@@ -1,45 +1,97 @@
-from typing import Optional
-from .utils import TableData, SaveError
+from typing import Any, Iterator, List, Optional, Sequence, TextIO
+from .columnar import ColumnarRows, column_to_list
+from .stats import column_stats
+from .utils import TableData, TableError, SaveError, atomic_open
+from .profiling import instrumented
 
-def save_table(table: TableData, file_path: str):
+RENDER_BATCH = 4096
+
+@instrumented("save_text", writes=True)
+def save_table(table: TableData, file_path: str, head: Optional[int] = None,
+               tail: Optional[int] = None, page_rows: Optional[int] = None):
     if not table.data and not table.columns:
         raise SaveError("Пустая таблица")
     
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            text_repr = _table_to_text(table)
-            f.write(text_repr)
+        with atomic_open(file_path, 'w', encoding='utf-8') as f:
+            write_table(table, f, head=head, tail=tail, page_rows=page_rows)
     except Exception as e:
         raise SaveError(f"Ошибка сохранения в {file_path}: {str(e)}")
 
-def _table_to_text(table: TableData) -> str:
+def write_table(table: TableData, stream: TextIO, head: Optional[int] = None,
+                tail: Optional[int] = None, page_rows: Optional[int] = None, end: str = ""):
     if not table.columns:
-        return "Пустая таблица\n"
+        stream.write("Пустая таблица\n")
+        return
     
-    col_widths = []
-    for i, col in enumerate(table.columns):
-        max_width = len(str(col))
-        
-        for row in table.data:
-            if i < len(row):
-                max_width = max(max_width, len(str(row[i])))
-        
-        col_widths.append(max_width + 2)
+    for name, value, minimum in (("head", head, 0), ("tail", tail, 0), ("page_rows", page_rows, 1)):
+        if value is not None and (not isinstance(value, int) or value < minimum):
+            raise TableError(f"Некорректное значение {name}: {value}")
     
-    lines = []
+    total = len(table.data)
+    if head is None and tail is None:
+        segments = [(0, total)]
+    else:
+        head_stop = min(head or 0, total)
+        tail_start = max(total - (tail or 0), head_stop)
+        segments = [(0, head_stop), (tail_start, total)]
     
-    header = " | ".join(str(col).ljust(col_widths[i]) 
-                       for i, col in enumerate(table.columns))
-    lines.append(header)
-    lines.append("-" * len(header))
+    if segments == [(0, total)] or segments[0][1] == segments[1][0]:
+        segments = [(0, total)]
+    if segments == [(0, total)] and table.is_columnar:
+        widths = _cached_widths(table)
+    else:
+        widths = _measure_widths(table, segments)
     
-    for row in table.data:
-        row_str = " | ".join(
-            str(row[i] if i < len(row) else "").ljust(col_widths[i])
-            for i in range(len(table.columns))
-        )
-        lines.append(row_str)
+    header = " | ".join(str(col).ljust(widths[i]) for i, col in enumerate(table.columns))
+    separator = "-" * len(header)
+    stream.write(f"{header}\n{separator}\n")
     
-    lines.append(f"\nВсего строк: {len(table.data)}, столбцов: {len(table.columns)}")
+    written = 0
+    for segment_idx, (start, stop) in enumerate(segments):
+        if segment_idx:
+            stream.write("...\n")
+        for rows in _iter_batches(table.data, start, stop):
+            lines = []
+            for row in rows:
+                if page_rows and written and written % page_rows == 0:
+                    lines.append(f"\n{header}\n{separator}")
+                lines.append(_format_row(row, widths))
+                written += 1
+            lines.append("")
+            stream.write("\n".join(lines))
     
-    return "\n".join(lines)
\ No newline at end of file
+    stream.write(f"\nВсего строк: {total}, столбцов: {len(table.columns)}{end}")
+
+def _format_row(row: Sequence[Any], widths: List[int]) -> str:
+    if len(row) == len(widths):
+        return " | ".join(map(str.ljust, map(str, row), widths))
+    return " | ".join(
+        str(row[i] if i < len(row) else "").ljust(widths[i])
+        for i in range(len(widths))
+    )
+
+def _iter_batches(data: Any, start: int, stop: int) -> Iterator[Sequence[Sequence[Any]]]:
+    for offset in range(start, stop, RENDER_BATCH):
+        end = min(offset + RENDER_BATCH, stop)
+        if isinstance(data, ColumnarRows):
+            columns = [column_to_list(column[offset:end]) for column in data.columns]
+            yield list(zip(*columns)) if columns else [()] * (end - offset)
+        else:
+            yield data[offset:end]
+
+def _cached_widths(table: TableData) -> List[int]:
+    return [max(len(str(col)), column_stats(table, col_idx).width) + 2
+            for col_idx, col in enumerate(table.columns)]
+
+def _measure_widths(table: TableData, segments: List[tuple]) -> List[int]:
+    return [max([len(str(col))] + [_cell_width(table, col_idx, start, stop)
+                                   for start, stop in segments]) + 2
+            for col_idx, col in enumerate(table.columns)]
+
+def _cell_width(table: TableData, col_idx: int, start: int, stop: int) -> int:
+    if isinstance(table.data, ColumnarRows):
+        values = column_to_list(table.data.column(col_idx)[start:stop])
+    else:
+        values = [row[col_idx] for row in table.data[start:stop] if col_idx < len(row)]
+    return max(map(len, map(str, values)), default=0)
@@ -1,5 +1,13 @@
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Callable, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from contextlib import contextmanager
 import copy
+import json
+import os
+import uuid
+from .columnar import ColumnarRows
+from .cache import ColumnCache
 
 class TableError(Exception):
     pass
@@ -16,24 +24,182 @@ class ColumnError(TableError):
 class OperationError(TableError):
     pass
 
+def resolve_workers(workers: Optional[int], tasks: int, error: type = TableError) -> int:
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int) or workers < 1:
+        raise error(f"Некорректное количество рабочих процессов: {workers}")
+    return max(1, min(workers, tasks))
+
+@contextmanager
+def atomic_open(file_path: str, mode: str = 'w', **kwargs):
+    directory, name = os.path.split(os.path.abspath(file_path))
+    temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def part_ranges(total_rows: int, max_rows: int) -> List[Tuple[int, int]]:
+    if max_rows <= 0:
+        raise SaveError(f"Некорректное количество строк в файле: {max_rows}")
+    return [(start, min(start + max_rows, total_rows))
+            for start in range(0, total_rows, max_rows)]
+
+def manifest_path(file_path: str) -> str:
+    return f"{file_path}.manifest.json"
+
+def part_path(file_path: str, part: int) -> str:
+    base_name, ext = os.path.splitext(file_path)
+    return f"{base_name}_part{part}{ext}"
+
+def save_parts(table: 'TableData', file_path: str, max_rows: int,
+               write_part: Callable[['TableData', str, int, int], None],
+               workers: Optional[int] = 1) -> List[str]:
+    ranges = part_ranges(len(table.data), max_rows)
+    part_paths = [part_path(file_path, i + 1) for i in range(len(ranges))]
+    workers = resolve_workers(workers, len(ranges), SaveError)
+    
+    if workers == 1:
+        for path, (start, stop) in zip(part_paths, ranges):
+            write_part(table, path, start, stop)
+    else:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                for path, (start, stop) in zip(part_paths, ranges):
+                    part = _part_table(table, start, stop)
+                    pending.append(executor.submit(write_part, part, path, 0, stop - start))
+                    if len(pending) > workers:
+                        pending.popleft().result()
+                while pending:
+                    pending.popleft().result()
+        except SaveError:
+            raise
+        except Exception as e:
+            raise SaveError(f"Ошибка параллельного сохранения: {str(e)}")
+    
+    write_manifest(file_path, table.columns, part_paths, [stop - start for start, stop in ranges])
+    return part_paths
+
+def write_manifest(file_path: str, columns: List[str], part_paths: List[str], part_rows: List[int]):
+    manifest = {
+        'columns': list(columns),
+        'rows': sum(part_rows),
+        'parts': [{'path': os.path.basename(path), 'rows': rows}
+                  for path, rows in zip(part_paths, part_rows)],
+    }
+    try:
+        with atomic_open(manifest_path(file_path), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        raise SaveError(f"Ошибка сохранения манифеста {manifest_path(file_path)}: {str(e)}")
+
+def _part_table(table: 'TableData', start: int, stop: int) -> 'TableData':
+    if table.is_columnar:
+        data = table.data.take(range(start, stop))
+    else:
+        data = list(table.data[start:stop])
+    part = TableData(data, table.columns)
+    part.column_types = table.column_types.copy()
+    return part
+
 class TableData:
     def __init__(self, data: Optional[List[List[Any]]] = None, 
-                 columns: Optional[List[str]] = None):
+                 columns: Optional[List[str]] = None, columnar: bool = False,
+                 column_types: Optional[Dict[Union[int, str], type]] = None):
         self.data = data if data is not None else []
         self.columns = columns if columns is not None else []
         self.column_types: Dict[Union[int, str], type] = {}
+        self._init_transient()
+        
+        if column_types:
+            for key, col_type in column_types.items():
+                col_idx = key if isinstance(key, int) else self.columns.index(key)
+                self.column_types[col_idx] = col_type
+                self.column_types[self.columns[col_idx]] = col_type
+        
+        if columnar and not isinstance(self.data, ColumnarRows):
+            self.data = ColumnarRows.from_rows(self.data, len(self.columns))
         
         if self.data and self.columns:
             self._infer_column_types()
     
+    def _init_transient(self):
+        self._indexes: Dict[int, Any] = {}
+        self._sorted_indexes: Dict[int, Any] = {}
+        self._stats: Dict[int, Any] = {}
+        self._validity: Dict[int, Any] = {}
+        self._value_cache = ColumnCache()
+        self._versions: Dict[int, int] = {}
+        self._parent: Optional['TableData'] = None
+    
+    def column_version(self, col_idx: int) -> int:
+        version = 0
+        table = self
+        while table is not None:
+            version += table._versions.get(col_idx, 0)
+            table = table._parent
+        return version
+    
+    def _touch(self, col_idx: int):
+        table = self
+        while table is not None:
+            table._versions[col_idx] = table._versions.get(col_idx, 0) + 1
+            table = table._parent
+    
+    def close(self):
+        close = getattr(getattr(self.data, 'columns', None), 'close', None)
+        if close is not None:
+            close()
+    
+    def __enter__(self) -> 'TableData':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in ('_indexes', '_sorted_indexes', '_stats', '_validity', '_value_cache', '_versions', '_parent'):
+            state.pop(name, None)
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_transient()
+    
+    @property
+    def is_columnar(self) -> bool:
+        return isinstance(self.data, ColumnarRows)
+    
+    def to_columnar(self) -> 'TableData':
+        if self.is_columnar:
+            return self
+        result = TableData(ColumnarRows.from_rows(self.data, len(self.columns)), self.columns)
+        result.column_types = self.column_types.copy()
+        return result
+    
+    def to_rows(self) -> 'TableData':
+        if not self.is_columnar:
+            return self
+        result = TableData(self.data.to_rows(), self.columns)
+        result.column_types = self.column_types.copy()
+        return result
+    
     def _infer_column_types(self):
         if not self.data:
             return
             
         for col_idx in range(len(self.columns)):
-            for row in self.data:
-                if col_idx < len(row) and row[col_idx] is not None:
-                    value = row[col_idx]
+            if col_idx in self.column_types:
+                continue
+            for value in self._iter_column(col_idx):
+                if value is not None:
                     if isinstance(value, (int, float, bool, str)):
                         self.column_types[col_idx] = type(value)
                         self.column_types[self.columns[col_idx]] = type(value)
@@ -45,6 +211,11 @@ class TableData:
                 self.column_types[col_idx] = str
                 self.column_types[self.columns[col_idx]] = str
     
+    def _iter_column(self, col_idx: int):
+        if self.is_columnar:
+            return (self.data.get_cell(i, col_idx) for i in range(len(self.data)))
+        return (row[col_idx] for row in self.data if col_idx < len(row))
+    
     def __len__(self):
         return len(self.data)
     
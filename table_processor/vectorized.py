@@ -0,0 +1,310 @@
+from array import array
+from typing import Any, List, Optional, Tuple
+from .columnar import NullableColumn
+from .utils import OperationError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+MIN_VECTOR_ROWS = 64
+
+_BUFFER_DTYPES = {'q': 'int64', 'd': 'float64', 'b': 'int8'}
+_INT_SAFE_BOUNDS = {'add': 2 ** 62, 'sub': 2 ** 62, 'mul': 2 ** 31}
+_SCALAR_BOUND = 2 ** 62
+
+if HAS_NUMPY:
+    _ARITHMETIC = {
+        'add': np.add,
+        'sub': np.subtract,
+        'mul': np.multiply,
+        'div': np.true_divide,
+    }
+    _EXPRESSION_ARITHMETIC = {
+        '+': np.add,
+        '-': np.subtract,
+        '*': np.multiply,
+        '/': np.true_divide,
+        '//': np.floor_divide,
+        '%': np.mod,
+    }
+    _EXPRESSION_COMPARISON = {
+        '==': np.equal,
+        '!=': np.not_equal,
+        '>': np.greater,
+        '<': np.less,
+        '>=': np.greater_equal,
+        '<=': np.less_equal,
+    }
+    _COMPARISON = {
+        'eq': np.equal,
+        'ne': np.not_equal,
+        'gr': np.greater,
+        'ls': np.less,
+        'ge': np.greater_equal,
+        'le': np.less_equal,
+    }
+
+
+def _to_vector(operand: Any):
+    if isinstance(operand, NullableColumn):
+        operand = operand.values
+    if isinstance(operand, array):
+        vector = np.frombuffer(operand, dtype=_BUFFER_DTYPES[operand.typecode])
+        return vector.astype(np.int64) if operand.typecode == 'b' else vector
+    if isinstance(operand, list):
+        vector = np.asarray(operand)
+        if vector.dtype.kind == 'b':
+            return vector.astype(np.int64)
+        return vector if vector.dtype.kind in 'iuf' else None
+    if isinstance(operand, bool):
+        return int(operand)
+    if isinstance(operand, int):
+        return operand if -_SCALAR_BOUND < operand < _SCALAR_BOUND else None
+    if isinstance(operand, float):
+        return operand
+    return None
+
+
+def _prepare(operand1: Any, operand2: Any):
+    if not HAS_NUMPY or len(operand1) < MIN_VECTOR_ROWS:
+        return None
+    left = _to_vector(operand1)
+    if left is None or not isinstance(left, np.ndarray):
+        return None
+    right = _to_vector(operand2)
+    if right is None:
+        return None
+    if isinstance(right, np.ndarray) and right.shape != left.shape:
+        return None
+    return left, right
+
+
+def _ints_fit(vector: Any, bound: int) -> bool:
+    if isinstance(vector, np.ndarray):
+        if vector.dtype.kind == 'f':
+            return True
+        return bool(vector.min() > -bound and vector.max() < bound)
+    return isinstance(vector, float) or -bound < vector < bound
+
+
+def arithmetic(operand1: Any, operand2: Any, op_name: str,
+               validity: Optional[bytes] = None) -> Optional[List[Any]]:
+    prepared = _prepare(operand1, operand2)
+    if prepared is None:
+        return None
+    left, right = prepared
+
+    bound = _INT_SAFE_BOUNDS.get(op_name)
+    if bound is not None and not (_ints_fit(left, bound) and _ints_fit(right, bound)):
+        return None
+
+    valid = None
+    if validity is not None:
+        valid = np.unpackbits(np.frombuffer(validity, dtype=np.uint8), count=len(left),
+                              bitorder='little').view(np.bool_)
+        if op_name == 'div' and isinstance(right, np.ndarray):
+            right = np.where(valid, right, 1)
+
+    if op_name == 'div' and np.any(np.equal(right, 0)):
+        raise OperationError(f"Ошибка операции {op_name}: Деление на ноль")
+
+    return to_list(_ARITHMETIC[op_name](left, right), valid)
+
+
+def to_list(values: Any, valid: Optional[Any] = None) -> List[Any]:
+    if valid is None:
+        return values.tolist()
+    values = values.astype(object)
+    values[~valid] = None
+    return values.tolist()
+
+
+def pack_bools(values: Any) -> bytes:
+    return np.packbits(values, bitorder='little').tobytes()
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def evaluate(tree: Tuple[Any, ...], operands: List[Any], length: int) -> Optional[Tuple[Any, Any]]:
+    if not HAS_NUMPY or length < MIN_VECTOR_ROWS:
+        return None
+    columns = []
+    for operand in operands:
+        column = _expression_column(operand)
+        if column is None:
+            return None
+        columns.append(column)
+    try:
+        values, valid = _evaluate(tree, columns, length)
+    except _Unsupported:
+        return None
+    if np.ndim(values) == 0:
+        values = np.full(length, values)
+    return values, valid
+
+
+def _expression_column(operand: Any) -> Optional[Tuple[Any, Any]]:
+    valid = None
+    if isinstance(operand, NullableColumn):
+        valid = np.unpackbits(np.frombuffer(operand.validity, dtype=np.uint8), count=len(operand),
+                              bitorder='little').view(np.bool_)
+        operand = operand.values
+    if isinstance(operand, array):
+        vector = np.frombuffer(operand, dtype=_BUFFER_DTYPES[operand.typecode])
+        return (vector.astype(np.bool_) if operand.typecode == 'b' else vector), valid
+    vector = np.asarray(operand)
+    return (vector, None) if vector.dtype.kind in 'bif' else None
+
+
+def _evaluate(node: Tuple[Any, ...], columns: List[Tuple[Any, Any]], length: int) -> Tuple[Any, Any]:
+    kind = node[0]
+    if kind == 'col':
+        return columns[node[1]]
+    if kind == 'const':
+        value = node[2]
+        if not isinstance(value, (bool, int, float)) or \
+                isinstance(value, int) and not -_SCALAR_BOUND < value < _SCALAR_BOUND:
+            raise _Unsupported()
+        return value, None
+
+    if kind == 'null':
+        values, valid = _evaluate(node[1], columns, length)
+        present = np.ones(length, dtype=np.bool_) if valid is None else valid
+        return (present if node[2] else ~present), None
+    if kind == 'not':
+        return np.logical_not(_truth(*_evaluate(node[1], columns, length))), None
+    if kind in ('and', 'or'):
+        left = _truth(*_evaluate(node[1], columns, length))
+        right = _truth(*_evaluate(node[2], columns, length))
+        return (np.logical_and if kind == 'and' else np.logical_or)(left, right), None
+    if kind == 'neg':
+        values, valid = _evaluate(node[1], columns, length)
+        values = _numeric(values)
+        if not _ints_fit(values, _SCALAR_BOUND):
+            raise _Unsupported()
+        return np.negative(values), valid
+
+    op = node[1]
+    left, left_valid = _evaluate(node[2], columns, length)
+    right, right_valid = _evaluate(node[3], columns, length)
+    valid = _combine(left_valid, right_valid)
+    if kind == 'cmp':
+        result = _EXPRESSION_COMPARISON[op](left, right)
+        return (result if valid is None else result & valid), None
+
+    left, right = _numeric(left), _numeric(right)
+    bound = _INT_SAFE_BOUNDS.get({'+': 'add', '-': 'sub', '*': 'mul'}.get(op))
+    if bound is not None and not (_ints_fit(left, bound) and _ints_fit(right, bound)):
+        raise _Unsupported()
+    if op in ('/', '//', '%'):
+        if valid is not None and isinstance(right, np.ndarray):
+            right = np.where(valid, right, 1)
+        if np.any(np.equal(right, 0)):
+            raise ZeroDivisionError()
+    return _EXPRESSION_ARITHMETIC[op](left, right), valid
+
+
+def _numeric(values: Any) -> Any:
+    if isinstance(values, np.ndarray):
+        return values.astype(np.int64) if values.dtype.kind == 'b' else values
+    return int(values) if isinstance(values, bool) else values
+
+
+def _truth(values: Any, valid: Optional[Any]) -> Any:
+    return values if valid is None else np.logical_and(values, valid)
+
+
+def _combine(left: Optional[Any], right: Optional[Any]) -> Optional[Any]:
+    if left is None or right is None:
+        return left if right is None else right
+    return left & right
+
+
+def compare(operand1: Any, operand2: Any, op_name: str) -> Optional[List[bool]]:
+    prepared = _prepare(operand1, operand2)
+    if prepared is None:
+        return None
+    left, right = prepared
+    return _COMPARISON[op_name](left, right).tolist()
+
+
+def compare_packed(operand1: Any, operand2: Any, op_name: str) -> Optional[bytes]:
+    prepared = _prepare(operand1, operand2)
+    if prepared is None:
+        return None
+    left, right = prepared
+    return np.packbits(_COMPARISON[op_name](left, right), bitorder='little').tobytes()
+
+
+def unpack_indices(packed: bytes, length: int) -> Optional[List[int]]:
+    if not HAS_NUMPY or length < MIN_VECTOR_ROWS:
+        return None
+    flags = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=length, bitorder='little')
+    return np.flatnonzero(flags).tolist()
+
+
+def sketch_registers(hashes: Any, bits: int) -> Optional[Any]:
+    if not HAS_NUMPY or len(hashes) < MIN_VECTOR_ROWS:
+        return None
+    mixed = np.fromiter(hashes, dtype=np.int64, count=len(hashes)).view(np.uint64)
+    mixed = mixed * np.uint64(0x9E3779B97F4A7C15)
+    mixed ^= mixed >> np.uint64(29)
+    slots = (mixed & np.uint64((1 << bits) - 1)).astype(np.intp)
+    rest = mixed >> np.uint64(bits)
+    ranks = np.full(len(rest), 64 - bits + 1, dtype=np.uint8)
+    nonzero = rest > 0
+    lengths = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64) + 1
+    ranks[nonzero] = 64 - bits - np.minimum(lengths, 64 - bits) + 1
+    registers = np.zeros(1 << bits, dtype=np.uint8)
+    np.maximum.at(registers, slots, ranks)
+    return registers.tobytes()
+
+
+def group_ids(ids: List[int]) -> Optional[Any]:
+    if not HAS_NUMPY or len(ids) < MIN_VECTOR_ROWS:
+        return None
+    return np.asarray(ids, dtype=np.intp)
+
+
+def group_vector(values: Any) -> Optional[Any]:
+    if not HAS_NUMPY or len(values) < MIN_VECTOR_ROWS:
+        return None
+    if isinstance(values, array):
+        vector = np.frombuffer(values, dtype=_BUFFER_DTYPES[values.typecode])
+        return vector.astype(np.bool_) if values.typecode == 'b' else vector
+    vector = np.asarray(values)
+    return vector if vector.dtype.kind in 'bif' else None
+
+
+def group_reduce(ids: Any, groups: int, vector: Any, func: str) -> Optional[List[Any]]:
+    if func == 'count':
+        return np.bincount(ids, minlength=groups).tolist()
+
+    if vector.dtype.kind == 'b':
+        if func in ('min', 'max'):
+            return None
+        vector = vector.astype(np.int64)
+
+    is_float = vector.dtype.kind == 'f'
+    if func == 'sum':
+        if is_float:
+            return np.bincount(ids, weights=vector, minlength=groups).tolist()
+        if len(vector) and int(np.abs(vector).max()) * len(vector) >= _SCALAR_BOUND:
+            return None
+        totals = np.zeros(groups, dtype=np.int64)
+        np.add.at(totals, ids, vector)
+        return totals.tolist()
+
+    if func == 'min':
+        result = np.full(groups, np.inf if is_float else np.iinfo(np.int64).max, dtype=vector.dtype)
+        np.minimum.at(result, ids, vector)
+    else:
+        result = np.full(groups, -np.inf if is_float else np.iinfo(np.int64).min, dtype=vector.dtype)
+        np.maximum.at(result, ids, vector)
+    return result.tolist()
@@ -0,0 +1,94 @@
+from array import array
+from typing import Any, Iterable, Iterator, List, Sequence, Union
+from .columnar import ColumnarRows
+
+Positions = Union[range, List[int]]
+
+
+def _compose(outer: Positions, inner: Positions) -> Positions:
+    if isinstance(outer, range) and isinstance(inner, range) and inner.step > 0:
+        return outer[inner.start:inner.stop:inner.step]
+    return [outer[i] for i in inner]
+
+
+class RowSelection:
+    def __init__(self, base: Sequence[Any], positions: Positions):
+        self.base = base
+        self.positions = positions
+        self._owns_base = False
+
+    def select(self, positions: Positions) -> 'RowSelection':
+        return RowSelection(self.base, _compose(self.positions, positions))
+
+    def column_values(self, col: int) -> List[Any]:
+        if isinstance(self.base, ColumnarRows):
+            column = self.base.column(col)
+            values = [column[p] for p in self.positions]
+            if isinstance(column, array) and column.typecode == 'b':
+                return [value != 0 for value in values]
+            return values
+        return [row[col] for row in self if col < len(row)]
+
+    def set_cell(self, i: int, col: int, value: Any):
+        if isinstance(self.base, ColumnarRows):
+            self.base.set_cell(self.positions[i], col, value)
+            return
+        row = self.base[self.positions[i]]
+        while len(row) <= col:
+            row.append(None)
+        row[col] = value
+
+    def set_column(self, col: int, values: Sequence[Any]):
+        for i, value in enumerate(values):
+            self.set_cell(i, col, value)
+
+    def append(self, row: Any):
+        self._own_base()
+        self.base.append(row)
+        self.positions = range(len(self.base))
+
+    def extend(self, rows: Iterable[Any]):
+        self._own_base()
+        self.base.extend(rows)
+        self.positions = range(len(self.base))
+
+    def _own_base(self):
+        if not self._owns_base:
+            self.base = list(self)
+            self._owns_base = True
+
+    def copy(self) -> List[Any]:
+        return list(self)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return self.select(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Индекс строки вне диапазона")
+        return self.base[self.positions[index]]
+
+    def __iter__(self) -> Iterator[Any]:
+        base = self.base
+        for p in self.positions:
+            yield base[p]
+
+    def __bool__(self) -> bool:
+        return len(self.positions) > 0
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (RowSelection, list, tuple, ColumnarRows)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        return (list, ([list(row) for row in self],))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
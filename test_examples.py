@@ -1,10 +1,15 @@
+import json
 import os
+import pickle
+from array import array
 from table_processor import (
-    TableProcessor, TableData,
-    load_csv, save_csv,
+    TableProcessor, TableData, Mask, profile, add_hook, remove_hook,
+    load_csv, save_csv, iter_csv,
     load_pickle, save_pickle,
-    save_text
+    load_binary, save_binary,
+    save_text, open_dataset, TableError, ColumnError, OperationError, LoadError, SaveError
 )
+from benchmarks import generate_table, run_benchmarks, compare_results
 
 def test_basic_operations():
     print("=== Тест базовых операций ===")
@@ -117,7 +122,7 @@ def test_multiple_files():
     files = ["multi_test_part1.csv", "multi_test_part2.csv", "multi_test_part3.csv"]
     print(f"Создано файлов: {len(files)}")
     
-    for file in files:
+    for file in files + ["multi_test.csv.manifest.json"]:
         if os.path.exists(file):
             os.remove(file)
     
@@ -158,6 +163,1045 @@ def test_exceptions():
     
     return True
 
+def test_columnar_layout():
+    print("\n=== Тест колоночного хранения ===")
+    
+    data = [
+        [1, "Alice", 25, 50000.5, True],
+        [2, "Bob", 30, 60000.0, False],
+        [3, "Charlie", 35, 75000.75, True]
+    ]
+    columns = ["id", "name", "age", "salary", "active"]
+    
+    table = TableData(data, columns, columnar=True)
+    processor = TableProcessor(table)
+    processor.print_table()
+    
+    processor.add("age", 5)
+    print("После add(5):", processor.get_values("age"))
+    
+    view = processor.get_rows_by_number(0, 2)
+    view.set_values([100, 200], "id")
+    print("Столбец id после изменения через представление:", processor.get_values("id"))
+    
+    copied = processor.get_rows_by_index(3, copy_table=True)
+    copied.set_value("Changed", "name")
+    
+    save_csv(table, "columnar_test.csv")
+    loaded = load_csv("columnar_test.csv")
+    os.remove("columnar_test.csv")
+    
+    return (processor.get_values("age") == [30, 35, 40]
+            and processor.get_values("id") == [100, 200, 3]
+            and processor.get_values("active") == [True, False, True]
+            and processor.get_values("name")[2] == "Charlie"
+            and loaded.data == table.data.to_rows())
+
+def test_vectorized_operations():
+    print("\n=== Тест векторизованных операций ===")
+    from table_processor import vectorized
+    
+    data = [[i, i * 0.5, i % 3 == 0] for i in range(200)]
+    columns = ["a", "b", "flag"]
+    
+    def run(use_numpy, columnar):
+        saved = vectorized.HAS_NUMPY
+        vectorized.HAS_NUMPY = saved and use_numpy
+        try:
+            processor = TableProcessor(TableData([row[:] for row in data], columns, columnar=columnar))
+            processor.add("a", "flag").mul("b", 3).div("a", 4.0, "b")
+            mask = processor.ge("b", 10.0)
+            try:
+                processor.div("a", 0.0)
+                return None
+            except OperationError:
+                pass
+            return processor.get_values("a"), processor.get_values("b"), mask, processor.get_column_types()
+        finally:
+            vectorized.HAS_NUMPY = saved
+    
+    expected = run(False, False)
+    print("NumPy доступен:", vectorized.HAS_NUMPY)
+    return expected is not None and all(
+        run(use_numpy, columnar) == expected
+        for use_numpy in (True, False) for columnar in (True, False)
+    )
+
+def test_hash_index():
+    print("\n=== Тест хеш-индекса ===")
+    
+    def run(columnar):
+        data = [[i % 10, f"name{i}", i] for i in range(50)]
+        table = TableData(data, ["key", "name", "value"], columnar=columnar)
+        processor = TableProcessor(table)
+        
+        found = processor.get_rows_by_index(3, 1)
+        print("Строки с ключами 3 и 1:", found.get_values("value"))
+        
+        processor.add("key", 100)
+        after_add = processor.get_rows_by_index(103).get_values("value")
+        print("После add(100), ключ 103:", after_add)
+        
+        view = processor.get_rows_by_number(0, 5)
+        view.set_values([7, 7, 7, 7, 7], "key")
+        after_view = processor.get_rows_by_index(7).get_values("value")
+        print("После изменения через представление, ключ 7:", after_view)
+        
+        processor.create_index("name")
+        by_name = processor.get_rows_by_index("name42", "name4", column="name").get_values("value")
+        print("Поиск по индексу столбца name:", by_name)
+        
+        return (found.get_values("value") == [1, 3, 11, 13, 21, 23, 31, 33, 41, 43]
+                and after_add == [3, 13, 23, 33, 43]
+                and after_view == [0, 1, 2, 3, 4]
+                and by_name == [4, 42])
+    
+    rows = TableData([[1, "a"], [2, "b"], [3, "c"]], ["id", "name"])
+    rows_processor = TableProcessor(rows)
+    rows_processor.get_rows_by_index(2)
+    rows.data[1][0] = 20
+    old_key = rows_processor.get_rows_by_index(2).get_values("name")
+    new_key = rows_processor.get_rows_by_index(20).get_values("name")
+    print("После прямого изменения ключа:", old_key, new_key)
+    
+    return run(False) and run(True) and old_key == [] and new_key == ["b"]
+
+def test_streaming_csv():
+    print("\n=== Тест потокового чтения CSV ===")
+    
+    data = [[i, f"item{i}", i * 1.5] for i in range(25)]
+    table = TableData(data, ["id", "name", "price"])
+    save_csv(table, "stream_test.csv", max_rows=10)
+    
+    files = ["stream_test_part1.csv", "stream_test_part2.csv", "stream_test_part3.csv"]
+    chunks = list(iter_csv(*files, chunk_rows=8))
+    print("Размеры блоков:", [len(chunk) for chunk in chunks])
+    
+    bad_table = TableData([[1, 2]], ["a", "b"])
+    save_csv(bad_table, "stream_bad.csv")
+    try:
+        list(iter_csv(files[0], "stream_bad.csv", chunk_rows=8))
+        mismatch_detected = False
+    except LoadError:
+        mismatch_detected = True
+    
+    for file in files + ["stream_bad.csv", "stream_test.csv.manifest.json"]:
+        if os.path.exists(file):
+            os.remove(file)
+    
+    streamed = [row for chunk in chunks for row in chunk.data]
+    return ([len(chunk) for chunk in chunks] == [8, 8, 8, 1]
+            and streamed == data
+            and all(chunk.columns == ["id", "name", "price"] for chunk in chunks)
+            and mismatch_detected)
+
+def test_csv_schema():
+    print("\n=== Тест загрузки CSV по схеме ===")
+    
+    data = [[i, f"{i:03d}", i * 0.5, i % 2 == 0, None if i % 4 == 0 else i] for i in range(10)]
+    table = TableData(data, ["id", "code", "ratio", "even", "sparse"])
+    save_csv(table, "schema_test.csv")
+    
+    inferred = load_csv("schema_test.csv")
+    print("Выведенные типы:", inferred.column_types)
+    
+    typed = load_csv("schema_test.csv", schema={"code": str, 0: float})
+    print("Типы по схеме:", typed.column_types)
+    print("Первая строка:", typed.data[0])
+    
+    try:
+        load_csv("schema_test.csv", schema={"missing": int})
+        unknown_detected = False
+    except LoadError:
+        unknown_detected = True
+    
+    os.remove("schema_test.csv")
+    
+    odd_ints = ["nan", "+7", " 8", "1_000", "1e5", "-4", "٣"]
+    odd_floats = ["inf", "Infinity", "1e5", ".5", "-2.", "abc", "7"]
+    with open("schema_odd.csv", "w", encoding="utf-8", newline="") as f:
+        f.write("n,x\n1,0.5\n2,1.5\n3,2\n")
+        f.writelines(f"{n},{x}\n" for n, x in zip(odd_ints, odd_floats))
+    late = load_csv("schema_odd.csv", sample_rows=3)
+    early = load_csv("schema_odd.csv")
+    os.remove("schema_odd.csv")
+    print("Значения после выборки:", late.data[3:])
+    
+    return (inferred.data[1] == [1, 1, 0.5, False, 1]
+            and [row[0] for row in late.data[3:]] == ["nan", "+7", " 8", "1_000", "1e5", -4, 3]
+            and [row[1] for row in late.data[3:]] == ["inf", "Infinity", "1e5", 0.5, -2.0, "abc", 7.0]
+            and [row[0] for row in early.data] == [row[0] for row in late.data]
+            and inferred.column_types["sparse"] is int
+            and typed.data[0] == [0.0, "000", 0.0, True, None]
+            and typed.column_types["code"] is str
+            and typed.column_types[0] is float
+            and unknown_detected)
+
+def test_parallel_loading():
+    print("\n=== Тест параллельной загрузки ===")
+    
+    data = [[i, f"row{i}", i * 2.5] for i in range(40)]
+    table = TableData(data, ["id", "name", "score"])
+    save_csv(table, "parallel_test.csv", max_rows=10)
+    save_pickle(table, "parallel_test.pkl", max_rows=10)
+    
+    csv_files = [f"parallel_test_part{i}.csv" for i in range(1, 5)]
+    pickle_files = [f"parallel_test_part{i}.pkl" for i in range(1, 5)]
+    
+    csv_serial = load_csv(*csv_files)
+    csv_loaded = load_csv(*csv_files, workers=2)
+    pickle_loaded = load_pickle(*pickle_files, workers=2)
+    print("Загружено строк (csv, pickle):", len(csv_loaded), len(pickle_loaded))
+    
+    try:
+        load_csv(*csv_files, workers=0)
+        workers_checked = False
+    except LoadError:
+        workers_checked = True
+    
+    for file in csv_files + pickle_files + ["parallel_test.csv.manifest.json",
+                                            "parallel_test.pkl.manifest.json"]:
+        if os.path.exists(file):
+            os.remove(file)
+    
+    return (csv_loaded.data == data
+            and pickle_loaded.data == data
+            and csv_loaded.column_types == csv_serial.column_types
+            and workers_checked)
+
+def test_row_views():
+    print("\n=== Тест представлений и копий строк ===")
+    
+    data = [[i, i * 10] for i in range(10)]
+    processor = TableProcessor(TableData(data, ["id", "value"]))
+    
+    view = processor.filter_rows(processor.ge("id", 4)).get_rows_by_number(1, 4)
+    print("Значения представления:", view.get_values("id"))
+    view.set_values([-5, -6, -7], "value")
+    print("Исходная таблица после изменения представления:", processor.get_values("value"))
+    
+    copied = processor.get_rows_by_number(0, 5, copy_table=True)
+    copied.set_values([0, 10, 20, 30, 999], "value")
+    copied.table.data[0][1] = "CHANGED"
+    print("Исходная таблица после изменения копии:", processor.get_values("value")[:5])
+    
+    snapshot = processor.get_rows_by_index(8, 9, copy_table=True)
+    processor.set_values([0] * 10, "value")
+    data[9][1] = "Z"
+    print("Копия после изменения исходной таблицы:", snapshot.get_values("value"))
+    
+    view.table.data.append([100, 1000])
+    print("Представление после добавления строки:", view.table.data)
+    
+    return (view.get_values("id") == [5, 6, 7, 100]
+            and len(data) == 10
+            and data[5][1] == 0
+            and data[0][1] == 0
+            and copied.get_values("value") == ["CHANGED", 10, 20, 30, 999]
+            and snapshot.get_values("value") == [80, 90]
+            and repr(view.table.data) == repr([[5, 0], [6, 0], [7, 0], [100, 1000]]))
+
+def test_lazy_plan():
+    print("\n=== Тест ленивого плана запроса ===")
+    
+    data = [[i, i % 7, i * 0.5] for i in range(30)]
+    columns = ["id", "a", "b"]
+    
+    eager = TableProcessor(TableData([row[:] for row in data], columns))
+    eager.mul("a", 3).add("a", "b")
+    eager_result = eager.filter_rows(eager.gr("id", 10)).get_rows_by_number(2, 8)
+    
+    source = TableProcessor(TableData([row[:] for row in data], columns))
+    plan = source.lazy().mul("a", 3).add("a", "b")
+    plan = plan.filter_rows(plan.gr("id", 10)).get_rows_by_number(2, 8)
+    print("План:")
+    print(plan.explain())
+    lazy_result = plan.collect()
+    
+    combined = source.lazy()
+    combined.filter_rows(combined.ge("a", 3) & ~combined.ls("b", 5.0))
+    
+    nullable = [[i, None if i % 4 == 0 else i % 7, None if i % 5 == 0 else i * 0.5] for i in range(30)]
+    eager_nulls = TableProcessor(TableData([row[:] for row in nullable], columns))
+    eager_nulls.add("a", 10).mul("a", "b")
+    eager_nulls = eager_nulls.filter_rows(eager_nulls.gr("a", 20))
+    lazy_nulls = TableProcessor(TableData([row[:] for row in nullable], columns)).lazy().add("a", 10).mul("a", "b")
+    lazy_nulls = lazy_nulls.filter_rows(lazy_nulls.gr("a", 20)).collect()
+    null_source = TableProcessor(TableData([row[:] for row in nullable], columns))
+    null_plan = null_source.lazy()
+    null_filtered = null_plan.filter_rows(null_plan.eq("b", None) | null_plan.ls("a", 2)).collect()
+    eager_filtered = null_source.filter_rows(null_source.eq("b", None, as_mask=True)
+                                             | null_source.ls("a", 2, as_mask=True))
+    print("Ленивый результат с пропусками:", len(lazy_nulls.table), len(null_filtered.table))
+    
+    empty = TableProcessor(TableData(columns=columns))
+    eager_empty = empty.get_rows_by_number(0, 5)
+    lazy_empty = empty.lazy().get_rows_by_number(0, 5).collect()
+    nothing = source.lazy()
+    nothing = nothing.filter_rows(nothing.gr("id", 100)).get_rows_by_number(0, 5).collect()
+    print("Пустые результаты:", lazy_empty.table.columns, len(nothing.table))
+    
+    return (lazy_result.table.data == eager_result.table.data
+            and list(lazy_nulls.table.data) == list(eager_nulls.table.data)
+            and lazy_nulls.get_column_types() == eager_nulls.get_column_types()
+            and list(null_filtered.table.data) == list(eager_filtered.table.data)
+            and list(lazy_empty.table.data) == list(eager_empty.table.data) == []
+            and lazy_empty.table.columns == eager_empty.table.columns
+            and len(nothing.table) == 0
+            and lazy_result.get_column_types() == eager_result.get_column_types()
+            and plan.explain().splitlines()[0].startswith("filter")
+            and source.get_values("a") == [row[1] for row in data]
+            and len(combined.collect().table) == len([r for r in data if r[1] >= 3 and r[2] >= 5.0]))
+
+def test_binary_format():
+    print("\n=== Тест бинарного колоночного формата ===")
+    
+    data = [[i, f"name{i}" if i % 4 else None, i * 0.5, i % 2 == 0] for i in range(20)]
+    table = TableData(data, ["id", "name", "score", "even"])
+    
+    save_binary(table, "binary_test.tpc")
+    loaded = load_binary("binary_test.tpc")
+    print("Загружено строк:", len(loaded), "типы:", loaded.column_types)
+    
+    projected = load_binary("binary_test.tpc", columns=["score", "id"])
+    decoded_before = [projected.data.columns.is_decoded(i) for i in range(2)]
+    print("Проекция:", projected.columns, projected.data[3])
+    
+    projected_closed = projected.data.columns.closed
+    
+    with load_binary("binary_test.tpc") as scoped:
+        first_id = scoped.data[0][0]
+    scoped_closed = scoped.data.columns.closed
+    print("Отображение закрыто:", projected_closed, scoped_closed)
+    
+    save_binary(table, "binary_parts.tpc", max_rows=8)
+    parts = [f"binary_parts_part{i}.tpc" for i in range(1, 4)]
+    merged = load_binary(*parts)
+    merged.close()
+    
+    for file in ["binary_test.tpc", "binary_parts.tpc.manifest.json"] + parts:
+        if os.path.exists(file):
+            os.remove(file)
+    
+    return (loaded.data == data
+            and loaded.column_types == table.column_types
+            and decoded_before == [False, False]
+            and projected.data[3] == [1.5, 3]
+            and projected.data.columns.is_decoded(0)
+            and projected_closed
+            and first_id == 0 and scoped_closed and scoped.data == data
+            and merged.data == data)
+
+def test_pickle_parts():
+    print("\n=== Тест загрузки Pickle по частям ===")
+    
+    data = [[i, i * 0.5, f"name{i}", i % 3 == 0] for i in range(30)]
+    table = TableData(data, ["id", "score", "name", "flag"], columnar=True)
+    
+    save_pickle(table, "pickle_parts.pkl", max_rows=8)
+    parts = [f"pickle_parts_part{i}.pkl" for i in range(1, 5)]
+    loaded = load_pickle(*parts)
+    print("Загружено строк:", len(loaded), "колоночный формат:", loaded.is_columnar)
+    
+    with open("pickle_legacy.pkl", "wb") as f:
+        pickle.dump(TableData(data[:5], ["id", "score", "name", "flag"]), f)
+    save_pickle(TableData(data[5:], ["id", "score", "name", "flag"]), "pickle_rows.pkl")
+    mixed = load_pickle("pickle_legacy.pkl", "pickle_rows.pkl")
+    print("Смешанная загрузка:", len(mixed), mixed.data[5])
+    
+    for file in parts + ["pickle_legacy.pkl", "pickle_rows.pkl", "pickle_parts.pkl.manifest.json"]:
+        if os.path.exists(file):
+            os.remove(file)
+    
+    return (loaded.is_columnar
+            and loaded.data == data
+            and loaded.column_types == table.column_types
+            and mixed.data == data
+            and mixed.column_types == table.column_types)
+
+def test_partitioned_writes():
+    print("\n=== Тест параллельной записи частей ===")
+    
+    data = [[i, f"name{i}", i * 1.5] for i in range(25)]
+    table = TableData(data, ["id", "name", "score"])
+    
+    save_csv(table, "partitioned.csv", max_rows=10, workers=2)
+    save_pickle(table, "partitioned.pkl", max_rows=10, workers=2)
+    
+    with open("partitioned.csv.manifest.json", encoding="utf-8") as f:
+        manifest = json.load(f)
+    print("Манифест:", manifest["parts"])
+    
+    csv_files = [part["path"] for part in manifest["parts"]]
+    pickle_files = [f"partitioned_part{i}.pkl" for i in range(1, 4)]
+    csv_loaded = load_csv(*csv_files)
+    pickle_loaded = load_pickle(*pickle_files)
+    leftovers = [name for name in os.listdir(".") if name.endswith(".tmp")]
+    
+    for file in csv_files + pickle_files + ["partitioned.csv.manifest.json",
+                                            "partitioned.pkl.manifest.json"]:
+        if os.path.exists(file):
+            os.remove(file)
+    
+    return (manifest["rows"] == 25
+            and [part["rows"] for part in manifest["parts"]] == [10, 10, 5]
+            and csv_loaded.data == data
+            and pickle_loaded.data == data
+            and not leftovers)
+
+def test_streaming_csv_write():
+    print("\n=== Тест потоковой записи CSV ===")
+    
+    data = [[i, i * 0.25, i % 2 == 0] for i in range(50)]
+    save_csv(TableData(data, ["id", "value", "flag"], columnar=True), "write_source.csv")
+    
+    with open("write_source.csv", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    print("Строки колоночной записи:", lines[1:3])
+    
+    chunks = iter_csv("write_source.csv", chunk_rows=16)
+    transformed = (TableProcessor(chunk).filter_rows(TableProcessor(chunk).ge("value", 2.0)).table
+                   for chunk in chunks)
+    save_csv(transformed, "write_stream.csv", max_rows=20)
+    
+    parts = [f"write_stream_part{i}.csv" for i in range(1, 4)]
+    loaded = load_csv(*parts)
+    print("Записано потоком строк:", len(loaded))
+    
+    save_csv(iter([[[1, "a"]], [[2, "b"]]]), "write_rows.csv", columns=["id", "name"])
+    rows_loaded = load_csv("write_rows.csv")
+    
+    try:
+        save_csv(iter([[[1, "a"]]]), "write_rows.csv")
+        error_raised = False
+    except SaveError as e:
+        print("Ожидаемая ошибка:", e)
+        error_raised = True
+    
+    for file in parts + ["write_source.csv", "write_rows.csv", "write_stream.csv.manifest.json"]:
+        if os.path.exists(file):
+            os.remove(file)
+    
+    return (lines[1:3] == ["0,0.0,True", "1,0.25,False"]
+            and loaded.data == [row for row in data if row[1] >= 2.0]
+            and rows_loaded.data == [[1, "a"], [2, "b"]]
+            and error_raised)
+
+def test_text_rendering():
+    print("\n=== Тест потокового вывода таблицы ===")
+    
+    data = [[i, f"name{i}"] for i in range(12)]
+    table = TableData(data, ["id", "name"])
+    processor = TableProcessor(table)
+    
+    processor.print_table(head=2, tail=2)
+    
+    save_text(table, "render_full.txt")
+    save_text(table, "render_pages.txt", page_rows=5)
+    with open("render_full.txt", encoding="utf-8") as f:
+        full_lines = f.read().splitlines()
+    with open("render_pages.txt", encoding="utf-8") as f:
+        page_lines = f.read().splitlines()
+    
+    processor.set_values([f"long_name_{i}" for i in range(12)], "name")
+    save_text(table, "render_full.txt", head=1, tail=1)
+    with open("render_full.txt", encoding="utf-8") as f:
+        truncated = f.read().splitlines()
+    print(*truncated, sep="\n")
+    
+    for file in ["render_full.txt", "render_pages.txt"]:
+        if os.path.exists(file):
+            os.remove(file)
+    
+    return (len(full_lines) == 16
+            and page_lines.count(full_lines[0]) == 3
+            and truncated[3] == "..."
+            and truncated[2].split("|")[1].strip() == "long_name_0"
+            and len(truncated[0]) > len(full_lines[0]))
+
+def test_column_stats():
+    print("\n=== Тест статистики столбцов ===")
+    
+    def run(columnar):
+        data = [[i, f"name{i}", i * 0.5] for i in range(100)]
+        table = TableData(data, ["id", "name", "score"], columnar=columnar)
+        processor = TableProcessor(table)
+        
+        stats = processor.get_column_stats("id")
+        print("Статистика id:", stats)
+        
+        values = processor.get_values("id")
+        values[10] = 500
+        processor.set_values(values, "id")
+        updated = processor.get_column_stats("id")
+        
+        processor.append_rows([[-3, "neg", None]])
+        appended = processor.get_column_stats("id")
+        score_stats = processor.get_column_stats("score")
+        print("После изменений:", appended, score_stats)
+        
+        above_max = processor.gr("id", 1000)
+        below_min = processor.ge("id", -100)
+        
+        try:
+            processor.get_rows_by_number(0, 5).append_rows([[1, "x", 1.0]])
+            view_error = False
+        except TableError as e:
+            print("Ожидаемая ошибка:", e)
+            view_error = True
+        
+        return (stats["min"] == 0 and stats["max"] == 99 and stats["width"] == 2
+                and stats["distinct"] == 100
+                and updated["max"] == 500 and updated["width"] == 3
+                and appended["min"] == -3 and len(table.data) == 101
+                and score_stats["null_count"] == 1
+                and above_max == [False] * 101 and below_min == [True] * 101
+                and view_error)
+    
+    rows = TableData([[1, "a"], [2, "b"], [3, "c"]], ["v", "name"])
+    rows_processor = TableProcessor(rows)
+    rows_processor.print_table()
+    rows.data[0][0] = 100
+    direct = rows_processor.gr("v", 50)
+    save_text(rows, "stats_widths.txt")
+    with open("stats_widths.txt", encoding="utf-8") as f:
+        header = f.readline()
+    os.remove("stats_widths.txt")
+    print("После прямого изменения:", direct, header.strip())
+    
+    return (run(False) and run(True)
+            and direct == [True, False, False]
+            and header.index("|") == len("100") + 3)
+
+def test_value_cache():
+    print("\n=== Тест кеша типизированных значений ===")
+    
+    data = [[str(i), i * 2] for i in range(50)]
+    table = TableData(data, ["code", "value"], columnar=True)
+    processor = TableProcessor(table)
+    processor.set_column_types({0: int})
+    
+    first = processor.get_values("code")
+    first[0] = -1
+    second = processor.get_values("code")
+    processor.gr("code", 10)
+    processor.ls("code", 20)
+    cached_hits = table._value_cache.hits
+    
+    processor.set_column_types({0: float})
+    as_float = processor.get_values("code")
+    
+    processor.mul("value", 3.0)
+    tripled = processor.get_values("value")
+    
+    processor.set_cache_budget(0)
+    print("Кеш:", table._value_cache, "попаданий:", cached_hits)
+    
+    rows = TableData([[1, "a"], [2, "b"], [3, "c"]], ["id", "name"])
+    rows_processor = TableProcessor(rows)
+    rows_processor.set_column_types({0: int})
+    rows_processor.get_values("id")
+    rows.data[0][0] = 99
+    mutated = rows_processor.get_values("id")
+    mutated_mask = rows_processor.gr("id", 50)
+    print("После прямого изменения:", mutated, mutated_mask)
+    
+    return (second[0] == 0 and second[:3] == [0, 1, 2]
+            and cached_hits >= 2
+            and as_float[:2] == [0.0, 1.0]
+            and tripled[:3] == [0.0, 6.0, 12.0]
+            and len(table._value_cache) == 0
+            and mutated == [99, 2, 3]
+            and mutated_mask == [True, False, False]
+            and len(rows._value_cache) == 0)
+
+def test_group_by():
+    print("\n=== Тест группировки и агрегации ===")
+    
+    data = [[["north", "south", "east"][i % 3], i % 2 == 0, i, i * 0.5] for i in range(90)]
+    data[4][3] = None
+    table = TableData(data, ["region", "even", "amount", "score"])
+    processor = TableProcessor(table)
+    
+    grouped = processor.group_by("region").agg({"amount": ["sum", "min", "max"],
+                                                "score": ["mean", "count"]})
+    grouped.print_table()
+    by_region = {row[0]: row for row in grouped.table.data}
+    
+    pairs = processor.group_by("region", "even").agg({"amount": "count"})
+    
+    save_csv(table, "group_source.csv")
+    streamed = TableProcessor.group_chunks(iter_csv("group_source.csv", chunk_rows=20),
+                                           "region").agg({"amount": ["sum", "min", "max"],
+                                                          "score": ["mean", "count"]})
+    os.remove("group_source.csv")
+    
+    no_chunks = TableProcessor.group_chunks([], "region").agg({"amount": ["sum", "count"]})
+    save_csv(TableData(columns=["region", "amount"]), "group_empty.csv")
+    header_only = TableProcessor.group_chunks(iter_csv("group_empty.csv"), "region").agg({"amount": "sum"})
+    os.remove("group_empty.csv")
+    print("Пустой поток:", no_chunks.table.columns, header_only.table.columns)
+    
+    try:
+        processor.group_by("region").agg({"amount": "median"})
+        error_raised = False
+    except OperationError as e:
+        print("Ожидаемая ошибка:", e)
+        error_raised = True
+    
+    north = [row for row in data if row[0] == "north"]
+    return (grouped.table.columns == ["region", "amount_sum", "amount_min", "amount_max",
+                                      "score_mean", "score_count"]
+            and by_region["north"][1:4] == [sum(r[2] for r in north), 0, 87]
+            and by_region["south"][5] == 29
+            and grouped.get_column_types(by_number=False)["amount_sum"] is int
+            and grouped.get_column_types(by_number=False)["score_mean"] is float
+            and len(pairs.table.data) == 6
+            and streamed.table.data == grouped.table.data
+            and no_chunks.table.columns == ["region", "amount_sum", "amount_count"]
+            and no_chunks.table.data == [] and header_only.table.data == []
+            and header_only.table.columns == ["region", "amount"]
+            and error_raised)
+
+def test_sorting():
+    print("\n=== Тест сортировки и top-k ===")
+    
+    data = [[i % 4, (i * 37) % 50, f"name{i}"] for i in range(50)]
+    data[3][1] = None
+    table = TableData(data, ["group", "score", "name"], columnar=True)
+    processor = TableProcessor(table)
+    
+    ordered = processor.sort_by(["group", "score"], descending=[False, True])
+    ordered.print_table(head=5, tail=2)
+    pairs = list(zip(ordered.get_values("group"), ordered.get_values("score")))
+    expected = sorted(((row[0], row[1]) for row in data if row[1] is not None),
+                      key=lambda pair: (pair[0], -pair[1]))
+    
+    largest = processor.top_k("score", 3).get_values("score")
+    smallest = processor.top_k("score", 2, largest=False).get_values("score")
+    print("top-3:", largest, "bottom-2:", smallest)
+    
+    scanned = processor.get_rows_by_range("score", 10, 20, include_high=False).get_values("score")
+    scores = [row[1] if row[1] is not None else 0 for row in data]
+    processor.set_values(scores, "score")
+    processor.create_index("score", kind="sorted")
+    indexed = processor.get_rows_by_range("score", 10, 20, include_high=False).get_values("score")
+    mask = processor.ge("score", 45)
+    
+    processor.set_values([100] + scores[1:], "score")
+    repaired = processor.get_rows_by_range("score", 90).get_values("name")
+    view = processor.get_rows_by_number(1, 3)
+    view.set_values([200, 300], "score")
+    through_view = processor.get_rows_by_range("score", 150).get_values("name")
+    ascending = processor.sort_by("score").get_values("score")
+    print("После изменений через представление:", through_view)
+    
+    nan = float("nan")
+    measures = [5.0, nan, 1.0, 7.0, 3.0, nan, 2.0]
+    nan_processor = TableProcessor(TableData([[value] for value in measures], ["x"], columnar=True))
+    nan_processor.set_column_types({0: float})
+    nan_processor.create_index("x", kind="sorted")
+    nan_mask = nan_processor.gr("x", 2.5)
+    nan_processor.set_values([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, nan], "x")
+    refreshed = nan_processor.get_rows_by_range("x", 2.5, 5.5).get_values("x")
+    
+    rows = TableData([[1], [2], [3]], ["v"])
+    rows_processor = TableProcessor(rows).create_index("v", kind="sorted")
+    rows_processor.gr("v", 5)
+    rows.data[0][0] = 10
+    direct_mask = rows_processor.gr("v", 5)
+    direct_sorted = rows_processor.sort_by("v").get_values("v")
+    print("После прямого изменения:", direct_mask, direct_sorted)
+    print("Маска со значениями NaN:", nan_mask)
+    
+    try:
+        processor.top_k("score", -1)
+        error_raised = False
+    except TableError as e:
+        print("Ожидаемая ошибка:", e)
+        error_raised = True
+    
+    return (pairs[-1] == (3, None)
+            and pairs[:-1] == expected
+            and largest == [49, 48, 47]
+            and smallest == [0, 1]
+            and scanned == [v for v in scores if 10 <= v < 20]
+            and indexed == [v for v in scores if 10 <= v < 20]
+            and mask == [v >= 45 for v in scores]
+            and repaired == ["name0"]
+            and through_view == ["name1", "name2"]
+            and ascending == sorted(ascending) and ascending[-1] == 300
+            and nan_mask == [value > 2.5 for value in measures]
+            and refreshed == [3.0, 4.0, 5.0]
+            and direct_mask == [True, False, False] and direct_sorted == [2, 3, 10]
+            and error_raised)
+
+def test_hash_join():
+    print("\n=== Тест хеш-соединения ===")
+    
+    orders = TableData([[i, i % 7, f"order{i}", i * 10] for i in range(40)],
+                       ["id", "customer", "name", "amount"])
+    customers = TableData([[c, f"client{c}", c % 2 == 0] for c in range(5)] + [[None, "nobody", False]],
+                          ["customer", "name", "vip"])
+    save_csv(customers, "join_customers.csv")
+    loaded = load_csv("join_customers.csv")
+    os.remove("join_customers.csv")
+    processor = TableProcessor(orders)
+    
+    inner = processor.join(loaded, on="customer")
+    inner.print_table(head=3, tail=1)
+    left = processor.join(customers, on="customer", how="left")
+    spilled = processor.join(customers, on="customer", how="left", max_build_rows=2)
+    small_build = TableProcessor(customers).join(orders, on="customer", max_build_rows=3)
+    multi = processor.join(TableData([[3, 3, "x"], [10, 4, "y"]], ["id", "customer", "tag"]),
+                           on=["id", "customer"])
+    
+    try:
+        processor.join(customers, on="customer", how="outer")
+        error_raised = False
+    except OperationError as e:
+        print("Ожидаемая ошибка:", e)
+        error_raised = True
+    
+    expected = [[i, i % 7, f"order{i}", i * 10, f"client{i % 7}", i % 7 % 2 == 0]
+                for i in range(40) if i % 7 < 5]
+    return (inner.table.columns == ["id", "customer", "name_left", "amount", "name_right", "vip"]
+            and inner.table.data == expected
+            and inner.get_column_types(by_number=False)["vip"] is bool
+            and len(left.table.data) == 40
+            and left.table.data[5][4:] == [None, None]
+            and spilled.table.data == left.table.data
+            and sorted(small_build.get_values("amount")) == sorted(row[3] for row in expected)
+            and multi.table.data == [[3, 3, "order3", 30, "x"]]
+            and error_raised)
+
+def test_masks():
+    print("\n=== Тест битовых масок ===")
+    
+    data = [[i, i % 7, i * 0.5] for i in range(200)]
+    processor = TableProcessor(TableData(data, ["id", "group", "value"]))
+    columnar = TableProcessor(TableData(data, ["id", "group", "value"], columnar=True))
+    
+    high = processor.gr("id", 150, as_mask=True)
+    group = processor.eq("group", 3, as_mask=True)
+    combined = (high | group) & ~processor.ge("value", 90, as_mask=True)
+    print("Маска:", combined, "строк:", combined.count())
+    expected = [(i > 150 or i % 7 == 3) and not i * 0.5 >= 90 for i in range(200)]
+    
+    vector_mask = columnar.gr("id", 150, as_mask=True) & columnar.eq("group", 3)
+    filtered = processor.filter_rows(combined)
+    by_indices = processor.filter_rows(array('q', [5, 1, 3]))
+    by_flags = processor.filter_rows([1, 0, 1] + [0] * 197)
+    by_range = processor.filter_rows(range(190, 200))
+    
+    try:
+        processor.filter_rows(Mask.full(10))
+        error_raised = False
+    except TableError as e:
+        print("Ожидаемая ошибка:", e)
+        error_raised = True
+    
+    return (combined == expected
+            and combined.count() == sum(expected)
+            and combined.indices() == [i for i, keep in enumerate(expected) if keep]
+            and high.to_list() == processor.gr("id", 150)
+            and vector_mask.indices() == [157, 164, 171, 178, 185, 192, 199]
+            and filtered.get_values("id") == combined.indices()
+            and by_indices.get_values("id") == [5, 1, 3]
+            and by_flags.get_values("id") == [0, 2]
+            and by_range.get_values("id") == list(range(190, 200))
+            and len(Mask.from_indices([1, 4], 6)) == 6
+            and Mask.from_indices([1, 4], 6).to_list() == [False, True, False, False, True, False]
+            and error_raised)
+
+def test_benchmarks():
+    print("\n=== Тест набора замеров производительности ===")
+    
+    first = generate_table(50, columns=6, null_rate=0.2, cardinality=5, seed=7)
+    second = generate_table(50, columns=6, null_rate=0.2, cardinality=5, seed=7)
+    nulls = sum(row.count(None) for row in first.data)
+    
+    current = run_benchmarks([300], repeat=1, only=["save_csv", "load_csv", "filter_rows"],
+                             log=lambda message: None)
+    print("Результаты:", sorted(current["results"]))
+    slower = {"results": {name: {"seconds": result["seconds"] / 2}
+                          for name, result in current["results"].items()}}
+    report = compare_results(current, slower, threshold=0.2)
+    
+    return (first.data == second.data
+            and first.columns == ["key", "float_1", "str_2", "bool_3", "int_4", "float_5"]
+            and {row[0] for row in first.data} <= set(range(5))
+            and 0 < nulls < 50 * 5
+            and sorted(current["results"]) == ["filter_rows@300", "load_csv@300", "save_csv@300"]
+            and len(report) == 3 and all(entry["regression"] for entry in report)
+            and not any(entry["regression"] for entry in compare_results(current, current)))
+
+def test_profiling():
+    print("\n=== Тест профилирования операций ===")
+    
+    data = [[i, i % 3, i * 1.5] for i in range(300)]
+    table = TableData(data, ["id", "group", "value"])
+    seen = []
+    hook = add_hook(seen.append)
+    
+    with profile(memory=True) as profiler:
+        save_csv(table, "profile_test.csv", max_rows=100)
+        loaded = load_csv("profile_test_part1.csv", "profile_test_part2.csv", "profile_test_part3.csv")
+        processor = TableProcessor(loaded)
+        processor.add("value", 1)
+        selected = processor.filter_rows(processor.gr("id", 99, as_mask=True))
+        selected.group_by("group").agg({"value": "sum"})
+        try:
+            processor.top_k("value", -1)
+        except TableError:
+            pass
+    remove_hook(hook)
+    processor.get_values("id")
+    profiler.print_report()
+    
+    for name in ["profile_test_part1.csv", "profile_test_part2.csv", "profile_test_part3.csv",
+                 "profile_test.csv.manifest.json"]:
+        if os.path.exists(name):
+            os.remove(name)
+    
+    events = {event.name: event for event in profiler.events}
+    summary = profiler.summary()
+    return (set(events) >= {"save_csv", "load_csv", "add", "gr", "filter_rows", "group_by.agg", "top_k"}
+            and events["save_csv"].rows_in == 300 and events["save_csv"].bytes_written > 0
+            and events["load_csv"].rows_out == 300
+            and 0 < events["load_csv"].bytes_read <= events["save_csv"].bytes_written
+            and events["filter_rows"].rows_out == 200
+            and events["filter_rows"].memory_peak is not None
+            and events["top_k"].error == "TableError"
+            and events["add"].depth == 0
+            and summary["group_by.agg"]["rows_out"] == 3
+            and len(seen) == len(profiler.events)
+            and not hasattr(TableProcessor.add, "__wrapped__"))
+
+def test_dictionary_encoding():
+    print("\n=== Тест словарного кодирования строк ===")
+    
+    regions = ["north", "south", "east", "west"]
+    data = [[i, regions[i % 4], f"item{i}", None if i % 10 == 0 else regions[i % 3]] for i in range(400)]
+    save_csv(TableData(data, ["id", "region", "name", "backup"]), "dict_test.csv")
+    
+    rows_table = load_csv("dict_test.csv")
+    table = load_csv("dict_test.csv", columnar=True)
+    plain = load_csv("dict_test.csv", columnar=True, dictionary=0)
+    chunk_kinds = [(type(chunk.data.column(1)).__name__, type(plain_chunk.data.column(1)).__name__)
+                   for chunk, plain_chunk in zip(iter_csv("dict_test.csv", chunk_rows=100, columnar=True),
+                                                 iter_csv("dict_test.csv", chunk_rows=100, columnar=True,
+                                                          dictionary=0))]
+    os.remove("dict_test.csv")
+    encoded = table.data.column(1)
+    dictionary_size = len(encoded.values)
+    print("Столбец region:", encoded)
+    
+    processor = TableProcessor(table)
+    east = processor.eq("region", "east")
+    not_east = processor.ne("region", "east", as_mask=True)
+    found = processor.get_rows_by_index("west", "north", column="region").get_values("id")
+    processor.create_index("backup")
+    backups = processor.get_rows_by_index("south", column="backup").get_values("id")
+    
+    save_pickle(table, "dict_parts.pkl", max_rows=150)
+    part_names = [f"dict_parts_part{i}.pkl" for i in range(1, 4)]
+    merged = load_pickle(*part_names)
+    for name in part_names + ["dict_parts.pkl.manifest.json"]:
+        os.remove(name)
+    merged_column = merged.data.column(1)
+    merged_equal = merged.data == table.data
+    
+    save_pickle(table, "dict_test.pkl")
+    save_binary(table, "dict_test.bin")
+    save_csv(table, "dict_round.csv")
+    restored = [load_pickle("dict_test.pkl"), load_binary("dict_test.bin"), load_csv("dict_round.csv")]
+    for name in ["dict_test.pkl", "dict_test.bin", "dict_round.csv"]:
+        os.remove(name)
+    
+    round_trip = all(restored_table.data == table.data for restored_table in restored)
+    
+    processor.get_rows_by_number(1).set_value("central", "region")
+    copied = processor.get_rows_by_number(0, 8, copy_table=True)
+    
+    return (type(encoded).__name__ == "DictColumn" and dictionary_size == 4
+            and isinstance(plain.data.column(1), list)
+            and rows_table.data[4][1] is rows_table.data[8][1]
+            and type(table.data.column(2)).__name__ != "DictColumn"
+            and east == [row[1] == "east" for row in data]
+            and not_east == [row[1] != "east" for row in data]
+            and found == [i for i in range(400) if i % 4 in (0, 3)]
+            and backups == [i for i in range(400) if i % 10 and i % 3 == 1]
+            and round_trip
+            and type(merged_column).__name__ == "DictColumn" and len(merged_column.values) == 4
+            and merged_equal
+            and chunk_kinds == [("DictColumn", "list")] * 4
+            and processor.get_values("region")[:3] == ["north", "central", "east"]
+            and processor.eq("region", "central").count(True) == 1
+            and type(copied.table.data.column(1)).__name__ == "DictColumn"
+            and copied.get_values("region")[1] == "central")
+
+def test_null_handling():
+    print("\n=== Тест обработки пропущенных значений ===")
+    
+    data = [[i, None if i % 3 == 0 else i * 1.5, None if i % 4 == 0 else i, "a" if i % 5 else None]
+            for i in range(120)]
+    results = []
+    for columnar in (False, True):
+        table = TableData([row[:] for row in data], ["id", "x", "y", "s"], columnar=columnar)
+        processor = TableProcessor(table)
+        nulls = [processor.null_count(column) for column in ["id", "x", "y", "s"]]
+        greater = processor.gr("x", 30.0)
+        unequal = processor.ne("y", 5, as_mask=True)
+        missing = processor.eq("s", None)
+        processor.add("x", "y")
+        processor.mul("y", 3.0)
+        kept = processor.drop_null("x", "s").get_values("id")
+        processor.fill_null("x", -1.0)
+        print("Колоночный формат:" if columnar else "Строковый формат:", nulls, processor.null_count("x"))
+        results.append(
+            nulls == [0, 40, 30, 24]
+            and greater == [row[1] is not None and row[1] > 30.0 for row in data]
+            and unequal == [row[2] is not None and row[2] != 5 for row in data]
+            and missing == [row[3] is None for row in data]
+            and processor.get_values("y") == [None if row[2] is None else row[2] * 3.0 for row in data]
+            and kept == [row[0] for row in data if row[1] is not None and row[2] is not None
+                         and row[3] is not None]
+            and processor.get_values("x") == [-1.0 if row[1] is None or row[2] is None
+                                              else row[1] + row[2] for row in data]
+            and processor.null_count("x") == 0
+        )
+    
+    table = TableData([row[:] for row in data], ["id", "x", "y", "s"], columnar=True)
+    column_type = type(table.data.column(1)).__name__
+    save_binary(table, "nulls_test.bin")
+    save_pickle(table, "nulls_test.pkl", max_rows=50)
+    parts = [f"nulls_test_part{i}.pkl" for i in range(1, 4)]
+    restored = [load_binary("nulls_test.bin"), load_pickle(*parts)]
+    for name in ["nulls_test.bin", "nulls_test.pkl.manifest.json"] + parts:
+        os.remove(name)
+    
+    direct = TableData([[1, 2.0], [2, 4.0], [3, 6.0]], ["id", "v"])
+    direct_processor = TableProcessor(direct)
+    direct_processor.null_count("v")
+    direct_processor.eval("v * 2")
+    direct.data[1][1] = None
+    direct_nulls = direct_processor.null_count("v")
+    direct_kept = direct_processor.drop_null("v").get_values("id")
+    direct_doubled = direct_processor.eval("v * 2")
+    print("После прямой записи None:", direct_nulls, direct_kept, direct_doubled)
+    
+    try:
+        TableProcessor(table).fill_null("x", None)
+        fill_error = False
+    except TableError as e:
+        print("Ожидаемая ошибка:", e)
+        fill_error = True
+    
+    return (all(results) and column_type == "NullableColumn"
+            and all(loaded.data == data for loaded in restored)
+            and all(type(loaded.data.column(1)).__name__ == "NullableColumn" for loaded in restored)
+            and direct_nulls == 1 and direct_kept == [1, 3]
+            and direct_doubled == [4.0, None, 12.0]
+            and fill_error)
+
+def test_expressions():
+    print("\n=== Тест вычисления выражений ===")
+    
+    data = [[i, i % 7 + 0.5, i % 3 == 0, None if i % 5 == 0 else i * 2, f"k{i % 4}"] for i in range(150)]
+    names = ["a", "b", "flag", "n", "s"]
+    types = {"a": int, "b": float, "flag": bool, "n": int, "s": str}
+    results = []
+    for size in (10, 150):
+        for columnar in (False, True):
+            table = TableData([row[:] for row in data[:size]], names, columnar=columnar)
+            processor = TableProcessor(table)
+            processor.set_column_types(types, by_number=False)
+            rows = data[:size]
+            predicate = processor.where("(a * 2 + b) / b > 10")
+            mask = processor.where("flag & (n is not None) | (s == 'k1')", as_mask=True)
+            chained = processor.where("1 < a <= 4")
+            totals = processor.eval("n + a // 2")
+            processor.eval("a * b - 1", "c")
+            print("Колоночный формат:" if columnar else "Строковый формат:",
+                  size, sum(predicate), mask.count(), table.columns)
+            results.append(
+                predicate == [(row[0] * 2 + row[1]) / row[1] > 10 for row in rows]
+                and mask.to_list() == [row[2] and row[3] is not None or row[4] == "k1" for row in rows]
+                and chained == [1 < row[0] <= 4 for row in rows]
+                and totals == [None if row[3] is None else row[3] + row[0] // 2 for row in rows]
+                and table.columns == names + ["c"]
+                and processor.get_column_types(by_number=False)["c"] is float
+                and processor.get_values("c") == [row[0] * row[1] - 1 for row in rows]
+                and processor.get_values("a") == [row[0] for row in rows]
+            )
+    
+    processor = TableProcessor(TableData([row[:] for row in data], names))
+    processor.set_column_types(types, by_number=False)
+    small = TableProcessor(TableData([row[:] for row in data[:10]], names))
+    small.set_column_types(types, by_number=False)
+    literal_types = [set(map(type, target.eval(expression)))
+                     for target in (small, processor) for expression in ("a + 1.0", "a + 1")]
+    print("Типы результатов с литералами:", literal_types)
+    errors = 0
+    for expression in ["s + 1", "flag & a", "missing > 1", "a +", "a / (a - a)"]:
+        try:
+            processor.eval(expression)
+        except (OperationError, ColumnError) as e:
+            print("Ожидаемая ошибка:", e)
+            errors += 1
+    
+    return (all(results) and errors == 5
+            and literal_types == [{float}, {int}, {float}, {int}])
+
+def test_dataset():
+    print("\n=== Тест обработки набора частей ===")
+    
+    data = [[i, i % 10, i * 0.5, f"g{i % 3}"] for i in range(600)]
+    table = TableData([row[:] for row in data], ["id", "k", "x", "g"])
+    save_csv(table, "dataset_test.csv", max_rows=200)
+    save_pickle(table, "dataset_test.pkl", max_rows=200)
+    expected = [[row[0], row[2], row[2] * 2 + row[0]] for row in data if row[1] < 5]
+    
+    results = []
+    for source, budget in [("dataset_test.csv", 1 << 20), ("dataset_test.csv", 2000),
+                           ("dataset_test_part*.pkl", 1 << 20)]:
+        collected = (open_dataset(source, memory_budget=budget)
+                     .filter("k < 5").eval("x * 2 + id", "y").select("id", "x", "y").collect())
+        grouped = open_dataset(source, memory_budget=budget).group_by("g").agg({"x": "sum"})
+        window = open_dataset(source, memory_budget=budget).get_rows_by_number(195, 205).collect()
+        saved = open_dataset(source, memory_budget=budget).filter("k >= 8").save("dataset_out.bin",
+                                                                                max_rows=50)
+        base = open_dataset(source, memory_budget=budget)
+        low, high = base.filter("k < 2"), base.filter("k >= 8")
+        print(source, budget, len(collected.table.data), saved.part_rows)
+        results.append(
+            [list(row) for row in collected.table.data] == expected
+            and sorted(map(list, grouped.table.data)) == [
+                [f"g{r}", sum(row[2] for row in data if row[0] % 3 == r)] for r in range(3)]
+            and window.get_values("id") == list(range(195, 205))
+            and saved.part_rows == [50, 50, 20]
+            and open_dataset("dataset_out.bin").count() == 120
+            and base.count() == 600 and low.count() == 120 and high.count() == 120
+        )
+        for path in saved.part_paths + ["dataset_out.bin.manifest.json"]:
+            os.remove(path)
+    
+    try:
+        open_dataset("dataset_test.pkl", memory_budget=1000).count()
+        budget_error = False
+    except OperationError as e:
+        print("Ожидаемая ошибка:", e)
+        budget_error = True
+    
+    for name in ["dataset_test.csv.manifest.json", "dataset_test.pkl.manifest.json"]:
+        os.remove(name)
+    for i in range(1, 4):
+        os.remove(f"dataset_test_part{i}.csv")
+        os.remove(f"dataset_test_part{i}.pkl")
+    
+    return all(results) and budget_error
+
 def run_all_tests():
     print("=" * 50)
     print("ЗАПУСК ТЕСТОВ БИБЛИОТЕКИ TABLE PROCESSOR")
@@ -169,7 +1213,32 @@ def run_all_tests():
         test_comparison_operations,
         test_csv_operations,
         test_multiple_files,
-        test_exceptions
+        test_exceptions,
+        test_columnar_layout,
+        test_vectorized_operations,
+        test_hash_index,
+        test_streaming_csv,
+        test_csv_schema,
+        test_parallel_loading,
+        test_row_views,
+        test_lazy_plan,
+        test_binary_format,
+        test_pickle_parts,
+        test_partitioned_writes,
+        test_streaming_csv_write,
+        test_text_rendering,
+        test_column_stats,
+        test_value_cache,
+        test_group_by,
+        test_sorting,
+        test_hash_join,
+        test_masks,
+        test_benchmarks,
+        test_profiling,
+        test_dictionary_encoding,
+        test_null_handling,
+        test_expressions,
+        test_dataset
     ]
     
     results = []